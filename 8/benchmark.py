@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the validation library
+Generates synthetic schemas and payloads, measures validation speed and
+writes machine-readable results that can be compared between commits
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from validator import (
+    Schema, ValidationError, BaseValidator, StringValidator, NumberValidator,
+    BooleanValidator, ArrayValidator, ObjectValidator
+)
+
+
+# Bump when the layout of the results file changes
+RESULTS_VERSION = 1
+
+ALPHABET = "abcdefghijklmnopqrstuvwxyz0123456789"
+
+
+def generate_schema(depth: int = 2, width: int = 5, seed: int = 0) -> ObjectValidator:
+    """
+    Generates an object schema with `width` fields per level.
+
+    Fields cycle through strings, numbers, booleans and arrays; at every
+    level above the last one, one field in four is a nested object.
+    """
+    rng = random.Random(seed)
+    return _generate_object(depth, width, rng)
+
+
+def _generate_object(depth: int, width: int, rng: random.Random) -> ObjectValidator:
+    """Generates one level of a synthetic object schema"""
+    schema: Dict[str, BaseValidator] = {}
+    for i in range(width):
+        kind = i % 4
+        if kind == 3 and depth > 1:
+            field = _generate_object(depth - 1, width, rng)
+        elif kind == 0:
+            field = Schema.string().min_length(1).max_length(rng.randint(8, 32)).pattern(r'^[a-z0-9]+$')
+        elif kind == 1:
+            field = Schema.number().min(0).max(rng.choice([100, 1000, 1_000_000]))
+        elif kind == 2:
+            field = Schema.boolean()
+        else:
+            field = Schema.array(Schema.string().max_length(16)).max_length(10)
+        if rng.random() < 0.2:
+            field.optional()
+        schema[f"field_{i}"] = field
+    return Schema.object(schema)
+
+
+def generate_value(validator: BaseValidator, rng: random.Random) -> Any:
+    """Generates a valid value for a validator produced by generate_schema()"""
+    if isinstance(validator, StringValidator):
+        low = validator._min_length or 0
+        high = validator._max_length if validator._max_length is not None else low + 16
+        return "".join(rng.choice(ALPHABET) for _ in range(rng.randint(max(low, 1), max(high, 1))))
+    if isinstance(validator, NumberValidator):
+        low = validator._min_value if validator._min_value is not None else -1000
+        high = validator._max_value if validator._max_value is not None else 1000
+        return rng.randint(int(low), int(high)) if rng.random() < 0.5 else rng.uniform(low, high)
+    if isinstance(validator, BooleanValidator):
+        return rng.random() < 0.5
+    if isinstance(validator, ArrayValidator):
+        low = validator._min_length or 0
+        high = validator._max_length if validator._max_length is not None else low + 5
+        return [generate_value(validator.item_validator, rng) for _ in range(rng.randint(low, high))]
+    if isinstance(validator, ObjectValidator):
+        return {name: generate_value(field, rng) for name, field in validator.schema.items()}
+    raise ValueError(f"Cannot generate values for {type(validator).__name__}")
+
+
+def _corrupt(value: Any, rng: random.Random) -> Any:
+    """Replaces one randomly chosen leaf of a generated value with a wrong type"""
+    if isinstance(value, dict) and value:
+        key = rng.choice(list(value))
+        value[key] = _corrupt(value[key], rng)
+        return value
+    if isinstance(value, list) and value:
+        index = rng.randrange(len(value))
+        value[index] = _corrupt(value[index], rng)
+        return value
+    return 0 if isinstance(value, str) else "invalid"
+
+
+def generate_payloads(validator: BaseValidator, count: int, failure_rate: float = 0.0,
+                      seed: int = 0) -> List[Any]:
+    """Generates `count` payloads of which roughly `failure_rate` are invalid"""
+    rng = random.Random(seed)
+    payloads = []
+    for _ in range(count):
+        payload = generate_value(validator, rng)
+        if rng.random() < failure_rate:
+            payload = _corrupt(payload, rng)
+        payloads.append(payload)
+    return payloads
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    """Returns the nearest-rank percentile of already sorted values"""
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def measure(name: str, operation: Callable[[Any], Any], inputs: List[Any], repeat: int = 3,
+            items_per_input: int = 1) -> Dict[str, Any]:
+    """
+    Times an operation over all inputs and returns its statistics.
+
+    Every input is timed individually for the latency percentiles; peak
+    memory is measured in a separate pass because tracing slows code down.
+    """
+    latencies: List[float] = []
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for value in inputs:
+            op_start = time.perf_counter_ns()
+            operation(value)
+            latencies.append(time.perf_counter_ns() - op_start)
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    try:
+        for value in inputs:
+            operation(value)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    latencies.sort()
+    operations = len(latencies)
+    return {
+        "name": name,
+        "operations": operations,
+        "ops_per_sec": operations / elapsed if elapsed else 0.0,
+        "items_per_sec": operations * items_per_input / elapsed if elapsed else 0.0,
+        "mean_us": statistics.fmean(latencies) / 1000,
+        "p50_us": _percentile(latencies, 0.50) / 1000,
+        "p99_us": _percentile(latencies, 0.99) / 1000,
+        "peak_memory_bytes": peak,
+    }
+
+
+def _parse_quietly(validator: BaseValidator) -> Callable[[Any], Any]:
+    """Wraps parse() so invalid payloads do not abort the benchmark"""
+    def parse(value: Any) -> Any:
+        try:
+            return validator.parse(value)
+        except ValidationError:
+            return None
+    return parse
+
+
+def run_benchmarks(depth: int = 2, width: int = 8, payloads: int = 1000, failure_rate: float = 0.1,
+                   array_size: int = 1000, repeat: int = 3, seed: int = 0) -> Dict[str, Any]:
+    """Runs the benchmark scenarios and returns the results document"""
+    validator = generate_schema(depth, width, seed)
+    compiled = validator.compile()
+    inputs = generate_payloads(validator, payloads, failure_rate, seed)
+    array_validator = Schema.array(validator)
+    batches = [inputs[i:i + array_size] for i in range(0, len(inputs), array_size)]
+
+    results = [
+        measure("validate", validator.validate, inputs, repeat),
+        measure("validate_compiled", compiled.validate, inputs, repeat),
+        measure("validate_fail_fast", lambda value: validator.validate(value, fail_fast=True), inputs, repeat),
+        measure("parse", _parse_quietly(validator), inputs, repeat),
+        measure("array_validate", array_validator.validate, batches, repeat, array_size),
+    ]
+    return {
+        "version": RESULTS_VERSION,
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "config": {
+            "depth": depth, "width": width, "payloads": payloads, "failure_rate": failure_rate,
+            "array_size": array_size, "repeat": repeat, "seed": seed,
+        },
+        "results": results,
+    }
+
+
+def _git_commit() -> Optional[str]:
+    """Returns the current git commit, if the benchmark runs inside a checkout"""
+    try:
+        output = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                                text=True, check=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.stdout.strip() or None
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.10) -> List[Dict[str, Any]]:
+    """
+    Compares two results documents scenario by scenario.
+
+    A scenario regresses when its throughput drops, or its p99 latency or
+    peak memory grows, by more than `threshold` (a fraction).
+    """
+    if baseline.get("version") != current.get("version"):
+        raise ValueError("Benchmark results were written by different versions of the suite")
+
+    previous = {result["name"]: result for result in baseline["results"]}
+    comparisons = []
+    for result in current["results"]:
+        before = previous.get(result["name"])
+        if before is None:
+            continue
+        changes = {
+            "ops_per_sec": _relative_change(before["ops_per_sec"], result["ops_per_sec"]),
+            "p99_us": _relative_change(before["p99_us"], result["p99_us"]),
+            "peak_memory_bytes": _relative_change(before["peak_memory_bytes"], result["peak_memory_bytes"]),
+        }
+        regressed = (changes["ops_per_sec"] < -threshold or changes["p99_us"] > threshold
+                     or changes["peak_memory_bytes"] > threshold)
+        comparisons.append({"name": result["name"], "changes": changes, "regressed": regressed})
+    return comparisons
+
+
+def _relative_change(before: float, after: float) -> float:
+    """Returns the change from before to after as a fraction of before"""
+    if not before:
+        return 0.0 if not after else float("inf")
+    return (after - before) / before
+
+
+def format_results(document: Dict[str, Any]) -> str:
+    """Renders a results document as a plain-text table"""
+    lines = [f"{'scenario':<20} {'ops/sec':>12} {'items/sec':>12} {'p50 us':>10} {'p99 us':>10} {'peak KiB':>10}"]
+    for result in document["results"]:
+        lines.append(
+            f"{result['name']:<20} {result['ops_per_sec']:>12,.0f} {result['items_per_sec']:>12,.0f} "
+            f"{result['p50_us']:>10.2f} {result['p99_us']:>10.2f} {result['peak_memory_bytes'] / 1024:>10.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark the validation library")
+    parser.add_argument('--depth', type=int, default=2, help='Nesting depth of the generated schema')
+    parser.add_argument('--width', type=int, default=8, help='Fields per object in the generated schema')
+    parser.add_argument('--payloads', type=int, default=1000, help='Number of generated payloads')
+    parser.add_argument('--failure-rate', type=float, default=0.1, help='Fraction of invalid payloads')
+    parser.add_argument('--array-size', type=int, default=1000, help='Payloads per array in array_validate')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed passes over the payloads')
+    parser.add_argument('--seed', type=int, default=0, help='Seed for the generators')
+    parser.add_argument('--output', '-o', type=str, help='Write the results as JSON to this file')
+    parser.add_argument('--compare', type=str, help='Baseline results file to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help='Allowed relative regression when comparing (default: 0.10)')
+    args = parser.parse_args()
+
+    document = run_benchmarks(args.depth, args.width, args.payloads, args.failure_rate,
+                              args.array_size, args.repeat, args.seed)
+    print(format_results(document))
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(document, f, indent=2)
+        print(f"Results saved to: {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        comparisons = compare(baseline, document, args.threshold)
+        print(f"\nCompared with {args.compare}:")
+        for comparison in comparisons:
+            changes = comparison["changes"]
+            status = "REGRESSED" if comparison["regressed"] else "ok"
+            print(f"{comparison['name']:<20} ops/sec {changes['ops_per_sec']:+.1%}  "
+                  f"p99 {changes['p99_us']:+.1%}  memory {changes['peak_memory_bytes']:+.1%}  {status}")
+        if any(comparison["regressed"] for comparison in comparisons):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""
+Unit tests for the benchmark suite's generators and result comparison
+"""
+
+import unittest
+from benchmark import (
+    generate_schema, generate_payloads, measure, run_benchmarks, compare, RESULTS_VERSION
+)
+
+
+class TestGenerators(unittest.TestCase):
+    """Tests for the synthetic schema and payload generators"""
+    
+    def test_schema_shape(self):
+        """Test depth and width of generated schemas"""
+        validator = generate_schema(depth=3, width=4)
+        
+        self.assertEqual(len(validator.schema), 4)
+        nested = validator.schema["field_3"]
+        self.assertEqual(len(nested.schema), 4)
+        self.assertEqual(len(nested.schema["field_3"].schema), 4)
+    
+    def test_valid_payloads(self):
+        """Test payloads without failures pass validation"""
+        validator = generate_schema(depth=2, width=8)
+        
+        for payload in generate_payloads(validator, 50, failure_rate=0.0):
+            self.assertTrue(validator.validate(payload).is_valid)
+    
+    def test_failure_rate(self):
+        """Test every payload fails when the failure rate is 1"""
+        validator = generate_schema(depth=2, width=8)
+        
+        for payload in generate_payloads(validator, 50, failure_rate=1.0):
+            self.assertFalse(validator.validate(payload).is_valid)
+    
+    def test_deterministic(self):
+        """Test the same seed produces the same payloads"""
+        validator = generate_schema()
+        
+        self.assertEqual(generate_payloads(validator, 10, 0.5, seed=7),
+                         generate_payloads(validator, 10, 0.5, seed=7))
+
+
+class TestResults(unittest.TestCase):
+    """Tests for measuring and comparing results"""
+    
+    def test_measure(self):
+        """Test the statistics reported for a scenario"""
+        result = measure("noop", lambda value: value, [1, 2, 3], repeat=2, items_per_input=10)
+        
+        self.assertEqual(result["operations"], 6)
+        self.assertLessEqual(result["p50_us"], result["p99_us"])
+        self.assertAlmostEqual(result["items_per_sec"], result["ops_per_sec"] * 10)
+    
+    def test_run_benchmarks(self):
+        """Test a small run produces every scenario"""
+        document = run_benchmarks(width=4, payloads=20, array_size=10, repeat=1)
+        
+        self.assertEqual(document["version"], RESULTS_VERSION)
+        self.assertEqual([result["name"] for result in document["results"]], [
+            "validate", "validate_compiled", "validate_fail_fast", "parse", "array_validate"
+        ])
+    
+    def test_compare(self):
+        """Test regressions beyond the threshold are flagged"""
+        def document(ops, p99, memory):
+            return {"version": RESULTS_VERSION, "results": [
+                {"name": "validate", "ops_per_sec": ops, "p99_us": p99, "peak_memory_bytes": memory}
+            ]}
+        
+        baseline = document(1000, 10, 100)
+        
+        self.assertFalse(compare(baseline, document(950, 10.5, 100))[0]["regressed"])
+        self.assertTrue(compare(baseline, document(800, 10, 100))[0]["regressed"])
+        self.assertTrue(compare(baseline, document(1000, 15, 100))[0]["regressed"])
+        self.assertTrue(compare(baseline, document(1000, 10, 200))[0]["regressed"])
+        with self.assertRaises(ValueError):
+            compare({"version": 0, "results": []}, baseline)
+
+
+if __name__ == '__main__':
+    unittest.main()
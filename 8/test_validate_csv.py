@@ -0,0 +1,124 @@
+"""
+Unit tests for the chunked CSV validator
+"""
+
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr, redirect_stdout
+from unittest.mock import patch
+
+import validate_csv
+from validate_csv import coerce_number, coerce_boolean, chunk_ranges
+from validator import Schema
+
+
+class TestCoercion(unittest.TestCase):
+    """Tests for typed coercion of cells"""
+    
+    def test_numbers(self):
+        """Test integer, float, empty and invalid number cells"""
+        self.assertEqual(coerce_number("42"), 42)
+        self.assertEqual(coerce_number("-1.5"), -1.5)
+        self.assertIsNone(coerce_number(""))
+        self.assertEqual(coerce_number("abc"), "abc")
+    
+    def test_booleans(self):
+        """Test the accepted spellings of booleans"""
+        self.assertIs(coerce_boolean("True"), True)
+        self.assertIs(coerce_boolean("no"), False)
+        self.assertIs(coerce_boolean("0"), False)
+        self.assertIsNone(coerce_boolean(""))
+        self.assertEqual(coerce_boolean("maybe"), "maybe")
+
+
+class TestChunking(unittest.TestCase):
+    """Tests for splitting files on record boundaries"""
+    
+    def test_quoted_newlines_stay_in_one_chunk(self):
+        """Test chunks never end inside a quoted field"""
+        data = b'1,"a\nb"\n2,"c\n\nd"\n3,e\n'
+        
+        for chunk_size in range(1, len(data) + 1):
+            ranges = list(chunk_ranges(data, 0, chunk_size))
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(ranges[0][0], 0)
+                self.assertEqual(ranges[-1][1], len(data))
+                self.assertTrue(all(data[end - 1:end] == b"\n" for _, end in ranges))
+                self.assertTrue(all(data[start:end].count(b'"') % 2 == 0 for start, end in ranges))
+
+
+class TestValidateCsv(unittest.TestCase):
+    """Tests for validating CSV files"""
+    
+    def setUp(self):
+        self.validator = Schema.object({
+            "id": Schema.number().min(1),
+            "name": Schema.string().min_length(1),
+            "active": Schema.boolean().optional(),
+        })
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "data.csv")
+        rows = ["id,name,active"]
+        for i in range(1, 101):
+            name = f'"line\nbreak {i}"' if i % 9 == 0 else f"name{i}"
+            rows.append(f"{-i if i % 10 == 0 else i},{name},{'yes' if i % 2 else ''}")
+        with open(self.path, "w", encoding="utf-8", newline="") as file:
+            file.write("\n".join(rows) + "\n")
+    
+    def test_reports_invalid_rows_in_order(self):
+        """Test invalid rows are numbered across chunks"""
+        for chunk_size in (16, 100, 1 << 20):
+            with self.subTest(chunk_size=chunk_size):
+                run = validate_csv.validate_csv(self.path, self.validator, workers=1, chunk_size=chunk_size)
+                failures = list(run)
+                
+                self.assertEqual([row for row, _ in failures], list(range(10, 101, 10)))
+                self.assertEqual(failures[0][1].errors, ["Field 'id': Number must be at least 1"])
+                self.assertEqual(run.rows, 100)
+    
+    def test_worker_processes(self):
+        """Test chunks validated in worker processes give the same report"""
+        run = validate_csv.validate_csv(self.path, self.validator, workers=2, chunk_size=64)
+        
+        self.assertEqual([row for row, _ in run], list(range(10, 101, 10)))
+    
+    def test_coercion_errors_and_strict_schemas(self):
+        """Test uncoercible cells and extra cells are reported"""
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.write("id,name\nabc,x\n1,y,extra\n")
+        
+        failures = list(validate_csv.validate_csv(self.path, self.validator.strict(), workers=1))
+        
+        self.assertEqual(failures[0][1].errors, ["Field 'id': Expected number, got str"])
+        self.assertEqual(failures[1][1].errors, ["Field '2': Unknown field"])
+    
+    def test_command_line(self):
+        """Test the command-line report and exit status"""
+        schema_path = os.path.join(os.path.dirname(self.path), "schema.bin")
+        self.validator.save(schema_path)
+        stdout, stderr = io.StringIO(), io.StringIO()
+        
+        argv = ["validate_csv.py", self.path, "--schema", schema_path, "--workers", "1", "--max-rows", "2"]
+        with patch("sys.argv", argv), redirect_stdout(stdout), redirect_stderr(stderr):
+            status = validate_csv.main()
+        
+        self.assertEqual(status, 1)
+        self.assertEqual(stdout.getvalue().splitlines(), [
+            "Row 10: Field 'id': Number must be at least 1",
+            "Row 20: Field 'id': Number must be at least 1",
+        ])
+        self.assertIn("Stopped after 2 invalid rows", stderr.getvalue())
+    
+    def test_empty_file(self):
+        """Test files without a header are rejected"""
+        open(self.path, "w").close()
+        
+        with self.assertRaises(ValueError):
+            list(validate_csv.validate_csv(self.path, self.validator, workers=1))
+
+
+if __name__ == '__main__':
+    unittest.main()
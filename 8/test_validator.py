@@ -4,11 +4,19 @@ Tests cover all core functionality with both valid and invalid data scenarios
 """
 
 import unittest
+import asyncio
 import re
+import io
+import json
+import os
+import tempfile
+from unittest.mock import patch
+import validator as validator_module
 from validator import (
-    Schema, ValidationResult, ValidationError,
+    Schema, ValidationResult, ValidationError, ValidationIssue, BaseValidator,
     StringValidator, NumberValidator, BooleanValidator, 
-    ArrayValidator, ObjectValidator
+    ArrayValidator, ObjectValidator, ValidationProfiler,
+    UnionValidator, DiscriminatedUnionValidator, TableValidator, LazyValidator
 )
 
 
@@ -22,6 +30,108 @@ class TestValidationResult(unittest.TestCase):
         
         self.assertTrue(valid_result)
         self.assertFalse(invalid_result)
+    
+    def test_success_is_shared(self):
+        """Test successful validations share one result instance"""
+        self.assertIs(Schema.string().validate("hello"), ValidationResult.success())
+        self.assertIs(Schema.number().validate(1), ValidationResult.success())
+        self.assertIs(Schema.boolean().validate(True), ValidationResult.success())
+        self.assertIs(Schema.array(Schema.number()).validate([1, 2]), ValidationResult.success())
+        self.assertIs(Schema.object({"a": Schema.number()}).validate({"a": 1}), ValidationResult.success())
+        self.assertIs(Schema.number().compile().validate(1), ValidationResult.success())
+    
+    def test_immutable(self):
+        """Test results cannot be modified"""
+        result = ValidationResult(False, ["Error"])
+        
+        with self.assertRaises(AttributeError):
+            result.is_valid = True
+        result.errors.append("Another error")
+        self.assertEqual(result.errors, ["Error"])
+    
+    def test_equality_and_pickling(self):
+        """Test results compare by value and survive pickling"""
+        import pickle
+        result = ValidationResult(False, ["Error"])
+        
+        self.assertEqual(result, ValidationResult(False, ("Error",)))
+        self.assertNotEqual(result, ValidationResult(True, []))
+        self.assertEqual(pickle.loads(pickle.dumps(result)), result)
+
+
+class TestValidationIssue(unittest.TestCase):
+    """Tests for structured validation issues"""
+    
+    def setUp(self):
+        self.validator = Schema.object({
+            "user": Schema.object({
+                "addresses": Schema.array(Schema.object({
+                    "zip": Schema.string().pattern(r'^\d{5}$')
+                }))
+            }),
+            "age": Schema.number().min(18)
+        })
+        self.data = {"user": {"addresses": [{"zip": "12345"}, {"zip": "abc"}]}, "age": 12}
+    
+    def test_issue_records(self):
+        """Test issues carry a path tuple, an error code and parameters"""
+        issues = self.validator.validate(self.data).issues
+        
+        self.assertEqual(issues[0].path, ("user", "addresses", 1, "zip"))
+        self.assertEqual(issues[0].code, "pattern")
+        self.assertEqual(issues[0].json_path, "$.user.addresses[1].zip")
+        self.assertEqual(issues[1].path, ("age",))
+        self.assertEqual(issues[1].code, "min")
+        self.assertEqual(issues[1].params, {"limit": 18})
+        self.assertEqual(issues[1].message, "Number must be at least 18")
+    
+    def test_errors_are_rendered_from_issues(self):
+        """Test the classic error strings are still available"""
+        result = self.validator.validate(self.data)
+        
+        self.assertEqual(result.errors, [
+            "Field 'user': Field 'addresses': Item at index 1: Field 'zip': String does not match required pattern",
+            "Field 'age': Number must be at least 18",
+        ])
+    
+    def test_type_and_custom_messages(self):
+        """Test type errors keep their parameters alongside custom messages"""
+        issue = Schema.string().with_message("Name must be text").validate(5).issues[0]
+        
+        self.assertEqual(issue.code, "type")
+        self.assertEqual(issue.params, {"expected": "string", "actual": "int"})
+        self.assertEqual(issue.message, "Name must be text")
+    
+    def test_plain_string_errors(self):
+        """Test plain string errors are wrapped as custom issues"""
+        result = ValidationResult(False, ["Something went wrong"])
+        
+        self.assertEqual(result.issues[0].code, "custom")
+        self.assertEqual(result.errors, ["Something went wrong"])
+    
+    def test_to_dict_and_pickling(self):
+        """Test issues can be serialized"""
+        import pickle
+        issue = ValidationIssue("min_items", {"limit": 2}, path=("tags",))
+        
+        self.assertEqual(issue.to_dict(), {
+            "path": ["tags"], "code": "min_items", "params": {"limit": 2},
+            "message": "Array must have at least 2 items"
+        })
+        self.assertEqual(str(issue), "Field 'tags': Array must have at least 2 items")
+        self.assertEqual(pickle.loads(pickle.dumps(issue)), issue)
+    
+    def test_parse_exposes_issues(self):
+        """Test ValidationError carries the structured issues"""
+        with self.assertRaises(ValidationError) as context:
+            self.validator.parse(self.data)
+        
+        self.assertEqual([issue.code for issue in context.exception.issues], ["pattern", "min"])
+    
+    def test_compiled_issues_match(self):
+        """Test compiled validators produce the same issues"""
+        self.assertEqual(self.validator.compile().validate(self.data).issues,
+                         self.validator.validate(self.data).issues)
 
 
 class TestStringValidator(unittest.TestCase):
@@ -333,6 +443,74 @@ class TestObjectValidator(unittest.TestCase):
         self.assertTrue(result.is_valid)
 
 
+class TestPatchValidation(unittest.TestCase):
+    """Tests for validating partial updates of valid documents"""
+    
+    def setUp(self):
+        self.validator = Schema.object({
+            "name": Schema.string().min_length(2),
+            "bio": Schema.string().optional(),
+            "tags": Schema.array(Schema.string()),
+            "address": Schema.object({
+                "city": Schema.string(),
+                "postal_code": Schema.string().pattern(r'^\d{5}$')
+            })
+        })
+        self.doc = {
+            "name": "John",
+            "bio": "Developer",
+            "tags": ["python"],
+            "address": {"city": "Anytown", "postal_code": "12345"}
+        }
+    
+    def test_valid_patch(self):
+        """Test a valid change to a few fields"""
+        result = self.validator.validate_patch(self.doc, {"name": "Jane", "bio": None, "tags": ["go"]})
+        
+        self.assertTrue(result.is_valid)
+    
+    def test_only_touched_fields_are_validated(self):
+        """Test untouched fields are not re-validated"""
+        calls = []
+        
+        class CountingValidator(BaseValidator):
+            def _validate_value(self, value, max_errors=None):
+                calls.append(value)
+                return ValidationResult.success()
+        
+        validator = Schema.object({"a": CountingValidator(), "b": CountingValidator()})
+        validator.validate_patch({"a": 1, "b": 2}, {"b": 3})
+        
+        self.assertEqual(calls, [3])
+    
+    def test_invalid_patch(self):
+        """Test invalid changes and removal of required fields"""
+        result = self.validator.validate_patch(self.doc, {"name": "J", "tags": None, "unknown": 1})
+        
+        self.assertEqual(result.errors, [
+            "Field 'name': String must be at least 2 characters long",
+            "Field 'tags': Value is required",
+        ])
+    
+    def test_nested_merge_patch(self):
+        """Test nested objects are patched field by field"""
+        result = self.validator.validate_patch(self.doc, {"address": {"postal_code": "123"}})
+        
+        self.assertEqual(result.errors, ["Field 'address': Field 'postal_code': String does not match required pattern"])
+        self.assertTrue(self.validator.validate_patch(self.doc, {"address": {"city": "Paris"}}).is_valid)
+        self.assertFalse(self.validator.validate_patch(self.doc, {"address": {"city": None}}).is_valid)
+    
+    def test_replacing_the_document(self):
+        """Test a non-dict patch replaces the whole document"""
+        self.assertFalse(self.validator.validate_patch(self.doc, ["not", "a", "dict"]).is_valid)
+    
+    def test_fail_fast(self):
+        """Test error limits apply to patches"""
+        result = self.validator.validate_patch(self.doc, {"name": "J", "tags": None}, fail_fast=True)
+        
+        self.assertEqual(len(result.errors), 1)
+
+
 class TestComplexValidation(unittest.TestCase):
     """Tests for complex nested validation scenarios"""
     
@@ -421,5 +599,1228 @@ class TestComplexValidation(unittest.TestCase):
         self.assertGreater(len(result.errors), 1)
 
 
+
+class TestErrorLimits(unittest.TestCase):
+    """Tests for fail-fast and max_errors validation"""
+    
+    def setUp(self):
+        self.validator = Schema.object({
+            "name": Schema.string().min_length(2),
+            "scores": Schema.array(Schema.number().min(0)),
+            "tags": Schema.array(Schema.string())
+        })
+        self.data = {"name": "J", "scores": [-1, -2, -3, 4], "tags": [1, 2]}
+    
+    def test_default_collects_all_errors(self):
+        """Test all errors are reported without a limit"""
+        self.assertEqual(len(self.validator.validate(self.data).errors), 6)
+    
+    def test_fail_fast(self):
+        """Test fail_fast stops at the first error"""
+        result = self.validator.validate(self.data, fail_fast=True)
+        
+        self.assertFalse(result.is_valid)
+        self.assertEqual(result.errors, ["Field 'name': String must be at least 2 characters long"])
+    
+    def test_max_errors_passed_to_nested_validators(self):
+        """Test the error budget is shared with nested validators"""
+        result = self.validator.validate(self.data, max_errors=3)
+        
+        self.assertEqual(result.errors, [
+            "Field 'name': String must be at least 2 characters long",
+            "Field 'scores': Item at index 0: Number must be at least 0",
+            "Field 'scores': Item at index 1: Number must be at least 0",
+        ])
+    
+    def test_fail_fast_stops_iterating(self):
+        """Test items after the first failure are not visited"""
+        visited = []
+        
+        class RecordingValidator(BaseValidator):
+            def _validate_value(self, value, max_errors=None):
+                visited.append(value)
+                return ValidationResult(False, ["bad"])
+        
+        result = Schema.array(RecordingValidator()).validate(list(range(1000)), fail_fast=True)
+        
+        self.assertEqual(result.errors, ["Item at index 0: bad"])
+        self.assertEqual(visited, [0])
+    
+    def test_one_argument_custom_validators(self):
+        """Test _validate_value overrides without max_errors still work and respect the budget"""
+        class PairValidator(BaseValidator):
+            def _validate_value(self, value):
+                if value % 2:
+                    return ValidationResult(False, ["Number must be even", "Number must be a pair"])
+                return ValidationResult(True, [])
+        
+        validator = PairValidator()
+        nested = Schema.object({"n": validator})
+        
+        self.assertTrue(validator.validate(2).is_valid)
+        self.assertEqual(len(validator.validate(3).errors), 2)
+        self.assertEqual(validator.validate(3, fail_fast=True).errors, ["Number must be even"])
+        self.assertEqual(nested.validate({"n": 3}, max_errors=1).errors, ["Field 'n': Number must be even"])
+        self.assertEqual(nested.compile().validate({"n": 3}, max_errors=1), nested.validate({"n": 3}, max_errors=1))
+        self.assertEqual(PairValidator().cached().validate(3, fail_fast=True).errors, ["Number must be even"])
+    
+    def test_leaf_errors_are_limited(self):
+        """Test a leaf validator stops before its remaining checks"""
+        validator = Schema.string().min_length(5).pattern(r'^\d+$')
+        
+        self.assertEqual(len(validator.validate("ab").errors), 2)
+        self.assertEqual(validator.validate("ab", fail_fast=True).errors,
+                         ["String must be at least 5 characters long"])
+    
+    def test_invalid_max_errors(self):
+        """Test max_errors must be positive"""
+        with self.assertRaises(ValueError):
+            self.validator.validate(self.data, max_errors=0)
+    
+    def test_compiled_limits_match_validate(self):
+        """Test compiled validators honour the same limits"""
+        compiled = self.validator.compile()
+        
+        for max_errors in (1, 2, 3, 5, 10):
+            with self.subTest(max_errors=max_errors):
+                self.assertEqual(compiled.validate(self.data, max_errors=max_errors),
+                                 self.validator.validate(self.data, max_errors=max_errors))
+        self.assertEqual(compiled(self.data, fail_fast=True),
+                         self.validator.validate(self.data, fail_fast=True))
+
+
+class TestValidateMany(unittest.TestCase):
+    """Tests for batch validation with failure bitmaps"""
+    
+    def check_batch(self, validator, values):
+        """Checks validate_many against per-value validate, with and without NumPy"""
+        expected = [i for i, value in enumerate(values) if not validator.validate(value).is_valid]
+        results = [validator.validate_many(values)]
+        with patch.object(validator_module, "np", None):
+            results.append(validator.validate_many(values))
+        for result in results:
+            self.assertEqual(result.invalid_indices(), expected)
+            self.assertEqual(result.invalid_count, len(expected))
+        return results[0]
+    
+    def test_number_batch(self):
+        """Test range checks over a batch of numbers"""
+        validator = Schema.number().min(0).max(150)
+        
+        self.check_batch(validator, [25, -1, 150, 151.5, 0.0, True])
+        self.check_batch(validator, [25, "30", None, 2 ** 60])
+        self.check_batch(validator.optional(), [1, None, -3])
+    
+    def test_string_batch(self):
+        """Test length and pattern checks over a batch of strings"""
+        self.check_batch(Schema.string().min_length(2).max_length(4), ["a", "ab", "abcd", "abcde", ""])
+        self.check_batch(Schema.string().min_length(2).pattern(r'^\d+$'), ["12", "1", "ab", 12, None])
+    
+    def test_generic_batch(self):
+        """Test validators without a specialized batch path"""
+        validator = Schema.object({"id": Schema.number()})
+        
+        self.check_batch(validator, [{"id": 1}, {"id": "1"}, {}, {"id": 2}])
+    
+    def test_subclass_batch(self):
+        """Test subclasses of the built-in validators keep their own checks in batches"""
+        class IntegerValidator(NumberValidator):
+            def _validate_value(self, value, max_errors=None):
+                if isinstance(value, float) and not value.is_integer():
+                    return ValidationResult(False, ["Number must be an integer"])
+                return super()._validate_value(value, max_errors)
+        
+        class UpperValidator(StringValidator):
+            def _validate_value(self, value, max_errors=None):
+                if isinstance(value, str) and not value.isupper():
+                    return ValidationResult(False, ["String must be upper case"])
+                return super()._validate_value(value, max_errors)
+        
+        self.assertEqual(self.check_batch(IntegerValidator().min(0), [1, 2.5, -3, 4.0]).invalid_indices(), [1, 2])
+        self.check_batch(UpperValidator().min_length(2), ["AB", "ab", "A"])
+        table = Schema.table({"n": IntegerValidator()})
+        self.assertEqual(table.validate({"n": [1, 2.5, 3]}).errors,
+                         ["Item at index 1: Field 'n': Number must be an integer"])
+    
+    def test_bitmap_and_details(self):
+        """Test the bitmap layout and on-demand details"""
+        values = [1] * 9 + [-1]
+        result = Schema.number().min(0).validate_many(values)
+        
+        self.assertEqual(result.bitmap, bytearray([0, 0b10]))
+        self.assertEqual(len(result), 10)
+        self.assertFalse(result.is_valid)
+        self.assertTrue(result.is_invalid(9))
+        self.assertFalse(result.is_invalid(0))
+        self.assertEqual(result.details(9).errors, ["Number must be at least 0"])
+        self.assertEqual([issue.path for issue in result.issues()], [(9,)])
+    
+    def test_valid_batch(self):
+        """Test a batch where every value passes"""
+        result = Schema.string().validate_many(iter(["a", "b"]))
+        
+        self.assertTrue(result)
+        self.assertEqual(result.invalid_indices(), [])
+    
+    @unittest.skipUnless(validator_module.np is not None, "NumPy is not installed")
+    def test_numpy_input(self):
+        """Test NumPy arrays are checked directly"""
+        import numpy as np
+        
+        result = Schema.number().max(10).validate_many(np.array([1, 20, 5, 11]))
+        self.assertEqual(result.invalid_indices(), [1, 3])
+        
+        result = Schema.string().max_length(2).validate_many(np.array(["ab", "abc"]))
+        self.assertEqual(result.invalid_indices(), [1])
+        
+        # Details see the Python value of each element, as the vectorized pass does
+        result = Schema.number().min(0).validate_many(np.array([1, -2]))
+        self.assertEqual(result.details(1).errors, ["Number must be at least 0"])
+        self.assertEqual([issue.code for issue in result.issues()], ["min"])
+        result = Schema.number().max(2 ** 60).validate_many(np.array([1, 2 ** 61]))
+        self.assertEqual(result.invalid_indices(), [1])
+        self.assertEqual(result.details(1).issues[0].code, "max")
+        self.assertTrue(Schema.boolean().validate_many(np.array([True, False])).is_valid)
+
+
+class TestStreamingValidation(unittest.TestCase):
+    """Tests for validating iterables and JSON Lines files"""
+    
+    def setUp(self):
+        self.validator = Schema.object({"id": Schema.number(), "name": Schema.string()})
+        self.jsonl = (
+            b'{"id": 1, "name": "caf\xc3\xa9"}\n'
+            b'\n'
+            b'{"id": "2", "name": "b"}\r\n'
+            b'{not json\n'
+            b'{"id": 4, "name": "d"}'
+        )
+    
+    def test_validate_stream_is_lazy(self):
+        """Test values are pulled from the iterable one at a time"""
+        pulled = []
+        
+        def records():
+            for i in range(3):
+                pulled.append(i)
+                yield {"id": i, "name": "x"}
+        
+        stream = self.validator.validate_stream(records())
+        index, result = next(stream)
+        
+        self.assertEqual((index, result.is_valid), (0, True))
+        self.assertEqual(pulled, [0])
+    
+    def test_validate_stream_fail_fast(self):
+        """Test fail_fast stops after the first invalid value"""
+        results = list(self.validator.validate_stream([{"id": 1, "name": "a"}, {}, {}], fail_fast=True))
+        
+        self.assertEqual([index for index, _ in results], [0, 1])
+        self.assertEqual(results[1][1].errors, ["Field 'id': Value is required"])
+    
+    def test_validate_jsonl_chunks(self):
+        """Test records are split correctly regardless of the chunk size"""
+        for chunk_size in (1, 2, 7, 1 << 20):
+            with self.subTest(chunk_size=chunk_size):
+                results = list(self.validator.validate_jsonl(io.BytesIO(self.jsonl), chunk_size=chunk_size))
+                
+                self.assertEqual([index for index, _ in results], [0, 2, 3, 4])
+                self.assertEqual([result.is_valid for _, result in results], [True, False, False, True])
+                self.assertEqual(results[2][1].issues[0].code, "json")
+    
+    def test_validate_jsonl_from_path(self):
+        """Test validating a JSON Lines file on disk with fail_fast"""
+        with tempfile.NamedTemporaryFile(suffix=".jsonl", delete=False) as file:
+            file.write(self.jsonl)
+        try:
+            results = list(self.validator.validate_jsonl(file.name, fail_fast=True))
+        finally:
+            os.unlink(file.name)
+        
+        self.assertEqual([index for index, _ in results], [0, 2])
+    
+    def test_validate_jsonl_text_file(self):
+        """Test text-mode files are accepted"""
+        results = list(self.validator.validate_jsonl(io.StringIO(self.jsonl.decode("utf-8")), chunk_size=3))
+        
+        self.assertEqual([result.is_valid for _, result in results], [True, False, False, True])
+
+
+class TestParallelValidation(unittest.TestCase):
+    """Tests for validating large arrays on a process pool"""
+    
+    def setUp(self):
+        self.validator = Schema.array(Schema.object({
+            "id": Schema.number().min(0),
+            "name": Schema.string().min_length(1)
+        })).max_length(90)
+        self.data = [{"id": i if i % 7 else -i, "name": "x" if i % 11 else ""} for i in range(100)]
+    
+    def test_matches_sequential_validation(self):
+        """Test merged results keep the correct item indices"""
+        result = self.validator.validate_parallel(self.data, workers=2, chunk_size=8)
+        
+        self.assertEqual(result, self.validator.validate(self.data))
+        self.assertIn("Item at index 14: Field 'id': Number must be at least 0", result.errors)
+    
+    def test_error_limits(self):
+        """Test max_errors and fail_fast across chunks"""
+        for max_errors in (1, 3, 10):
+            with self.subTest(max_errors=max_errors):
+                self.assertEqual(
+                    self.validator.validate_parallel(self.data, workers=2, chunk_size=8, max_errors=max_errors),
+                    self.validator.validate(self.data, max_errors=max_errors))
+        self.assertEqual(self.validator.validate_parallel(self.data, workers=2, chunk_size=8, fail_fast=True),
+                         self.validator.validate(self.data, fail_fast=True))
+    
+    def test_small_input_runs_in_process(self):
+        """Test inputs that fit in one chunk or are not lists skip the pool"""
+        with patch.object(validator_module, "ProcessPoolExecutor") as executor:
+            self.assertTrue(self.validator.validate_parallel(self.data[1:6], workers=2).is_valid)
+            self.assertFalse(self.validator.validate_parallel("items", workers=2).is_valid)
+        executor.assert_not_called()
+
+
+class TestResultCache(unittest.TestCase):
+    """Tests for memoizing results of repeated immutable values"""
+    
+    def test_hits_and_misses(self):
+        """Test repeated values are served from the cache"""
+        validator = Schema.string().pattern(r'^[A-Z]{2}$').cached(maxsize=2)
+        
+        for code in ["US", "DE", "US", "us", "US"]:
+            validator.validate(code)
+        
+        info = validator.cache_info()
+        self.assertEqual((info.hits, info.misses, info.maxsize, info.currsize), (2, 3, 2, 2))
+        
+        # "DE" was the least recently used entry and has been evicted
+        validator.validate("DE")
+        self.assertEqual(validator.cache_info().misses, 4)
+    
+    def test_disabled_by_default(self):
+        """Test validators do not cache unless asked to"""
+        self.assertIsNone(Schema.string().cache_info())
+        with self.assertRaises(ValueError):
+            Schema.string().cached(maxsize=0)
+    
+    def test_reconfiguring_invalidates(self):
+        """Test builder methods clear cached results"""
+        validator = Schema.number().cached()
+        self.assertTrue(validator.validate(5).is_valid)
+        
+        validator.min(10)
+        
+        self.assertFalse(validator.validate(5).is_valid)
+        self.assertEqual(validator.cache_info().currsize, 1)
+    
+    def test_reconfiguring_nested_validators_invalidates(self):
+        """Test parents with caches notice reconfigured children"""
+        item = Schema.string()
+        union = Schema.union(item, Schema.number()).cached()
+        lazy = Schema.lazy(lambda: item).cached()
+        self.assertTrue(union.validate("ab").is_valid)
+        self.assertTrue(lazy.validate("ab").is_valid)
+        
+        item.min_length(5)
+        Schema.string().min_length(2)
+        
+        self.assertFalse(union.validate("ab").is_valid)
+        self.assertFalse(lazy.validate("ab").is_valid)
+        self.assertEqual(union.cache_info().currsize, 1)
+        self.assertTrue(union.validate("abcde").is_valid)
+        self.assertEqual(union.cache_info().hits, 0)
+        self.assertTrue(union.validate("abcde").is_valid)
+        self.assertEqual(union.cache_info().hits, 1)
+    
+    def test_values_are_keyed_by_type(self):
+        """Test equal values of different types are cached separately"""
+        validator = Schema.boolean().cached()
+        
+        self.assertFalse(validator.validate(1).is_valid)
+        self.assertTrue(validator.validate(True).is_valid)
+        self.assertFalse(validator.validate(1.0).is_valid)
+    
+    def test_uncacheable_values(self):
+        """Test mutable and unhashable values bypass the cache"""
+        validator = Schema.string().cached()
+        
+        self.assertFalse(validator.validate(["a"]).is_valid)
+        self.assertFalse(validator.validate(([],)).is_valid)
+        self.assertEqual(validator.cache_info().currsize, 0)
+    
+    def test_error_limits_and_nesting(self):
+        """Test cached results respect error budgets and nested paths"""
+        item = Schema.string().min_length(5).pattern(r'^\d+$').cached()
+        validator = Schema.array(item)
+        
+        self.assertEqual(len(validator.validate(["ab", "ab"]).errors), 4)
+        self.assertEqual(validator.validate(["ab", "ab"], max_errors=3).errors[2],
+                         "Item at index 1: String must be at least 5 characters long")
+        self.assertEqual(item.validate("ab").errors[0], "String must be at least 5 characters long")
+    
+    def test_compiled_and_pickled(self):
+        """Test compiled validators use the cache and copies start empty"""
+        import pickle
+        item = Schema.string().cached()
+        compiled = Schema.array(item).compile()
+        
+        self.assertEqual(compiled.validate(["a", "a", 1]).errors, ["Item at index 2: Expected string, got int"])
+        self.assertEqual(item.cache_info().hits, 1)
+        
+        copy = pickle.loads(pickle.dumps(item))
+        self.assertEqual(copy.cache_info().currsize, 0)
+        self.assertTrue(copy.validate("a").is_valid)
+
+
+class TestProfiling(unittest.TestCase):
+    """Tests for per-path timing instrumentation"""
+    
+    def setUp(self):
+        self.zip_code = Schema.string().pattern(r'^\d{5}$')
+        self.validator = Schema.object({
+            "user": Schema.object({
+                "name": Schema.string(),
+                "addresses": Schema.array(Schema.object({"zip": self.zip_code}))
+            })
+        })
+        self.data = {"user": {"name": "Ann", "addresses": [{"zip": "12345"}, {"zip": "1"}]}}
+    
+    def test_counts_per_path(self):
+        """Test calls and failures are recorded per schema path"""
+        with self.validator.instrument() as profiler:
+            self.validator.validate(self.data)
+            self.validator.validate(self.data)
+        
+        stats = profiler.to_dict()
+        self.assertEqual(set(stats), {"<root>", "user", "user.name", "user.addresses",
+                                      "user.addresses[]", "user.addresses[].zip"})
+        self.assertEqual(stats["user.addresses[].zip"]["calls"], 4)
+        self.assertEqual(stats["user.addresses[].zip"]["failures"], 2)
+        self.assertEqual(stats["user.name"]["failures"], 0)
+        self.assertGreaterEqual(stats["<root>"]["total_seconds"], stats["user"]["total_seconds"])
+        self.assertEqual(profiler.top(1)[0][0], "<root>")
+        self.assertEqual(json.loads(profiler.to_json())["user"]["calls"], 2)
+    
+    def test_detach_restores_validators(self):
+        """Test detaching removes all instrumentation"""
+        profiler = ValidationProfiler().attach(self.validator)
+        self.assertIn("validate", self.zip_code.__dict__)
+        
+        profiler.detach()
+        self.validator.validate(self.data)
+        
+        self.assertNotIn("validate", self.zip_code.__dict__)
+        self.assertEqual(profiler.to_dict()["<root>"]["calls"], 0)
+    
+    def test_results_and_cache_unchanged(self):
+        """Test instrumented validation returns the same results and keeps caches"""
+        self.zip_code.cached()
+        expected = self.validator.validate(self.data).errors
+        
+        with self.validator.instrument() as profiler:
+            self.assertEqual(self.validator.validate(self.data).errors, expected)
+            self.assertEqual(self.validator.validate(self.data, max_errors=1).errors, expected[:1])
+            profiler.reset()
+            self.assertEqual(profiler.to_dict()["user"]["calls"], 0)
+        
+        self.assertEqual(self.zip_code.cache_info().currsize, 2)
+
+
+class FakeUserStore:
+    """In-memory stand-in for a database used by async checks"""
+    
+    def __init__(self, taken):
+        self.taken = set(taken)
+        self.lookups = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+    
+    async def username_free(self, username):
+        self.lookups.append(username)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0)
+        self.in_flight -= 1
+        return username not in self.taken
+
+
+class TestAsyncValidation(unittest.TestCase):
+    """Tests for avalidate() and async checks"""
+    
+    def setUp(self):
+        self.store = FakeUserStore({"taken", "admin"})
+        self.validator = Schema.object({
+            "users": Schema.array(Schema.object({
+                "username": Schema.string().min_length(3).check_async(self.store.username_free,
+                                                                      "Username is already taken")
+            }))
+        })
+    
+    def payload(self, *names):
+        return {"users": [{"username": name} for name in names]}
+    
+    def test_async_checks_report_paths(self):
+        """Test failing async checks produce issues at their paths"""
+        result = asyncio.run(self.validator.avalidate(self.payload("ann", "taken", "bob", "admin")))
+        
+        self.assertFalse(result.is_valid)
+        self.assertEqual([issue.path for issue in result.issues],
+                         [("users", 1, "username"), ("users", 3, "username")])
+        self.assertEqual(result.errors[0], "Field 'users': Item at index 1: Field 'username': Username is already taken")
+        self.assertEqual(result.issues[0].code, "check")
+    
+    def test_sync_failures_short_circuit(self):
+        """Test no async check runs when a sync check fails"""
+        result = asyncio.run(self.validator.avalidate(self.payload("ann", "x")))
+        
+        self.assertEqual(result.issues[0].code, "min_length")
+        self.assertEqual(self.store.lookups, [])
+        self.assertTrue(self.validator.validate(self.payload("taken")).is_valid)
+    
+    def test_bounded_concurrency(self):
+        """Test at most `concurrency` checks are in flight"""
+        names = [f"user{i}" for i in range(20)]
+        
+        result = asyncio.run(self.validator.avalidate(self.payload(*names), concurrency=4))
+        
+        self.assertTrue(result.is_valid)
+        self.assertEqual(sorted(self.store.lookups), sorted(names))
+        self.assertEqual(self.store.max_in_flight, 4)
+        with self.assertRaises(ValueError):
+            asyncio.run(self.validator.avalidate({}, concurrency=0))
+    
+    def test_fail_fast_stops_lookups(self):
+        """Test no new checks start once the error budget is used up"""
+        names = ["taken"] + [f"user{i}" for i in range(20)]
+        
+        result = asyncio.run(self.validator.avalidate(self.payload(*names), fail_fast=True, concurrency=2))
+        
+        self.assertEqual(len(result.errors), 1)
+        self.assertLess(len(self.store.lookups), len(names))
+    
+    def test_checks_on_containers_and_optional_values(self):
+        """Test async checks on objects and skipped None values"""
+        async def has_users(value):
+            return bool(value["users"])
+        
+        validator = Schema.object({"users": Schema.array(Schema.string()).optional()}).check_async(has_users)
+        self.assertEqual(asyncio.run(validator.avalidate({"users": []})).errors,
+                         ["Value failed check 'has_users'"])
+        
+        optional = Schema.string().optional().check_async(self.store.username_free)
+        self.assertTrue(asyncio.run(optional.avalidate(None)).is_valid)
+        self.assertEqual(self.store.lookups, [])
+
+
+class TestValidateJson(unittest.TestCase):
+    """Tests for validating JSON text while parsing it"""
+    
+    def setUp(self):
+        # Walk every document incrementally, however small
+        patcher = patch.object(validator_module, "_JSON_INCREMENTAL_MIN_SIZE", 0)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.validator = Schema.object({
+            "name": Schema.string().min_length(2),
+            "tags": Schema.array(Schema.string().max_length(5)).max_length(3),
+            "owner": Schema.object({"id": Schema.number().min(1)}).optional()
+        })
+    
+    def test_matches_validate(self):
+        """Test results equal json.loads followed by validate()"""
+        documents = [
+            '{"name": "Ann", "tags": ["a", "b"]}',
+            '{"tags": ["toolong", 1, "a", "b"], "owner": {"id": 0}, "name": "A"}',
+            '{"name": null, "tags": {}, "owner": []}',
+            '{ "name" : "Ann" , "tags" : [ ] , "owner" : { "id" : 5 } }',
+            '[1, 2]',
+            'null',
+        ]
+        for document in documents:
+            with self.subTest(document=document):
+                self.assertEqual(self.validator.validate_json(document),
+                                 self.validator.validate(json.loads(document)))
+    
+    def test_unreferenced_fields_are_skipped(self):
+        """Test fields outside the schema are not decoded"""
+        document = '{"name": "Ann", "blob": {"x": [1, {"y": "]}"}], "z": tru}, "tags": []}'
+        
+        self.assertTrue(self.validator.validate_json(document).is_valid)
+    
+    def test_stops_at_first_failure(self):
+        """Test fail_fast returns before reading the rest of the document"""
+        document = '{"name": 1, "tags": [oops'
+        
+        result = self.validator.validate_json(document, fail_fast=True)
+        
+        self.assertEqual(result.errors, ["Field 'name': Expected string, got int"])
+        self.assertEqual(self.validator.validate_json(document).issues[0].code, "json")
+    
+    def test_sources_and_malformed_input(self):
+        """Test bytes, files and malformed documents"""
+        document = '{"name": "Ann", "tags": ["\u00e9"]}'
+        
+        self.assertTrue(self.validator.validate_json(document.encode("utf-16")).is_valid)
+        self.assertTrue(self.validator.validate_json(io.BytesIO(document.encode())).is_valid)
+        for malformed in ['{"name": "Ann",}', '{"name" "Ann"}', '{"name": "Ann"} []', '']:
+            with self.subTest(document=malformed):
+                self.assertEqual(self.validator.validate_json(malformed).issues[0].code, "json")
+    
+    def test_small_documents(self):
+        """Test small documents give the same results without the incremental walk"""
+        validator_module._JSON_INCREMENTAL_MIN_SIZE = 1 << 16
+        
+        self.assertEqual(self.validator.validate_json('{"name": 1}', max_errors=1).errors,
+                         ["Field 'name': Expected string, got int"])
+        self.assertEqual(self.validator.validate_json('{').issues[0].code, "json")
+
+
+class TestUnionValidation(unittest.TestCase):
+    """Tests for union and discriminated union validators"""
+    
+    def setUp(self):
+        self.event = Schema.discriminated("type", {
+            "click": Schema.object({"type": Schema.string(), "x": Schema.number(), "y": Schema.number()}),
+            "view": Schema.object({"type": Schema.string(), "url": Schema.string().pattern(r'^https?://')}),
+        })
+    
+    def test_union_accepts_any_branch(self):
+        """Test a union passes when one of its validators passes"""
+        validator = Schema.union(Schema.string().min_length(3), Schema.number().min(0))
+        self.assertIsInstance(validator, UnionValidator)
+        
+        self.assertTrue(validator.validate("abc").is_valid)
+        self.assertTrue(validator.validate(5).is_valid)
+        self.assertEqual(validator.validate([]).errors, ["Value does not match any of the allowed schemas"])
+        self.assertEqual(validator.validate(None).issues[0].code, "required")
+    
+    def test_union_reports_the_only_matching_type(self):
+        """Test the errors of the one branch with the right type are reported"""
+        validator = Schema.union(Schema.string().min_length(3), Schema.number().min(0))
+        
+        self.assertEqual(validator.validate("ab").errors, ["String must be at least 3 characters long"])
+        self.assertEqual(validator.with_message("Bad value").validate("ab").errors, ["Bad value"])
+    
+    def test_discriminated_dispatch(self):
+        """Test the tag selects the branch"""
+        self.assertIsInstance(self.event, DiscriminatedUnionValidator)
+        self.assertTrue(self.event.validate({"type": "click", "x": 1, "y": 2}).is_valid)
+        self.assertEqual(self.event.validate({"type": "view", "url": "ftp://x"}).errors,
+                         ["Field 'url': String does not match required pattern"])
+    
+    def test_discriminated_tag_errors(self):
+        """Test missing, unknown and unhashable tags and non-objects"""
+        self.assertEqual(self.event.validate({"x": 1}).errors, ["Field 'type': Value is required"])
+        unknown = self.event.validate({"type": "scroll"})
+        self.assertEqual(unknown.errors, ["Field 'type': Unknown tag 'scroll', expected one of ['click', 'view']"])
+        self.assertEqual(unknown.issues[0].params, {"tag": "scroll", "allowed": ["click", "view"]})
+        self.assertEqual(self.event.validate({"type": ["click"]}).issues[0].code, "tag")
+        self.assertEqual(self.event.validate("click").errors, ["Expected dict, got str"])
+    
+    def test_compiled_matches_interpreted(self):
+        """Test compiled unions give the same results"""
+        validator = Schema.array(Schema.union(self.event, Schema.string()))
+        data = [{"type": "click", "x": 1, "y": "2"}, {"type": "scroll"}, {}, [1], "ok", {"type": ["x"]}]
+        
+        self.assertEqual(validator.compile().validate(data), validator.validate(data))
+        self.assertEqual(Schema.array(self.event).compile().validate(data[:4]).errors,
+                         Schema.array(self.event).validate(data[:4]).errors)
+    
+    def test_profiler_paths(self):
+        """Test branches show up as "<tag>" in profiler paths"""
+        with Schema.object({"event": self.event}).instrument() as profiler:
+            pass
+        self.assertIn("event<click>.x", profiler.to_dict())
+
+
+class TestPersistence(unittest.TestCase):
+    """Tests for saving and loading validator artifacts"""
+    
+    def setUp(self):
+        self.validator = Schema.object({
+            "name": Schema.string().min_length(2).pattern(r'^[A-Z]'),
+            "tags": Schema.array(Schema.string().max_length(5)).optional(),
+            "event": Schema.discriminated("type", {
+                "click": Schema.object({"type": Schema.string(), "x": Schema.number().min(0)})
+            }).optional()
+        })
+        self.samples = [
+            {"name": "Ann", "tags": ["a"], "event": {"type": "click", "x": 3}},
+            {"name": "ann", "tags": ["toolong"], "event": {"type": "click", "x": -1}},
+            {"name": 5, "event": {"type": "view"}},
+        ]
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "schema.bin")
+    
+    def test_validator_round_trip(self):
+        """Test a saved validator tree validates like the original"""
+        self.validator.save(self.path)
+        loaded = Schema.load(self.path)
+        
+        self.assertIsInstance(loaded, ObjectValidator)
+        for sample in self.samples:
+            self.assertEqual(loaded.validate(sample), self.validator.validate(sample))
+    
+    def test_compiled_round_trip(self):
+        """Test compiled validators load without generating code again"""
+        nested = Schema.string()
+        for _ in range(20):
+            nested = Schema.array(nested)
+        buffer = io.BytesIO()
+        Schema.array(self.validator).compile().save(buffer)
+        nested.compile().save(self.path)
+        
+        buffer.seek(0)
+        with patch.object(validator_module._SchemaCompiler, "compile", side_effect=AssertionError):
+            loaded = Schema.load(buffer)
+            loaded_nested = Schema.load(self.path)
+        
+        self.assertEqual(loaded.validate(self.samples), Schema.array(self.validator).validate(self.samples))
+        deep_value = 1
+        for _ in range(20):
+            deep_value = [deep_value]
+        self.assertEqual(loaded_nested.validate(deep_value).issues[0].path, (0,) * 20)
+    
+    def test_rejects_mismatched_artifacts(self):
+        """Test artifacts from other library versions or with damage are rejected"""
+        self.validator.save(self.path)
+        with open(self.path, "rb") as file:
+            data = file.read()
+        
+        with patch.object(validator_module, "_library_fingerprint", return_value="other"):
+            with self.assertRaisesRegex(ValueError, "different version"):
+                Schema.load(self.path)
+        with self.assertRaisesRegex(ValueError, "checksum"):
+            Schema.load(io.BytesIO(data[:-1] + bytes([data[-1] ^ 1])))
+        with self.assertRaisesRegex(ValueError, "Not a validator artifact"):
+            Schema.load(io.BytesIO(b"{}"))
+
+
+class TestBufferArrays(unittest.TestCase):
+    """Tests for validating numeric buffers with ArrayValidator"""
+    
+    def setUp(self):
+        self.validator = Schema.array(Schema.number().min(0).max(100))
+        self.values = [5, -1, 50, 101, 100.5, 0]
+    
+    def test_array_and_memoryview(self):
+        """Test array.array and memoryview are accepted like lists"""
+        import array
+        expected = self.validator.validate([float(x) for x in self.values])
+        
+        for value in (array.array("d", self.values), memoryview(array.array("d", self.values))):
+            with self.subTest(type=type(value).__name__):
+                self.assertEqual(self.validator.validate(value), expected)
+                self.assertEqual(self.validator.compile().validate(value), expected)
+        with patch.object(validator_module, "np", None):
+            self.assertEqual(self.validator.validate(array.array("d", self.values)), expected)
+    
+    @unittest.skipUnless(validator_module.np is not None, "NumPy is not installed")
+    def test_numpy_arrays(self):
+        """Test NumPy arrays report only the offending indices"""
+        import numpy as np
+        
+        result = self.validator.validate(np.array(self.values))
+        self.assertEqual([(issue.path, issue.code) for issue in result.issues],
+                         [((1,), "min"), ((3,), "max"), ((4,), "max")])
+        self.assertEqual(result.errors[0], "Item at index 1: Number must be at least 0")
+        self.assertEqual(len(self.validator.validate(np.array(self.values), max_errors=2).issues), 2)
+        self.assertTrue(self.validator.validate(np.arange(101, dtype=np.uint8)).is_valid)
+        self.assertEqual(self.validator.validate(np.zeros((2, 2))).errors, ["Expected list, got ndarray"])
+    
+    @unittest.skipUnless(validator_module.np is not None, "NumPy is not installed")
+    def test_exact_comparisons(self):
+        """Test limits are compared exactly whatever the dtype"""
+        import numpy as np
+        
+        cases = [
+            (np.array([2, 3], dtype=np.int64), 2.5),
+            (np.array([2 ** 53 + 1], dtype=np.int64), 2 ** 53),
+            (np.array([2 ** 63], dtype=np.uint64), -1),
+            (np.array([2.0 ** 60], dtype=np.float64), 2 ** 60 + 1),
+            (np.array([0.1], dtype=np.float32), 0.1),
+        ]
+        for numbers, limit in cases:
+            validator = Schema.array(Schema.number().min(limit).max(limit))
+            with self.subTest(dtype=numbers.dtype, limit=limit):
+                self.assertEqual(validator.validate(numbers), validator.validate(numbers.tolist()))
+    
+    def test_only_plain_number_items(self):
+        """Test buffers are still rejected for other item validators"""
+        import array
+        
+        self.assertEqual(Schema.array(Schema.string()).validate(array.array("i", [1])).errors,
+                         ["Expected list, got array"])
+
+
+class TestUnknownFields(unittest.TestCase):
+    """Tests for strict() and strip_unknown() object modes"""
+    
+    def setUp(self):
+        self.address = Schema.object({"city": Schema.string()})
+        self.validator = Schema.object({
+            "name": Schema.string(),
+            "addresses": Schema.array(self.address).optional()
+        })
+        self.data = {"name": "Ann", "admin": True, "addresses": [{"city": "Oslo", "zip": "0150"}]}
+    
+    def test_extra_fields_ignored_by_default(self):
+        """Test unknown fields are accepted and kept without a mode"""
+        self.assertTrue(self.validator.validate(self.data).is_valid)
+        self.assertIs(self.validator.parse(self.data), self.data)
+    
+    def test_strict(self):
+        """Test strict objects report each unknown field after the schema fields"""
+        self.validator.strict()
+        self.address.strict()
+        
+        result = self.validator.validate(dict(self.data, name=1))
+        self.assertEqual(result.errors, [
+            "Field 'name': Expected string, got int",
+            "Field 'addresses': Item at index 0: Field 'zip': Unknown field",
+            "Field 'admin': Unknown field",
+        ])
+        self.assertEqual(result.issues[2].code, "unknown")
+        self.assertEqual(len(self.validator.validate(self.data, max_errors=1).errors), 1)
+        self.assertEqual(self.validator.compile().validate(dict(self.data, name=1)), result)
+        self.assertTrue(self.validator.validate({"name": "Ann"}).is_valid)
+    
+    def test_strict_follows_schema_edits(self):
+        """Test fields added to the schema dict in place are not reported as unknown"""
+        import pickle
+        self.validator.strict()
+        compiled = self.validator.compile()
+        self.validator.schema["admin"] = Schema.boolean()
+        
+        self.assertTrue(self.validator.validate(self.data).is_valid)
+        self.assertEqual(compiled.validate(self.data).errors, ["Field 'admin': Unknown field"])
+        del self.validator.schema["admin"]
+        self.assertEqual(self.validator.validate(self.data).errors, ["Field 'admin': Unknown field"])
+        
+        copy = pickle.loads(pickle.dumps(self.validator))
+        copy.schema["admin"] = Schema.boolean()
+        self.assertTrue(copy.validate(self.data).is_valid)
+    
+    def test_strict_patch_and_json(self):
+        """Test strict mode applies to patches and raw JSON"""
+        self.validator.strict()
+        
+        self.assertEqual(self.validator.validate_patch({"name": "Ann"}, {"admin": True, "other": None}).errors,
+                         ["Field 'admin': Unknown field"])
+        with patch.object(validator_module, "_JSON_INCREMENTAL_MIN_SIZE", 0):
+            document = '{"name": "Ann", "admin": {"deep": [1, 2]}, "x": 1}'
+            self.assertEqual(self.validator.validate_json(document).errors,
+                             ["Field 'admin': Unknown field", "Field 'x': Unknown field"])
+            self.assertEqual(len(self.validator.validate_json(document, fail_fast=True).errors), 1)
+    
+    def test_strip_unknown(self):
+        """Test parse() returns copies without unknown fields"""
+        self.address.strip_unknown()
+        self.validator.strip_unknown()
+        expected = {"name": "Ann", "addresses": [{"city": "Oslo"}]}
+        
+        self.assertTrue(self.validator.validate(self.data).is_valid)
+        self.assertEqual(self.validator.parse(self.data), expected)
+        self.assertEqual(self.validator.compile().parse(self.data), expected)
+        self.assertIn("admin", self.data)
+    
+    def test_nested_strip_only(self):
+        """Test only the stripping objects lose their unknown fields"""
+        self.address.strip_unknown()
+        
+        self.assertEqual(self.validator.parse(self.data),
+                         {"name": "Ann", "admin": True, "addresses": [{"city": "Oslo"}]})
+        self.assertEqual(self.address.strict().validate({"zip": 1}).errors,
+                         ["Field 'city': Value is required", "Field 'zip': Unknown field"])
+
+
+class TestFrozenValidators(unittest.TestCase):
+    """Tests for immutable, hashable validator trees"""
+    
+    def build(self):
+        return Schema.object({
+            "name": Schema.string().min_length(2).pattern(r'^[A-Z]'),
+            "tags": Schema.array(Schema.string()).max_length(3),
+            "kind": Schema.union(Schema.string(), Schema.number()),
+        }).strict()
+    
+    def test_reconfiguration_is_rejected(self):
+        """Test builder methods and schema changes fail on frozen trees"""
+        validator = self.build().freeze()
+        
+        self.assertTrue(validator.frozen)
+        self.assertTrue(validator.schema["tags"].item_validator.frozen)
+        with self.assertRaises(AttributeError):
+            validator.schema["name"].min_length(5)
+        with self.assertRaises(AttributeError):
+            validator.optional()
+        with self.assertRaises(TypeError):
+            validator.schema["extra"] = Schema.string()
+        with self.assertRaises(AttributeError):
+            validator.schema["kind"].validators.append(Schema.boolean())
+    
+    def test_hashing_and_equality(self):
+        """Test equal frozen trees are equal, hash alike and share compiled forms"""
+        first, second = self.build().freeze(), self.build().freeze()
+        
+        self.assertEqual(first, second)
+        self.assertEqual(len({first, second}), 1)
+        self.assertIs(first.compile(), second.compile())
+        self.assertNotEqual(first, Schema.object({"name": Schema.string()}).freeze())
+        self.assertNotEqual(self.build(), self.build())
+        self.assertEqual(Schema.boolean().freeze(), Schema.boolean().freeze())
+        
+        # Equal limits of different types render differently, so they must not share compiled forms
+        ints, floats = (Schema.object({"n": Schema.number().min(limit)}).freeze() for limit in (1, 1.0))
+        self.assertNotEqual(ints, floats)
+        self.assertEqual(floats.compile().validate({"n": 0}), floats.validate({"n": 0}))
+        self.assertEqual(ints.compile().validate({"n": 0}).errors, ["Field 'n': Number must be at least 1"])
+        self.assertNotEqual(Schema.array(Schema.string()).min_length(1).freeze(),
+                            Schema.array(Schema.string()).min_length(True).freeze())
+    
+    def test_custom_validators_compare_by_identity(self):
+        """Test custom subclasses without a signature never share compiled forms"""
+        class MultipleValidator(BaseValidator):
+            def __init__(self, n):
+                super().__init__()
+                self.n = n
+            
+            def _validate_value(self, value, max_errors=None):
+                if value % self.n:
+                    return ValidationResult(False, [f"Number must be a multiple of {self.n}"])
+                return ValidationResult(True, [])
+        
+        twos, threes = MultipleValidator(2).freeze(), MultipleValidator(3).freeze()
+        
+        self.assertNotEqual(twos, threes)
+        self.assertEqual(twos, twos)
+        self.assertEqual(len({twos, threes}), 2)
+        self.assertIsNot(twos.compile(), threes.compile())
+        self.assertTrue(threes.compile().validate(3).is_valid)
+        self.assertEqual(Schema.array(threes).freeze().compile().validate([3, 4]),
+                         Schema.array(threes).validate([3, 4]))
+    
+    def test_pickled_copies(self):
+        """Test frozen trees stay frozen and hashable after pickling"""
+        import pickle
+        validator = self.build().freeze()
+        hash(validator)
+        
+        copy = pickle.loads(pickle.dumps(validator))
+        
+        self.assertTrue(copy.frozen)
+        self.assertEqual(copy, validator)
+        self.assertEqual(hash(copy), hash(validator))
+    
+    def test_shared_across_threads(self):
+        """Test one frozen tree validates concurrently without copies"""
+        from concurrent.futures import ThreadPoolExecutor
+        validator = self.build().freeze()
+        values = [{"name": "Ann", "tags": [], "kind": i} if i % 2 else {"name": i} for i in range(200)]
+        expected = [validator.validate(value) for value in values]
+        
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(validator.validate, values))
+        
+        self.assertEqual(results, expected)
+
+
+class TestTableValidation(unittest.TestCase):
+    """Tests for columnar dict-of-lists validation"""
+    
+    def setUp(self):
+        self.validator = Schema.table({
+            "age": Schema.number().min(0),
+            "name": Schema.string().min_length(2),
+            "note": Schema.string().optional(),
+        })
+        self.table = {"age": [30, -1, 40, 5], "name": ["Ann", "Bob", "C", 7], "note": [None, "x", None, None]}
+    
+    def test_failures_by_row_and_column(self):
+        """Test cell failures have (row, column) paths in row-major order"""
+        self.assertIsInstance(self.validator, TableValidator)
+        result = self.validator.validate(self.table)
+        
+        self.assertEqual([issue.path for issue in result.issues], [(1, "age"), (2, "name"), (3, "name")])
+        self.assertEqual(result.errors[0], "Item at index 1: Field 'age': Number must be at least 0")
+        self.assertEqual(self.validator.validate(self.table, max_errors=2).issues[1].path, (2, "name"))
+    
+    def test_matches_row_wise_validation(self):
+        """Test the same issues are found as when validating row dicts"""
+        rows = [dict(zip(self.table, cells)) for cells in zip(*self.table.values())]
+        row_validator = Schema.array(Schema.object(self.validator.columns))
+        
+        self.assertEqual(self.validator.validate(self.table), row_validator.validate(rows))
+        self.assertTrue(self.validator.validate({"age": [], "name": []}).is_valid)
+    
+    def test_column_errors(self):
+        """Test missing, non-list and ragged columns"""
+        result = self.validator.validate({"age": [1, 2], "name": "Ann", "note": [None]})
+        
+        self.assertEqual(result.errors, [
+            "Field 'name': Expected list, got str",
+            "Field 'note': Column has 1 rows, expected 2",
+        ])
+        self.assertEqual(self.validator.validate({"name": ["Ann"]}).errors, ["Field 'age': Value is required"])
+        self.assertEqual(self.validator.validate([]).errors, ["Expected dict, got list"])
+    
+    @unittest.skipUnless(validator_module.np is not None, "NumPy is not installed")
+    def test_numpy_columns(self):
+        """Test NumPy columns are validated directly"""
+        import numpy as np
+        table = {"age": np.array([1.0, -2.0]), "name": np.array(["Ann", "B"])}
+        
+        self.assertEqual([issue.path for issue in self.validator.validate(table).issues],
+                         [(1, "age"), (1, "name")])
+        
+        result = self.validator.validate({"age": np.array([1, -5]), "name": ["Ann", "Bob"]})
+        self.assertEqual(result.errors, ["Item at index 1: Field 'age': Number must be at least 0"])
+
+
+class TestRecursiveSchemas(unittest.TestCase):
+    """Tests for Schema.lazy() references and nesting limits"""
+    
+    def setUp(self):
+        self.comment = Schema.object({
+            "text": Schema.string().min_length(1),
+            "replies": Schema.array(Schema.lazy(lambda: self.comment)).optional(),
+        })
+    
+    def thread(self, depth, text="ok"):
+        """Builds a comment with one chain of replies `depth` levels deep"""
+        comment = {"text": text}
+        for _ in range(depth):
+            comment = {"text": "ok", "replies": [comment]}
+        return comment
+    
+    def test_recursive_validation(self):
+        """Test nested values are validated with full paths"""
+        self.assertIsInstance(Schema.lazy(lambda: self.comment), LazyValidator)
+        self.assertTrue(self.comment.validate(self.thread(3)).is_valid)
+        
+        result = self.comment.validate(self.thread(2, text=""))
+        self.assertEqual(result.issues[0].path, ("replies", 0, "replies", 0, "text"))
+    
+    def test_deep_values_do_not_hit_the_recursion_limit(self):
+        """Test nesting far beyond Python's recursion limit"""
+        self.assertTrue(self.comment.validate(self.thread(900)).is_valid)
+        
+        result = self.comment.validate(self.thread(900, text=""))
+        self.assertEqual(len(result.issues[0].path), 900 * 2 + 1)
+        self.assertEqual(self.comment.validate(self.thread(900, text="")), result)
+    
+    def test_deep_parse_and_avalidate(self):
+        """Test stripping and async checks also handle nesting beyond the recursion limit"""
+        self.comment.strip_unknown()
+        value = self.thread(900)
+        node = value
+        while "replies" in node:
+            node["x"] = 1
+            node = node["replies"][0]
+        
+        # Comparing such deep values with == would itself exceed the recursion limit
+        node, depth = self.comment.parse(value), 0
+        while "replies" in node:
+            self.assertEqual(set(node), {"text", "replies"})
+            node, depth = node["replies"][0], depth + 1
+        self.assertEqual((node, depth), ({"text": "ok"}, 900))
+        self.assertIn("x", value)
+        with patch.object(LazyValidator, "RECURSIVE_LEVELS", 0):
+            self.assertEqual(self.comment.parse({"text": "a", "x": 1, "replies": [{"text": "b", "y": 2}]}),
+                             {"text": "a", "replies": [{"text": "b"}]})
+        
+        async def allowed(text):
+            return text != "spam"
+        
+        node = Schema.object({
+            "text": Schema.string().check_async(allowed),
+            "replies": Schema.array(Schema.lazy(lambda: node)).optional(),
+        })
+        self.assertTrue(asyncio.run(node.avalidate(self.thread(900))).is_valid)
+        result = asyncio.run(node.avalidate(self.thread(900, text="spam")))
+        self.assertEqual(len(result.issues[0].path), 900 * 2 + 1)
+    
+    def test_matches_recursive_validation(self):
+        """Test the explicit stack reports the same issues in the same order"""
+        value = {"text": "", "extra": 1, "replies": [{"text": 5, "replies": "x"}, {"replies": [{"text": "ok"}]}]}
+        self.comment.strict()
+        for levels in (0, 32):
+            with self.subTest(levels=levels), patch.object(LazyValidator, "RECURSIVE_LEVELS", levels):
+                self.assertEqual(self.comment.validate(value).errors, [
+                    "Field 'text': String must be at least 1 characters long",
+                    "Field 'replies': Item at index 0: Field 'text': Expected string, got int",
+                    "Field 'replies': Item at index 0: Field 'replies': Expected list, got str",
+                    "Field 'replies': Item at index 1: Field 'text': Value is required",
+                    "Field 'extra': Unknown field",
+                ])
+                self.assertEqual(len(self.comment.validate(value, max_errors=2).issues), 2)
+    
+    def test_max_depth(self):
+        """Test values nested deeper than max_depth get a 'depth' issue"""
+        node = Schema.object({"next": Schema.lazy(lambda: node).max_depth(3).optional()})
+        value = {"next": {"next": {"next": {"next": {}}}}}
+        
+        result = node.validate(value)
+        self.assertEqual(result.issues[0].code, "depth")
+        self.assertEqual(result.issues[0].path, ("next", "next", "next", "next"))
+        self.assertEqual(result.errors[0], "Field 'next': Field 'next': Field 'next': Field 'next': "
+                                           "Value is nested more than 3 levels deep")
+        self.assertTrue(node.validate(value["next"]).is_valid)
+        
+        with self.assertRaises(ValueError):
+            Schema.lazy(lambda: node).max_depth(0)
+    
+    def test_discriminated_recursion(self):
+        """Test trees built from discriminated unions nest without limit issues"""
+        tree = Schema.discriminated("type", {
+            "leaf": Schema.object({"value": Schema.number()}),
+            "node": Schema.object({"children": Schema.array(Schema.lazy(lambda: tree))}),
+        })
+        value = {"type": "leaf", "value": "x"}
+        for _ in range(500):
+            value = {"type": "node", "children": [value]}
+        
+        result = tree.validate(value)
+        self.assertEqual(result.issues[0].path[-1], "value")
+        self.assertEqual(result.issues[0].code, "type")
+    
+    def test_other_features(self):
+        """Test compile, parse, freeze, save and async checks with a recursive schema"""
+        value = {"text": "ok", "extra": 1, "replies": [{"text": "", "extra": 2}]}
+        self.assertEqual(self.comment.compile().validate(value), self.comment.validate(value))
+        
+        self.comment.strip_unknown()
+        self.assertEqual(self.comment.parse(self.thread(2)), self.thread(2))
+        self.assertEqual(self.comment.parse({"text": "a", "x": 1, "replies": [{"text": "b", "y": 2}]}),
+                         {"text": "a", "replies": [{"text": "b"}]})
+        
+        self.comment.freeze()
+        self.assertEqual(hash(self.comment), hash(self.comment))
+        buffer = io.BytesIO()
+        self.comment.save(buffer)
+        buffer.seek(0)
+        self.assertEqual(Schema.load(buffer).validate(value).errors, self.comment.validate(value).errors)
+        
+        async def allowed(text):
+            return text != "spam"
+        
+        node = Schema.object({
+            "text": Schema.string().check_async(allowed),
+            "replies": Schema.array(Schema.lazy(lambda: node)).optional(),
+        })
+        result = asyncio.run(node.avalidate({"text": "ok", "replies": [{"text": "spam"}]}))
+        self.assertEqual(result.issues[0].path, ("replies", 0, "text"))
+    
+    def test_factory_must_return_a_validator(self):
+        """Test a factory returning something else is rejected on first use"""
+        with self.assertRaises(TypeError):
+            Schema.lazy(lambda: {"a": Schema.string()}).validate({})
+
+
+class TestCompiledValidator(unittest.TestCase):
+    """Tests for validators compiled into generated functions"""
+    
+    def setUp(self):
+        address_schema = {
+            "street": Schema.string().min_length(1),
+            "postal_code": Schema.string().pattern(r'^\d{5}$').with_message("Postal code must be 5 digits")
+        }
+        self.validator = Schema.object({
+            "id": Schema.string().with_message("ID must be a string"),
+            "name": Schema.string().min_length(2).max_length(50),
+            "age": Schema.number().min(0).max(150).optional(),
+            "active": Schema.boolean(),
+            "tags": Schema.array(Schema.string()).min_length(1).max_length(3),
+            "address": Schema.object(address_schema).optional(),
+            "items": Schema.array(Schema.object({"id": Schema.number()}))
+        })
+    
+    def test_results_match_validate(self):
+        """Test compiled results are identical to validate() results"""
+        compiled = self.validator.compile()
+        samples = [
+            {
+                "id": "1", "name": "John", "age": 30, "active": True, "tags": ["a"],
+                "address": {"street": "Main", "postal_code": "12345"},
+                "items": [{"id": 1}, {"id": 2.5}]
+            },
+            {
+                "id": 1, "name": "J", "age": -5, "active": "yes", "tags": [1, None, "a", "b"],
+                "address": {"street": "", "postal_code": 123},
+                "items": [{"id": "1"}, None, 3]
+            },
+            {},
+            [],
+            None,
+        ]
+        for data in samples:
+            with self.subTest(data=data):
+                self.assertEqual(compiled.validate(data), self.validator.validate(data))
+    
+    def test_only_set_constraints_are_inlined(self):
+        """Test the generated source omits checks that are not configured"""
+        compiled = Schema.string().min_length(2).compile()
+        
+        self.assertIn("len(value)", compiled.source)
+        self.assertNotIn("match", compiled.source)
+    
+    def test_compile_is_a_snapshot(self):
+        """Test reconfiguring a validator does not change its compiled form"""
+        validator = Schema.number()
+        compiled = validator.compile()
+        validator.min(10)
+        
+        self.assertTrue(compiled.validate(5).is_valid)
+        self.assertFalse(validator.compile().validate(5).is_valid)
+    
+    def test_custom_validator_falls_back(self):
+        """Test validators without inlined checks are delegated to"""
+        class EvenValidator(BaseValidator):
+            def _validate_value(self, value, max_errors=None):
+                if value % 2:
+                    return ValidationResult(False, ["Number must be even"])
+                return ValidationResult(True, [])
+        
+        validator = Schema.array(EvenValidator())
+        compiled = Schema.compile(validator)
+        
+        self.assertEqual(compiled.validate([2, 3]).errors, ["Item at index 1: Number must be even"])
+    
+    def test_subclass_checks_are_not_inlined(self):
+        """Test subclasses overriding _validate_value are delegated to instead of inlined"""
+        class IntegerValidator(NumberValidator):
+            def _validate_value(self, value, max_errors=None):
+                if isinstance(value, float) and not value.is_integer():
+                    return ValidationResult(False, ["Number must be an integer"])
+                return super()._validate_value(value, max_errors)
+        
+        validator = Schema.object({"n": IntegerValidator().min(0), "m": IntegerValidator().optional()})
+        
+        for data in ({"n": 2.5}, {"n": -1, "m": 1.5}, {"n": 3}, {}):
+            with self.subTest(data=data):
+                self.assertEqual(validator.compile().validate(data), validator.validate(data))
+    
+    def test_deep_nesting(self):
+        """Test schemas nested beyond the inline depth still compile correctly"""
+        validator = Schema.number().min(0)
+        data = -1
+        for _ in range(40):
+            validator = Schema.array(validator)
+            data = [data]
+        
+        self.assertEqual(validator.compile().validate(data), validator.validate(data))
+    
+    def test_parse(self):
+        """Test parse on the compiled validator"""
+        compiled = Schema.string().compile()
+        
+        self.assertEqual(compiled("hello").is_valid, True)
+        self.assertEqual(compiled.parse("hello"), "hello")
+        with self.assertRaises(ValidationError):
+            compiled.parse(123)
+
+
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Validates CSV files against an object schema
+Reads the file through mmap in fixed-size chunks, coerces number and boolean
+columns, validates the chunks on worker processes and streams an error report
+"""
+
+import argparse
+import csv
+import importlib
+import io
+import json
+import mmap
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from validator import (
+    Schema, BaseValidator, NumberValidator, BooleanValidator, ObjectValidator, ValidationResult
+)
+
+
+DEFAULT_CHUNK_SIZE = 16 << 20
+
+_TRUE = frozenset({"true", "t", "yes", "y", "1"})
+_FALSE = frozenset({"false", "f", "no", "n", "0"})
+
+
+def coerce_number(cell: str) -> Any:
+    """Converts a cell to int or float; empty cells become None, bad ones stay strings"""
+    if not cell:
+        return None
+    try:
+        return int(cell)
+    except ValueError:
+        pass
+    try:
+        return float(cell)
+    except ValueError:
+        return cell
+
+
+def coerce_boolean(cell: str) -> Any:
+    """Converts true/false, yes/no and 1/0 cells to bool; empty cells become None"""
+    if not cell:
+        return None
+    lowered = cell.strip().lower()
+    if lowered in _TRUE:
+        return True
+    if lowered in _FALSE:
+        return False
+    return cell
+
+
+def column_coercions(validator: ObjectValidator, header: Sequence[str]) -> List[Optional[Callable[[str], Any]]]:
+    """Returns the coercion for each column: by validator type, or None to keep the text"""
+    coercions = []
+    for name in header:
+        field = validator.schema.get(name)
+        if isinstance(field, NumberValidator):
+            coercions.append(coerce_number)
+        elif isinstance(field, BooleanValidator):
+            coercions.append(coerce_boolean)
+        else:
+            coercions.append(None)
+    return coercions
+
+
+def _record_end(view: Any, start: int, limit: int) -> int:
+    """
+    Returns the index after the first record boundary at or after `start`.
+
+    A newline only ends a record outside quotes, so quotes are counted from
+    the `limit` (a known record boundary) up to each candidate newline.
+    """
+    quotes = 0
+    position = limit
+    while True:
+        newline = view.find(b"\n", max(start, position))
+        if newline == -1:
+            return len(view)
+        quotes += view[position:newline].count(b'"')
+        position = newline
+        if quotes % 2 == 0:
+            return newline + 1
+        start = newline + 1
+
+
+def chunk_ranges(view: Any, start: int, chunk_size: int) -> Iterator[Tuple[int, int]]:
+    """Splits the bytes from `start` into ranges of about chunk_size that end on record boundaries"""
+    size = len(view)
+    while start < size:
+        end = _record_end(view, min(start + chunk_size, size), start) if start + chunk_size < size else size
+        yield start, end
+        start = end
+
+
+def read_header(view: Any, encoding: str, delimiter: str) -> Tuple[List[str], int]:
+    """Parses the header record; returns the column names and the offset of the first data row"""
+    end = _record_end(view, 0, 0)
+    text = view[:end].decode(encoding)
+    if text.startswith("\ufeff"):
+        text = text[1:]
+    header = next(csv.reader(io.StringIO(text, newline=""), delimiter=delimiter), None)
+    if not header:
+        raise ValueError("The CSV file has no header row")
+    return header, end
+
+
+def _open_state(validator: ObjectValidator, path: str, header: List[str], encoding: str,
+                delimiter: str) -> Dict[str, Any]:
+    """Compiles the validator and maps the file for validating byte ranges"""
+    file = open(path, "rb")
+    return {
+        "validate": validator.compile().validate,
+        "view": mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ),
+        "file": file,
+        "header": header,
+        "coercions": column_coercions(validator, header),
+        "encoding": encoding,
+        "delimiter": delimiter,
+    }
+
+
+def _close_state(state: Dict[str, Any]):
+    """Releases the file mapping opened by _open_state()"""
+    state["view"].close()
+    state["file"].close()
+
+
+# State of a worker process, set once by _init_worker()
+_worker_state: Dict[str, Any] = {}
+
+
+def _init_worker(*args: Any):
+    """Compiles the validator and maps the file once per worker process"""
+    _worker_state.update(_open_state(*args))
+
+
+def _validate_chunk(task: Tuple[int, int, bool]) -> Tuple[int, List[Tuple[int, ValidationResult]]]:
+    """Validates one byte range in a worker process"""
+    return _validate_range(_worker_state, task)
+
+
+def _validate_range(state: Dict[str, Any], task: Tuple[int, int, bool]
+                    ) -> Tuple[int, List[Tuple[int, ValidationResult]]]:
+    """Validates the records in one byte range; returns the row count and the failures"""
+    start, end, fail_fast = task
+    validate, header, coercions = state["validate"], state["header"], state["coercions"]
+    text = state["view"][start:end].decode(state["encoding"])
+    reader = csv.reader(io.StringIO(text, newline=""), delimiter=state["delimiter"])
+
+    failures = []
+    rows = 0
+    for rows, cells in enumerate(reader, 1):
+        record = {}
+        for name, coerce, cell in zip(header, coercions, cells):
+            record[name] = coerce(cell) if coerce is not None else cell
+        # Cells beyond the header are kept under their position so strict() schemas report them
+        for position in range(len(header), len(cells)):
+            record[str(position)] = cells[position]
+        result = validate(record, fail_fast)
+        if not result.is_valid:
+            failures.append((rows, result))
+    return rows, failures
+
+
+class CsvValidation:
+    """
+    Iterator over the invalid rows of a CSV file, as (row, result) pairs.
+
+    `rows` is the number of rows checked so far; once the iterator is
+    exhausted it is the number of data rows in the file.
+    """
+
+    def __init__(self, path: str, validator: ObjectValidator, workers: int, chunk_size: int,
+                 fail_fast: bool, encoding: str, delimiter: str):
+        self.rows = 0
+        self._iterator = self._run(path, validator, workers, chunk_size, fail_fast, encoding, delimiter)
+
+    def __iter__(self) -> "CsvValidation":
+        return self
+
+    def __next__(self) -> Tuple[int, ValidationResult]:
+        return next(self._iterator)
+
+    def close(self):
+        """Stops the validation and releases the file and worker processes"""
+        self._iterator.close()
+
+    def _run(self, path: str, validator: ObjectValidator, workers: int, chunk_size: int,
+             fail_fast: bool, encoding: str, delimiter: str) -> Iterator[Tuple[int, ValidationResult]]:
+        """Maps the file, splits it into chunks and yields the failures in file order"""
+        with open(path, "rb") as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                raise ValueError("The CSV file has no header row")
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                header, data_start = read_header(view, encoding, delimiter)
+                tasks = ((start, end, fail_fast) for start, end in chunk_ranges(view, data_start, chunk_size))
+                args = (validator, path, header, encoding, delimiter)
+
+                if workers == 1:
+                    state = _open_state(*args)
+                    try:
+                        yield from self._numbered(_validate_range(state, task) for task in tasks)
+                    finally:
+                        _close_state(state)
+                    return
+
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=args) as executor:
+                    # Keep only a few chunks in flight so results stream in order with bounded memory
+                    pending = deque(executor.submit(_validate_chunk, task) for task in islice(tasks, workers * 2))
+
+                    def outcomes():
+                        while pending:
+                            outcome = pending.popleft().result()
+                            for task in islice(tasks, 1):
+                                pending.append(executor.submit(_validate_chunk, task))
+                            yield outcome
+
+                    try:
+                        yield from self._numbered(outcomes())
+                    finally:
+                        for future in pending:
+                            future.cancel()
+
+    def _numbered(self, outcomes: Iterator[Tuple[int, List[Tuple[int, ValidationResult]]]]
+                  ) -> Iterator[Tuple[int, ValidationResult]]:
+        """Turns per-chunk row numbers into file-wide ones"""
+        for rows, failures in outcomes:
+            for row, result in failures:
+                yield self.rows + row, result
+            self.rows += rows
+
+
+def validate_csv(path: str, validator: ObjectValidator, workers: Optional[int] = None,
+                 chunk_size: int = DEFAULT_CHUNK_SIZE, fail_fast: bool = False, encoding: str = "utf-8",
+                 delimiter: str = ",") -> CsvValidation:
+    """
+    Validates every record of a CSV file, yielding (row, result) for invalid rows.
+
+    Rows are numbered from 1, starting after the header. The file is memory
+    mapped and split into chunks of about `chunk_size` bytes that end on
+    record boundaries; with workers > 1 the chunks are validated in worker
+    processes that map the file themselves, with only a few chunks in flight.
+    Failures are yielded in file order as soon as their chunk is done. Empty
+    number and boolean cells are passed to the validator as None. The
+    encoding must be ASCII-compatible, such as UTF-8 or Latin-1.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+    return CsvValidation(path, validator, workers or os.cpu_count() or 1, chunk_size,
+                         fail_fast, encoding, delimiter)
+
+
+def load_schema(spec: str) -> BaseValidator:
+    """Loads a schema from a file written by save(), or from "module:attribute" """
+    if os.path.exists(spec):
+        validator = Schema.load(spec)
+    else:
+        module_name, _, attribute = spec.partition(":")
+        if not attribute:
+            raise ValueError(f"Schema {spec!r} is neither a saved schema file nor module:attribute")
+        validator = getattr(importlib.import_module(module_name), attribute)
+    if not isinstance(validator, ObjectValidator):
+        raise ValueError(f"Schema {spec!r} is not an object validator")
+    return validator
+
+
+def main() -> int:
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Validate a CSV file against an object schema")
+    parser.add_argument('file', help='CSV file with a header row')
+    parser.add_argument('--schema', '-s', required=True,
+                        help='Schema file written by save(), or module:attribute of an object validator')
+    parser.add_argument('--workers', '-w', type=int, help='Worker processes (default: CPU count)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help='Approximate bytes per chunk (default: 16 MiB)')
+    parser.add_argument('--max-rows', type=int, help='Stop after reporting this many invalid rows')
+    parser.add_argument('--fail-fast', action='store_true', help='Report only the first error of each row')
+    parser.add_argument('--format', choices=['text', 'jsonl'], default='text', help='Error report format')
+    parser.add_argument('--encoding', default='utf-8', help='File encoding (default: utf-8)')
+    parser.add_argument('--delimiter', default=',', help='Field delimiter (default: ,)')
+    args = parser.parse_args()
+
+    try:
+        validator = load_schema(args.schema)
+        invalid = 0
+        failures = validate_csv(args.file, validator, args.workers, args.chunk_size,
+                                args.fail_fast, args.encoding, args.delimiter)
+        for row, result in failures:
+            invalid += 1
+            if args.format == 'jsonl':
+                print(json.dumps({"row": row, "issues": [issue.to_dict() for issue in result.issues]}))
+            else:
+                for error in result.errors:
+                    print(f"Row {row}: {error}")
+            if args.max_rows is not None and invalid >= args.max_rows:
+                failures.close()
+                print(f"Stopped after {invalid} invalid rows", file=sys.stderr)
+                return 1
+    except (OSError, ValueError, ImportError, AttributeError) as error:
+        print(f"Error: {error}", file=sys.stderr)
+        return 2
+
+    print(f"Checked {failures.rows} rows, {invalid} invalid", file=sys.stderr)
+    return 1 if invalid else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
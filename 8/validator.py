@@ -3,36 +3,769 @@ Simple but robust validation library for Python
 Provides type-safe validator functions for primitive and complex data types
 """
 
+import array
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import marshal
+import math
+import os
+import pickle
 import re
-from typing import Any, Dict, List, Optional, Union, Callable
-from dataclasses import dataclass
+import sys
+import threading
+import time
+import zlib
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+from typing import Any, Awaitable, Dict, IO, Iterable, Iterator, List, Optional, Sequence, Tuple, Union, Callable
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; batch checks fall back to plain loops
+    np = None
+
+# Integers beyond this lose precision as float64, so vectorized comparisons
+# are only used while both the values and the limits stay inside it
+_FLOAT_EXACT_LIMIT = 2 ** 53
+
+# Buffer-protocol sequences that ArrayValidator checks in place when its items are numbers
+_NUMERIC_BUFFER_TYPES = (array.array, memoryview) + ((np.ndarray,) if np is not None else ())
+
+
+# Message templates for the built-in error codes, rendered only on demand
+_MESSAGES: Dict[str, str] = {
+    "required": "Value is required",
+    "type": "Expected {expected}, got {actual}",
+    "min_length": "String must be at least {limit} characters long",
+    "max_length": "String must be at most {limit} characters long",
+    "pattern": "String does not match required pattern",
+    "min": "Number must be at least {limit}",
+    "max": "Number must be at most {limit}",
+    "min_items": "Array must have at least {limit} items",
+    "max_items": "Array must have at most {limit} items",
+    "json": "Invalid JSON: {error}",
+    "check": "Value failed check '{name}'",
+    "union": "Value does not match any of the allowed schemas",
+    "tag": "Unknown tag {tag!r}, expected one of {allowed}",
+    "unknown": "Unknown field",
+    "rows": "Column has {actual} rows, expected {expected}",
+    "depth": "Value is nested more than {limit} levels deep",
+}
+
+
+def _path_chain(path: Sequence[Union[str, int]]) -> Optional[tuple]:
+    """Converts a path tuple into the linked (key, parent) form used by issues"""
+    chain = None
+    for key in reversed(path):
+        chain = (key, chain)
+    return chain
+
+
+class ValidationIssue:
+    """
+    A single validation failure: where it happened, what failed and why.
+    
+    The path holds field names (str) and array indices (int) from the root
+    value down to the failing one. Message text is only rendered when asked
+    for, and prefixing a path while unwinding nested validators is O(1).
+    """
+    __slots__ = ("_code", "_params", "_path", "_message")
+    
+    def __init__(self, code: str, params: Optional[Dict[str, Any]] = None,
+                 path: Sequence[Union[str, int]] = (), message: Optional[str] = None):
+        self._code = code
+        self._params = params
+        self._path = _path_chain(path)
+        self._message = message
+    
+    @property
+    def code(self) -> str:
+        """Machine-readable error code, e.g. 'required' or 'min_length'"""
+        return self._code
+    
+    @property
+    def params(self) -> Dict[str, Any]:
+        """Parameters of the failed constraint, e.g. {'limit': 5}"""
+        return dict(self._params) if self._params else {}
+    
+    @property
+    def path(self) -> tuple:
+        """Field names and array indices leading to the failing value"""
+        keys = []
+        node = self._path
+        while node is not None:
+            key, node = node
+            keys.append(key)
+        return tuple(keys)
+    
+    @property
+    def message(self) -> str:
+        """The error message without the path prefix"""
+        if self._message is not None:
+            return self._message
+        template = _MESSAGES.get(self._code, self._code)
+        return template.format(**self._params) if self._params else template
+    
+    @property
+    def json_path(self) -> str:
+        """The path as a JSONPath expression, e.g. $.tags[3]"""
+        parts = ["$"]
+        for key in self.path:
+            if isinstance(key, int):
+                parts.append(f"[{key}]")
+            elif key.isidentifier():
+                parts.append(f".{key}")
+            else:
+                parts.append(f"[{key!r}]")
+        return "".join(parts)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Returns a JSON-serializable representation of the issue"""
+        return {"path": list(self.path), "code": self._code,
+                "params": self.params, "message": self.message}
+    
+    def _prefixed(self, key: Union[str, int]) -> "ValidationIssue":
+        """Returns a copy of the issue nested one level deeper under `key`"""
+        issue = ValidationIssue.__new__(ValidationIssue)
+        issue._code = self._code
+        issue._params = self._params
+        issue._path = (key, self._path)
+        issue._message = self._message
+        return issue
+    
+    def _with_prefix(self, keys: tuple) -> "ValidationIssue":
+        """Returns a copy of the issue nested under several keys"""
+        issue = self
+        for key in reversed(keys):
+            issue = issue._prefixed(key)
+        return issue
+    
+    def __str__(self) -> str:
+        """Renders the issue in the classic "Field 'x': Item at index 0: ..." form"""
+        parts = []
+        node = self._path
+        while node is not None:
+            key, node = node
+            parts.append(f"Item at index {key}: " if isinstance(key, int) else f"Field '{key}': ")
+        parts.append(self.message)
+        return "".join(parts)
+    
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, ValidationIssue):
+            return NotImplemented
+        # Linked paths are compared flattened; nested tuples would recurse once per key
+        return (self._code == other._code and (self._path is other._path or self.path == other.path)
+                and self._message == other._message
+                and (self._params or None) == (other._params or None))
+    
+    def __hash__(self) -> int:
+        return hash((self._code, self.path, self._message))
+    
+    def __repr__(self) -> str:
+        return f"ValidationIssue(code={self._code!r}, path={self.path!r}, message={self.message!r})"
+    
+    def __reduce__(self):
+        return (ValidationIssue, (self._code, self._params, self.path, self._message))
+
+
+def _make_issue(code: str, params: Optional[Dict[str, Any]], chain: Optional[tuple],
+                message: Optional[str]) -> ValidationIssue:
+    """Builds an issue from an already linked path (used by compiled validators)"""
+    issue = ValidationIssue.__new__(ValidationIssue)
+    issue._code = code
+    issue._params = params
+    issue._path = chain
+    issue._message = message
+    return issue
+
+
+def _as_issue(error: Union[str, ValidationIssue]) -> ValidationIssue:
+    """Wraps plain error strings, e.g. from custom validators, as issues"""
+    if isinstance(error, ValidationIssue):
+        return error
+    return ValidationIssue("custom", message=error)
 
 
-@dataclass
 class ValidationResult:
-    """Represents the result of a validation operation"""
-    is_valid: bool
-    errors: List[str]
+    """
+    Represents the result of a validation operation.
+    
+    Results are immutable and hold structured ValidationIssue records; the
+    classic error strings are rendered from them only when `errors` is read.
+    Successful validations share a single instance (ValidationResult.success()).
+    """
+    __slots__ = ("is_valid", "_issues")
+    
+    def __init__(self, is_valid: bool, errors: Sequence[Union[str, ValidationIssue]] = ()):
+        object.__setattr__(self, "is_valid", is_valid)
+        object.__setattr__(self, "_issues", tuple(_as_issue(error) for error in errors))
+    
+    @staticmethod
+    def success() -> "ValidationResult":
+        """Returns the shared result for a successful validation"""
+        return _VALID
+    
+    @staticmethod
+    def _failure(issues: Sequence[ValidationIssue]) -> "ValidationResult":
+        """Builds a failed result from issues without re-checking them"""
+        result = ValidationResult.__new__(ValidationResult)
+        object.__setattr__(result, "is_valid", False)
+        object.__setattr__(result, "_issues", tuple(issues))
+        return result
+    
+    @property
+    def issues(self) -> tuple:
+        """The structured ValidationIssue records"""
+        return self._issues
+    
+    @property
+    def errors(self) -> List[str]:
+        """List of error messages, rendered from the issues on every access"""
+        return [str(issue) for issue in self._issues]
     
     def __bool__(self) -> bool:
         """Allow ValidationResult to be used in boolean context"""
         return self.is_valid
+    
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("ValidationResult is immutable")
+    
+    def __delattr__(self, name: str):
+        raise AttributeError("ValidationResult is immutable")
+    
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, ValidationResult):
+            return NotImplemented
+        return self.is_valid == other.is_valid and self._issues == other._issues
+    
+    def __hash__(self) -> int:
+        return hash((self.is_valid, self._issues))
+    
+    def __repr__(self) -> str:
+        return f"ValidationResult(is_valid={self.is_valid}, errors={self.errors})"
+    
+    def __reduce__(self):
+        return (ValidationResult, (self.is_valid, self._issues))
+
+
+_VALID = ValidationResult(True)
+
+
+def _limit_reached(errors: Optional[Sequence[ValidationIssue]], max_errors: Optional[int]) -> bool:
+    """Checks whether the collected errors have used up the error budget"""
+    return max_errors is not None and errors is not None and len(errors) >= max_errors
+
+
+class BatchResult:
+    """
+    Outcome of validate_many(): a compact failure bitmap over the values.
+    
+    Bit i of `bitmap` (byte i // 8, bit i % 8) is set when values[i] failed.
+    Error details are only computed for a value when details() asks for them.
+    """
+    __slots__ = ("bitmap", "invalid_count", "_validator", "_values")
+    
+    def __init__(self, validator: "BaseValidator", values: Sequence[Any],
+                 bitmap: bytearray, invalid_count: int):
+        self.bitmap = bitmap
+        self.invalid_count = invalid_count
+        self._validator = validator
+        self._values = values
+    
+    @property
+    def is_valid(self) -> bool:
+        """True when every value passed"""
+        return self.invalid_count == 0
+    
+    def __bool__(self) -> bool:
+        """Allow BatchResult to be used in boolean context"""
+        return self.invalid_count == 0
+    
+    def __len__(self) -> int:
+        return len(self._values)
+    
+    def is_invalid(self, index: int) -> bool:
+        """Checks whether the value at `index` failed validation"""
+        return bool(self.bitmap[index >> 3] >> (index & 7) & 1)
+    
+    def invalid_indices(self) -> List[int]:
+        """Returns the indices of all failed values in ascending order"""
+        indices = []
+        for byte_index, byte in enumerate(self.bitmap):
+            if byte:
+                base = byte_index << 3
+                indices.extend(base + bit for bit in range(8) if byte >> bit & 1)
+        return indices
+    
+    def details(self, index: int) -> ValidationResult:
+        """Fully validates the value at `index` and returns its result"""
+        return self._validator.validate(_python_scalar(self._values[index]))
+    
+    def issues(self) -> Iterator[ValidationIssue]:
+        """Yields the issues of every failed value, with its index as the path root"""
+        for index in self.invalid_indices():
+            for issue in self.details(index)._issues:
+                yield issue._prefixed(index)
+
+
+def _python_scalar(value: Any) -> Any:
+    """Converts a NumPy scalar read from an array into the Python value validate() expects"""
+    if np is not None and isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _python_items(values: Sequence[Any]) -> Sequence[Any]:
+    """Returns the items of a NumPy array as Python values; other sequences unchanged"""
+    if np is not None and isinstance(values, np.ndarray):
+        return values.tolist()
+    return values
+
+
+def _typed(*limits: Any) -> tuple:
+    """Pairs limits with their types for signatures: 1 and 1.0 are equal but render differently"""
+    return tuple((type(limit), limit) for limit in limits)
+
+
+def _accepts_budget(hook: Callable[..., ValidationResult]) -> bool:
+    """Checks whether a _validate_value override takes the max_errors argument"""
+    try:
+        parameters = list(inspect.signature(hook).parameters.values())
+    except (TypeError, ValueError):
+        return True
+    positional = [p for p in parameters if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)]
+    return len(positional) >= 3 or any(p.kind == p.VAR_POSITIONAL for p in parameters)
+
+
+def _bitmap_from_indices(count: int, indices: Sequence[int]) -> bytearray:
+    """Packs failed indices into a little-endian bitmap"""
+    bitmap = bytearray((count + 7) >> 3)
+    for index in indices:
+        bitmap[index >> 3] |= 1 << (index & 7)
+    return bitmap
+
+
+def _batch_from_mask(validator: "BaseValidator", values: Sequence[Any], mask: Any) -> BatchResult:
+    """Builds a BatchResult from a NumPy boolean failure mask"""
+    bitmap = bytearray(np.packbits(mask, bitorder="little").tobytes())
+    return BatchResult(validator, values, bitmap, int(np.count_nonzero(mask)))
+
+
+def _numeric_array(values: Sequence[Any]) -> Any:
+    """Returns values as a NumPy numeric array, or None when that is not exact"""
+    if np is None:
+        return None
+    try:
+        array = np.asarray(values)
+    except (ValueError, TypeError):
+        return None
+    if array.ndim != 1 or array.dtype.kind not in "biuf":
+        return None
+    if array.dtype.kind in "iuf" and array.size and np.abs(array).max() >= _FLOAT_EXACT_LIMIT:
+        return None
+    return array
+
+
+def _string_lengths(values: Sequence[Any]) -> Any:
+    """Returns the lengths of an all-string batch as a NumPy array, or None"""
+    if isinstance(values, np.ndarray):
+        return np.char.str_len(values) if values.ndim == 1 and values.dtype.kind == "U" else None
+    if set(map(type, values)) != {str}:
+        return None
+    return np.fromiter(map(len, values), dtype=np.intp, count=len(values))
+
+
+def _compare_exact(numbers: Any, limit: Union[int, float], below: bool) -> Any:
+    """Returns a mask of numbers < limit (below) or > limit, without rounding errors"""
+    if numbers.dtype.kind in "iu" and math.isfinite(limit):
+        # x < 2.5 is x < 3 and x > 2.5 is x > 2 for integers, so compare with an integer bound
+        bound = math.ceil(limit) if below else math.floor(limit)
+        info = np.iinfo(numbers.dtype)
+        if bound > info.max:
+            return np.full(len(numbers), below)
+        if bound < info.min:
+            return np.full(len(numbers), not below)
+        limit = numbers.dtype.type(bound)
+    elif isinstance(limit, int) and abs(limit) >= _FLOAT_EXACT_LIMIT:
+        # Python compares floats with large ints exactly, float64 would round the int
+        values = numbers.tolist()
+        return np.fromiter((x < limit if below else x > limit for x in values), dtype=bool, count=len(values))
+    else:
+        limit = np.float64(limit)
+    return numbers < limit if below else numbers > limit
+
+
+def _iter_lines(file: IO, chunk_size: int) -> Iterator[Union[bytes, str]]:
+    """Splits a binary or text file into lines while reading it in fixed-size chunks"""
+    pending: List[Union[bytes, str]] = []
+    newline = None
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            break
+        if newline is None:
+            newline = "\n" if isinstance(chunk, str) else b"\n"
+        parts = chunk.split(newline)
+        pending.append(parts[0])
+        if len(parts) == 1:
+            continue
+        yield newline[:0].join(pending)
+        yield from parts[1:-1]
+        pending = [parts[-1]]
+    if newline is not None:
+        yield newline[:0].join(pending)
+
+
+# Below this many characters json.loads plus validate() is faster than
+# walking the document, and the decoded value is small anyway
+_JSON_INCREMENTAL_MIN_SIZE = 1 << 16
+
+_JSON_WHITESPACE = re.compile(r'[ \t\n\r]*')
+_JSON_WHITESPACE_CHARS = frozenset(" \t\n\r")
+
+# Strings (so brackets inside them are ignored) and the brackets themselves
+_JSON_SKIP_TOKEN = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]{}]')
+
+
+class _JsonScanner:
+    """
+    Position-based helpers for validating JSON text while it is parsed.
+    
+    Scalars are decoded with the C scanner of the json module; containers
+    are walked by the validators themselves so subtrees the schema does not
+    reference are skipped without being decoded.
+    """
+    
+    def __init__(self, text: str):
+        self.text = text
+        self._scan_once = json.JSONDecoder().scan_once
+    
+    def whitespace(self, idx: int) -> int:
+        """Returns the index of the next non-whitespace character"""
+        # Compact JSON has no whitespace, so check one character before using the regex
+        if self.text[idx:idx + 1] not in _JSON_WHITESPACE_CHARS:
+            return idx
+        return _JSON_WHITESPACE.match(self.text, idx).end()
+    
+    def value(self, idx: int) -> Tuple[Any, int]:
+        """Decodes the value starting at idx and returns it with its end index"""
+        try:
+            return self._scan_once(self.text, idx)
+        except StopIteration as error:
+            raise json.JSONDecodeError("Expecting value", self.text, error.value) from None
+    
+    def key(self, idx: int) -> Tuple[str, int]:
+        """Decodes an object key and the following colon; returns the key and the value index"""
+        text = self.text
+        if not text.startswith('"', idx):
+            raise json.JSONDecodeError("Expecting property name enclosed in double quotes", text, idx)
+        key, idx = json.decoder.scanstring(text, idx + 1)
+        if text[idx:idx + 1] != ":":
+            idx = self.whitespace(idx)
+            if not text.startswith(":", idx):
+                raise json.JSONDecodeError("Expecting ':' delimiter", text, idx)
+        return key, self.whitespace(idx + 1)
+    
+    def separator(self, idx: int, closing: str) -> Tuple[bool, int]:
+        """Consumes a ',' or the closing bracket; returns (more items follow, next index)"""
+        char = self.text[idx:idx + 1]
+        if char in _JSON_WHITESPACE_CHARS:
+            idx = self.whitespace(idx)
+            char = self.text[idx:idx + 1]
+        if char == ",":
+            return True, self.whitespace(idx + 1)
+        if char == closing:
+            return False, idx + 1
+        raise json.JSONDecodeError("Expecting ',' delimiter", self.text, idx)
+    
+    def skip(self, idx: int) -> int:
+        """Returns the end index of the value at idx without building containers"""
+        text = self.text
+        if text[idx:idx + 1] not in ("{", "["):
+            return self.value(idx)[1]
+        depth = 0
+        for match in _JSON_SKIP_TOKEN.finditer(text, idx):
+            token = match.group()
+            if token[0] == '"':
+                continue
+            depth += 1 if token in "{[" else -1
+            if depth == 0:
+                return match.end()
+        raise json.JSONDecodeError("Unterminated container", text, idx)
+
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+# Only values of these exact types are immutable and safe to use as cache keys
+_CACHEABLE_TYPES = frozenset({str, int, float, bool, tuple})
+
+# Bumped whenever any validator is reconfigured; caches of validators with
+# children compare it to notice that a nested validator changed
+_reconfigurations = 0
+
+
+class _ResultCache:
+    """
+    Bounded LRU cache of a validator's results, keyed on immutable values.
+    
+    Built on functools.lru_cache with typed=True, so 1, 1.0 and True are
+    cached separately and lookups are thread-safe without an extra lock.
+    """
+    
+    def __init__(self, maxsize: int, nested: bool = False):
+        self.maxsize = maxsize
+        self.nested = nested
+        self._generation = _reconfigurations
+        self._lookup: Optional[Callable[[Any], ValidationResult]] = None
+    
+    def validate(self, validator: "BaseValidator", value: Any, max_errors: Optional[int]) -> ValidationResult:
+        """Returns the cached result for value, validating and storing it on a miss"""
+        if type(value) not in _CACHEABLE_TYPES:
+            return validator._validate_budgeted(value, max_errors)
+        if self.nested and self._generation != _reconfigurations:
+            # Some validator was reconfigured since; it may be nested in this one
+            self._generation = _reconfigurations
+            self.clear()
+        lookup = self._lookup
+        if lookup is None:
+            # Full results are stored so any error budget can be served from them
+            lookup = self._lookup = functools.lru_cache(maxsize=self.maxsize, typed=True)(validator._validate_value)
+        try:
+            result = lookup(value)
+        except TypeError:  # a tuple holding unhashable items
+            return validator._validate_budgeted(value, max_errors)
+        
+        if max_errors is not None and len(result._issues) > max_errors:
+            return ValidationResult._failure(result._issues[:max_errors])
+        return result
+    
+    def clear(self):
+        """Drops every cached result and resets the counters"""
+        if self._lookup is not None:
+            self._lookup.cache_clear()
+    
+    def info(self) -> CacheInfo:
+        """Returns the hit/miss counters and the current size"""
+        if self._lookup is None:
+            return CacheInfo(0, 0, self.maxsize, 0)
+        return CacheInfo(*self._lookup.cache_info())
+    
+    def __getstate__(self):
+        # The lookup wraps a bound method; copies start with an empty cache
+        return {"maxsize": self.maxsize, "nested": self.nested}
+    
+    def __setstate__(self, state):
+        self.__init__(state["maxsize"], state.get("nested", False))
+
+
+def _reconfigured():
+    """Records that a validator changed, invalidating the caches of validators with children"""
+    global _reconfigurations
+    _reconfigurations += 1
+
+
+# A pending async check: (check, custom message, value, path)
+_AsyncCheck = Tuple[Callable[[Any], Awaitable[Any]], Optional[str], Any, tuple]
+
+
+def _async_subtrees(root: "BaseValidator") -> set:
+    """Returns the ids of the validators that have async checks in their subtree"""
+    nodes: Dict[int, "BaseValidator"] = {}
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if id(node) not in nodes:
+            nodes[id(node)] = node
+            stack.extend(child for _, child in node._children())
+    
+    # Propagate upwards until nothing changes; recursive schemas make the tree a graph
+    active = {key for key, node in nodes.items() if node._async_checks}
+    changed = bool(active)
+    while changed:
+        changed = False
+        for key, node in nodes.items():
+            if key not in active and any(id(child) in active for _, child in node._children()):
+                active.add(key)
+                changed = True
+    return active
+
+
+async def _run_async_checks(pending: List[_AsyncCheck], concurrency: int,
+                            max_errors: Optional[int]) -> ValidationResult:
+    """
+    Runs pending async checks with at most `concurrency` of them in flight.
+    
+    A fixed set of workers pulls checks in order, so no more than
+    `concurrency` coroutines exist at a time; once `max_errors` checks have
+    failed no further checks are started.
+    """
+    passed: List[Optional[bool]] = [None] * len(pending)
+    indices = iter(range(len(pending)))
+    state = {"failures": 0, "stop": False}
+    
+    async def worker():
+        for index in indices:
+            if state["stop"]:
+                return
+            check, _, value, _ = pending[index]
+            try:
+                ok = bool(await check(value))
+            except BaseException:
+                state["stop"] = True
+                raise
+            passed[index] = ok
+            if not ok:
+                state["failures"] += 1
+                if max_errors is not None and state["failures"] >= max_errors:
+                    state["stop"] = True
+    
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, len(pending)))))
+    
+    issues = [
+        ValidationIssue("check", {"name": getattr(check, "__name__", repr(check))}, path, message)
+        for (check, message, _, path), ok in zip(pending, passed) if ok is False
+    ]
+    if not issues:
+        return _VALID
+    return ValidationResult._failure(issues[:max_errors] if max_errors is not None else issues)
 
 
 class ValidationError(Exception):
     """Custom exception for validation errors"""
-    def __init__(self, errors: List[str]):
+    def __init__(self, errors: List[str], issues: Sequence[ValidationIssue] = ()):
         self.errors = errors
+        self.issues = tuple(issues)
         super().__init__(f"Validation failed: {', '.join(errors)}")
 
 
+class _FrozenDict(dict):
+    """A read-only, hashable dict used for the mappings of frozen validators"""
+    
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("The schema of a frozen validator cannot be changed")
+    
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+    
+    def __hash__(self) -> int:
+        return hash(tuple(self.items()))
+    
+    def __reduce__(self):
+        return (_FrozenDict, (dict(self),))
+
+
 class BaseValidator:
     """Base class for all validators"""
     
+    # Result cache enabled by cached(); None keeps validate() cache-free
+    _cache: Optional[_ResultCache] = None
+    
+    # Set by freeze(); frozen validators reject reconfiguration
+    _frozen = False
+    
+    # (check, message) pairs added by check_async(); only avalidate() runs them
+    _async_checks: tuple = ()
+    
+    # Set for subclasses whose _validate_value(value) predates the error budget
+    _legacy_hook = False
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        hook = cls.__dict__.get("_validate_value")
+        if hook is not None:
+            cls._legacy_hook = not _accepts_budget(hook)
+    
     def __init__(self):
         self._optional = False
         self._custom_message: Optional[str] = None
     
+    def __setattr__(self, name: str, value: Any):
+        if self._frozen:
+            raise AttributeError(f"{type(self).__name__} is frozen and cannot be reconfigured")
+        # Any reconfiguration invalidates cached results, including those of parents
+        if name in self.__dict__:
+            _reconfigured()
+        object.__setattr__(self, name, value)
+        cache = self.__dict__.get("_cache")
+        if cache is not None and name != "_cache":
+            cache.clear()
+    
+    def __delattr__(self, name: str):
+        if self._frozen:
+            raise AttributeError(f"{type(self).__name__} is frozen and cannot be reconfigured")
+        _reconfigured()
+        object.__delattr__(self, name)
+        cache = self.__dict__.get("_cache")
+        if cache is not None:
+            cache.clear()
+    
+    def freeze(self):
+        """
+        Makes this validator and every validator nested in it immutable.
+        
+        Frozen validators raise AttributeError on reconfiguration, so one tree
+        can be shared between threads without locks or copies. They compare
+        and hash by their configuration, and equal frozen trees share one
+        compiled form. Freeze a tree before using it as a dict key. Custom
+        subclasses compare by identity unless they define _signature().
+        """
+        stack = [self]
+        seen = set()
+        while stack:
+            node = stack.pop()
+            if id(node) in seen or node._frozen:
+                continue
+            seen.add(id(node))
+            node._freeze_state()
+            stack.extend(child for _, child in node._children())
+            object.__setattr__(node, "_frozen", True)
+        return self
+    
+    @property
+    def frozen(self) -> bool:
+        """True once freeze() has been called"""
+        return self._frozen
+    
+    def _freeze_state(self):
+        """Replaces mutable containers with immutable ones before freezing"""
+    
+    def _signature(self) -> tuple:
+        """Returns the configuration that frozen validators are compared and hashed by"""
+        maxsize = self._cache.maxsize if self._cache is not None else None
+        return (self._optional, self._custom_message, self._async_checks, maxsize)
+    
+    def _has_signature(self) -> bool:
+        """True if this class's own _signature() covers its configuration"""
+        # An inherited signature would miss the fields a subclass adds
+        return "_signature" in type(self).__dict__
+    
+    def __eq__(self, other: Any) -> bool:
+        if self is other:
+            return True
+        if not (self._frozen and isinstance(other, BaseValidator) and other._frozen):
+            return NotImplemented
+        return (type(self) is type(other) and self._has_signature()
+                and self._signature() == other._signature())
+    
+    def __hash__(self) -> int:
+        if not (self._frozen and self._has_signature()):
+            return object.__hash__(self)
+        cached = self.__dict__.get("_hash")
+        if cached is None:
+            cached = hash((type(self), self._signature()))
+            object.__setattr__(self, "_hash", cached)
+        return cached
+    
+    def __getstate__(self):
+        # String hashes differ between processes, so the cached hash is recomputed
+        state = self.__dict__.copy()
+        state.pop("_hash", None)
+        return state
+    
     def optional(self):
         """Makes this validator optional (allows None values)"""
         self._optional = True
@@ -43,27 +776,365 @@ class BaseValidator:
         self._custom_message = message
         return self
     
-    def validate(self, value: Any) -> ValidationResult:
-        """Validates a value and returns a ValidationResult"""
+    def cached(self, maxsize: int = 1024):
+        """
+        Enables a bounded LRU cache of results for repeated immutable values.
+        
+        Results for str, int, float, bool and tuple values are cached per
+        validator; the cache is cleared whenever the validator or a validator
+        nested in it is reconfigured. Call cache_clear() after editing a
+        nested validator list or dict in place.
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self._cache = _ResultCache(maxsize, type(self)._children is not BaseValidator._children)
+        return self
+    
+    def check_async(self, check: Callable[[Any], Awaitable[Any]], message: Optional[str] = None):
+        """
+        Adds an async check, e.g. a database lookup, run by avalidate().
+        
+        `check` is a coroutine function that receives the value and returns
+        a truthy result when it is valid. It only runs for values that passed
+        every sync check of the whole schema; validate() ignores it.
+        """
+        self._async_checks = self._async_checks + ((check, message),)
+        return self
+    
+    def cache_info(self) -> Optional[CacheInfo]:
+        """Returns the cache's hits, misses, maxsize and currsize, or None when disabled"""
+        return self._cache.info() if self._cache is not None else None
+    
+    def cache_clear(self):
+        """Drops all cached results"""
+        if self._cache is not None:
+            self._cache.clear()
+    
+    def validate(self, value: Any, fail_fast: bool = False,
+                 max_errors: Optional[int] = None) -> ValidationResult:
+        """
+        Validates a value and returns a ValidationResult.
+        
+        With fail_fast=True validation stops at the first error; max_errors=N
+        stops once N errors have been collected, including nested ones.
+        """
+        if fail_fast:
+            max_errors = 1
+        elif max_errors is not None and max_errors < 1:
+            raise ValueError("max_errors must be at least 1")
+        
         if value is None:
             if self._optional:
-                return ValidationResult(True, [])
+                return _VALID
             else:
-                error_msg = self._custom_message or "Value is required"
-                return ValidationResult(False, [error_msg])
+                return ValidationResult._failure((ValidationIssue("required", message=self._custom_message),))
+        
+        cache = self._cache
+        if cache is not None:
+            return cache.validate(self, value, max_errors)
+        if self._legacy_hook:
+            return self._validate_budgeted(value, max_errors)
+        return self._validate_value(value, max_errors)
+    
+    async def avalidate(self, value: Any, fail_fast: bool = False, max_errors: Optional[int] = None,
+                        concurrency: int = 10) -> ValidationResult:
+        """
+        Validates a value including its async checks.
+        
+        All sync checks run first; if any of them fails its result is
+        returned without starting a single async check. Otherwise the async
+        checks of all fields and items run concurrently, at most
+        `concurrency` at a time.
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        result = self.validate(value, fail_fast, max_errors)
+        if not result.is_valid:
+            return result
+        
+        active = _async_subtrees(self)
+        if not active:
+            return result
+        pending: List[_AsyncCheck] = []
+        # An explicit stack in pre-order, so deeply nested values cannot overflow
+        stack: List[Tuple[BaseValidator, Any, tuple]] = [(self, value, ())]
+        while stack:
+            validator, item, path = stack.pop()
+            nested = validator._collect_async(item, path, pending, active)
+            if nested:
+                stack.extend(reversed(nested))
+        if not pending:
+            return result
+        return await _run_async_checks(pending, concurrency, 1 if fail_fast else max_errors)
+    
+    def _collect_async(self, value: Any, path: tuple, pending: List[_AsyncCheck],
+                       active: set) -> Optional[List[Tuple["BaseValidator", Any, tuple]]]:
+        """
+        Adds the async checks for value to `pending`.
         
-        return self._validate_value(value)
+        Returns the (validator, nested value, path) entries whose checks are
+        collected next, instead of recursing into them.
+        """
+        if value is None:
+            return None
+        for check, message in self._async_checks:
+            pending.append((check, message, value, path))
+        return None
     
-    def _validate_value(self, value: Any) -> ValidationResult:
-        """Override this method in subclasses to implement validation logic"""
+    def _validate_value(self, value: Any, max_errors: Optional[int] = None) -> ValidationResult:
+        """
+        Override this method in subclasses to implement validation logic.
+        
+        max_errors is the remaining error budget (None for unlimited); at most
+        that many errors should be returned.
+        """
         raise NotImplementedError
     
+    def _validate_budgeted(self, value: Any, max_errors: Optional[int] = None) -> ValidationResult:
+        """Calls _validate_value, cutting the result of one-argument overrides to the budget"""
+        if not self._legacy_hook:
+            return self._validate_value(value, max_errors)
+        result = self._validate_value(value)
+        if max_errors is not None and len(result._issues) > max_errors:
+            return ValidationResult._failure(result._issues[:max_errors])
+        return result
+    
+    def validate_many(self, values: Sequence[Any]) -> BatchResult:
+        """
+        Validates each value of a batch and returns a BatchResult bitmap.
+        
+        Each value is only checked up to its first error; call
+        BatchResult.details(i) for the full result of a failed value.
+        """
+        if not hasattr(values, "__getitem__"):
+            values = list(values)
+        validate = self.validate
+        failed = [i for i, value in enumerate(_python_items(values))
+                  if not validate(value, fail_fast=True).is_valid]
+        return BatchResult(self, values, _bitmap_from_indices(len(values), failed), len(failed))
+    
+    def validate_stream(self, values: Iterable[Any], fail_fast: bool = False,
+                        max_errors: Optional[int] = None) -> Iterator[Tuple[int, ValidationResult]]:
+        """
+        Lazily validates the values of an iterable, yielding (index, result) pairs.
+        
+        Only one value is held at a time. With fail_fast=True each value is
+        checked up to its first error and the stream stops after the first
+        invalid value.
+        """
+        for index, value in enumerate(values):
+            result = self.validate(value, fail_fast, max_errors)
+            yield index, result
+            if fail_fast and not result.is_valid:
+                return
+    
+    def validate_jsonl(self, source: Union[str, "os.PathLike[str]", IO], chunk_size: int = 1 << 20,
+                       fail_fast: bool = False, max_errors: Optional[int] = None
+                       ) -> Iterator[Tuple[int, ValidationResult]]:
+        """
+        Validates a JSON Lines file record by record, yielding (line, result) pairs.
+        
+        `source` is a path or an open file. The file is read in chunks of
+        `chunk_size` bytes so memory use stays constant regardless of its size.
+        Line numbers start at 0; blank lines are skipped and lines that are
+        not valid JSON produce a result with a 'json' issue.
+        """
+        if hasattr(source, "read"):
+            lines = _iter_lines(source, chunk_size)
+        else:
+            with open(source, "rb") as file:
+                yield from self.validate_jsonl(file, chunk_size, fail_fast, max_errors)
+            return
+        
+        for line_number, line in enumerate(lines):
+            if not line.strip():
+                continue
+            try:
+                value = json.loads(line)
+            except ValueError as error:
+                result = ValidationResult._failure((ValidationIssue("json", {"error": str(error)}),))
+            else:
+                result = self.validate(value, fail_fast, max_errors)
+            yield line_number, result
+            if fail_fast and not result.is_valid:
+                return
+    
+    def validate_json(self, source: Union[str, bytes, bytearray, IO], fail_fast: bool = False,
+                      max_errors: Optional[int] = None) -> ValidationResult:
+        """
+        Validates a JSON document while parsing it, without building the whole value.
+        
+        `source` is JSON text, bytes or an open file. Fields the schema does
+        not reference are skipped without being decoded (and their contents
+        are only checked for balanced brackets). Parsing stops as soon as the
+        error budget is used up, so the reported errors are the first ones in
+        document order and the remainder of the document is not checked.
+        Documents under 64 KiB are simply decoded and validated, which is
+        faster at that size. Malformed JSON produces a result with a 'json' issue.
+        """
+        if fail_fast:
+            max_errors = 1
+        elif max_errors is not None and max_errors < 1:
+            raise ValueError("max_errors must be at least 1")
+        
+        if hasattr(source, "read"):
+            source = source.read()
+        if isinstance(source, (bytes, bytearray)):
+            source = source.decode(json.detect_encoding(source), "surrogatepass")
+        
+        if len(source) < _JSON_INCREMENTAL_MIN_SIZE:
+            try:
+                value = json.loads(source)
+            except ValueError as error:
+                return ValidationResult._failure((ValidationIssue("json", {"error": str(error)}),))
+            return self.validate(value, max_errors=max_errors)
+        
+        scanner = _JsonScanner(source)
+        try:
+            result, end = self._scan_json(scanner, scanner.whitespace(0), max_errors)
+            if not _limit_reached(result._issues, max_errors):
+                end = scanner.whitespace(end)
+                if end != len(source):
+                    raise json.JSONDecodeError("Extra data", source, end)
+        except json.JSONDecodeError as error:
+            return ValidationResult._failure((ValidationIssue("json", {"error": str(error)}),))
+        return result
+    
+    def _scan_json(self, scanner: _JsonScanner, idx: int,
+                   max_errors: Optional[int]) -> Tuple[ValidationResult, int]:
+        """
+        Validates the JSON value starting at idx; returns the result and the end index.
+        
+        The default decodes the value and validates it; containers override
+        this to validate while walking their items. The end index is only
+        meaningful while the error budget has not been used up.
+        """
+        value, end = scanner.value(idx)
+        return self.validate(value, max_errors=max_errors), end
+    
+    def instrument(self, profiler: Optional["ValidationProfiler"] = None) -> "ValidationProfiler":
+        """
+        Attaches a profiler that records calls, time and failures per schema path.
+        
+        Returns the profiler; detach() it (or use it as a context manager) to
+        restore uninstrumented validation.
+        """
+        profiler = profiler if profiler is not None else ValidationProfiler()
+        return profiler.attach(self)
+    
+    def _children(self) -> List[Tuple[str, "BaseValidator"]]:
+        """Returns the nested validators as (path suffix, validator) pairs"""
+        return []
+    
+    def _type_error(self, value: Any, expected: str) -> ValidationResult:
+        """Builds the failed result for a value of the wrong type"""
+        params = {"expected": expected, "actual": type(value).__name__}
+        return ValidationResult._failure((ValidationIssue("type", params, message=self._custom_message),))
+    
     def parse(self, value: Any) -> Any:
-        """Validates and returns the value if valid, raises ValidationError if not"""
+        """
+        Validates and returns the value if valid, raises ValidationError if not.
+        
+        Objects in strip_unknown() mode are returned as copies without their
+        unknown fields.
+        """
         result = self.validate(value)
         if not result.is_valid:
-            raise ValidationError(result.errors)
+            raise ValidationError(result.errors, result.issues)
+        return self._strip(value) if self._strips() else value
+    
+    def _strips(self, seen: Optional[set] = None) -> bool:
+        """Checks whether parse() removes unknown fields anywhere in this tree"""
+        return any(child._strips(seen) for _, child in self._children())
+    
+    def _strip(self, value: Any) -> Any:
+        """Returns a valid value with the unknown fields of strip_unknown() objects removed"""
         return value
+    
+    def _strip_iteratively(self, value: Any) -> Any:
+        """Strips like _strip(), running _strip_steps() generators on an explicit stack"""
+        stack = [self._strip_steps(value)]
+        result = None
+        while True:
+            try:
+                validator, nested = stack[-1].send(result)
+            except StopIteration as done:
+                stack.pop()
+                if not stack:
+                    return done.value
+                result = done.value
+                continue
+            stack.append(validator._strip_steps(nested))
+            result = None
+    
+    def _strip_steps(self, value: Any) -> Iterator[Tuple["BaseValidator", Any]]:
+        """
+        Generator version of _strip() for values nested too deeply to recurse.
+        
+        Nested values are stripped by yielding (validator, nested value);
+        the stripped nested value is sent back.
+        """
+        return value
+        yield
+    
+    def save(self, target: Union[str, "os.PathLike[str]", IO]):
+        """
+        Writes the validator tree to a file that Schema.load() reads back.
+        
+        Save compile() output instead to also skip code generation on load.
+        """
+        _write_artifact(self, target)
+    
+    def compile(self) -> "CompiledValidator":
+        """
+        Compiles the finished validator tree into a single generated function.
+        
+        The compiled form is a snapshot: reconfiguring the validator afterwards
+        does not affect it, so call compile() again after changing the schema.
+        Validators with a result cache are called through their cache.
+        Frozen validators are compiled once and share the compiled form with
+        equal frozen validators.
+        """
+        if self._frozen:
+            return _compile_frozen(self)
+        return _SchemaCompiler().compile(self)
+    
+    def _emit(self, compiler: "_SchemaCompiler", var: str, prefix: tuple, indent: int):
+        """Emits code that validates `var`, including the None/optional check"""
+        if self._cache is not None:
+            compiler.emit_delegate(indent, var, prefix, compiler.const(self.validate))
+            return
+        # A subclass overriding only _validate_value is delegated to, not inlined
+        emit_value = self._emit_value
+        if not self._inlines_checks():
+            emit_value = functools.partial(BaseValidator._emit_value, self)
+        if self._optional:
+            compiler.emit(indent, f"if {var} is not None:")
+            emit_value(compiler, var, prefix, indent + 1)
+            return
+        compiler.emit(indent, f"if {var} is None:")
+        compiler.fail(indent + 1, prefix, "required", message=self._custom_message)
+        compiler.emit(indent, "else:")
+        emit_value(compiler, var, prefix, indent + 1)
+    
+    def _inlines_checks(self) -> bool:
+        """Checks that _emit_value comes from the same class as _validate_value, or a subclass of it"""
+        for cls in type(self).__mro__:
+            if "_emit_value" in cls.__dict__:
+                return True
+            if "_validate_value" in cls.__dict__:
+                return False
+        return False
+    
+    def _emit_value(self, compiler: "_SchemaCompiler", var: str, prefix: tuple, indent: int):
+        """
+        Emits code that validates a non-None `var`.
+        
+        Subclasses override this to inline their checks; the default delegates
+        to _validate_value so custom validators still compile correctly.
+        """
+        func = compiler.const(self._validate_budgeted)
+        compiler.emit_delegate(indent, var, prefix, func)
 
 
 class StringValidator(BaseValidator):
@@ -93,27 +1164,100 @@ class StringValidator(BaseValidator):
             self._pattern = regex
         return self
     
-    def _validate_value(self, value: Any) -> ValidationResult:
+    def _signature(self) -> tuple:
+        return super()._signature() + _typed(self._min_length, self._max_length) + (self._pattern,)
+    
+    def _validate_value(self, value: Any, max_errors: Optional[int] = None) -> ValidationResult:
         """Validates that value is a string and meets all requirements"""
-        errors = []
+        # Errors are collected in a tuple so the success path allocates nothing
+        errors = ()
         
         if not isinstance(value, str):
-            error_msg = self._custom_message or f"Expected string, got {type(value).__name__}"
-            return ValidationResult(False, [error_msg])
+            return self._type_error(value, "string")
         
         # Check minimum length
         if self._min_length is not None and len(value) < self._min_length:
-            errors.append(f"String must be at least {self._min_length} characters long")
+            errors += (ValidationIssue("min_length", {"limit": self._min_length}),)
         
         # Check maximum length
         if self._max_length is not None and len(value) > self._max_length:
-            errors.append(f"String must be at most {self._max_length} characters long")
+            errors += (ValidationIssue("max_length", {"limit": self._max_length}),)
+        
+        if _limit_reached(errors, max_errors):
+            return ValidationResult._failure(errors[:max_errors])
         
         # Check pattern
         if self._pattern is not None and not self._pattern.match(value):
-            errors.append(f"String does not match required pattern")
+            errors += (ValidationIssue("pattern"),)
+        
+        return ValidationResult._failure(errors) if errors else _VALID
+    
+    def validate_many(self, values: Sequence[Any]) -> BatchResult:
+        """
+        Validates a batch of strings.
         
-        return ValidationResult(len(errors) == 0, errors)
+        Length limits are checked with one vectorized pass when NumPy is
+        available and every value is a string; patterns are then matched
+        only against the values that passed.
+        """
+        if type(self) is not StringValidator:
+            # The inlined checks would bypass a subclass's _validate_value
+            return super().validate_many(values)
+        if not hasattr(values, "__getitem__"):
+            values = list(values)
+        min_length, max_length, pattern = self._min_length, self._max_length, self._pattern
+        
+        if np is not None and len(values) and (min_length is not None or max_length is not None):
+            lengths = _string_lengths(values)
+            if lengths is not None:
+                mask = np.zeros(len(values), dtype=bool)
+                if min_length is not None:
+                    mask |= lengths < min_length
+                if max_length is not None:
+                    mask |= lengths > max_length
+                if pattern is not None:
+                    match = pattern.match
+                    for i in np.flatnonzero(~mask).tolist():
+                        if not match(values[i]):
+                            mask[i] = True
+                return _batch_from_mask(self, values, mask)
+        
+        match = pattern.match if pattern is not None else None
+        optional = self._optional
+        failed = []
+        for i, value in enumerate(values):
+            if value is None:
+                if not optional:
+                    failed.append(i)
+            elif (not isinstance(value, str)
+                  or (min_length is not None and len(value) < min_length)
+                  or (max_length is not None and len(value) > max_length)
+                  or (match is not None and not match(value))):
+                failed.append(i)
+        return BatchResult(self, values, _bitmap_from_indices(len(values), failed), len(failed))
+    
+    def _emit_value(self, compiler: "_SchemaCompiler", var: str, prefix: tuple, indent: int):
+        """Emits the type check and only the constraints that are set"""
+        compiler.emit_type_check(indent, var, prefix, "str", "string", self._custom_message)
+        if self._min_length is None and self._max_length is None and self._pattern is None:
+            return
+        compiler.emit(indent, "else:")
+        indent += 1
+        length = var
+        if self._min_length is not None and self._max_length is not None:
+            length = compiler.name("n")
+            compiler.emit(indent, f"{length} = len({var})")
+        elif self._min_length is not None or self._max_length is not None:
+            length = f"len({var})"
+        if self._min_length is not None:
+            compiler.emit(indent, f"if {length} < {compiler.const(self._min_length)}:")
+            compiler.fail(indent + 1, prefix, "min_length", {"limit": self._min_length})
+        if self._max_length is not None:
+            compiler.emit(indent, f"if {length} > {compiler.const(self._max_length)}:")
+            compiler.fail(indent + 1, prefix, "max_length", {"limit": self._max_length})
+        if self._pattern is not None:
+            compiler.emit(indent, f"if not {compiler.const(self._pattern.match)}({var}):")
+            compiler.fail(indent + 1, prefix, "pattern")
 
 
 class NumberValidator(BaseValidator):
@@ -134,35 +1278,112 @@ class NumberValidator(BaseValidator):
         self._max_value = value
         return self
     
-    def _validate_value(self, value: Any) -> ValidationResult:
+    def _signature(self) -> tuple:
+        return super()._signature() + _typed(self._min_value, self._max_value)
+    
+    def _validate_value(self, value: Any, max_errors: Optional[int] = None) -> ValidationResult:
         """Validates that value is a number and meets all requirements"""
-        errors = []
+        errors = ()
         
         if not isinstance(value, (int, float)):
-            error_msg = self._custom_message or f"Expected number, got {type(value).__name__}"
-            return ValidationResult(False, [error_msg])
+            return self._type_error(value, "number")
         
         # Check minimum value
         if self._min_value is not None and value < self._min_value:
-            errors.append(f"Number must be at least {self._min_value}")
+            errors += (ValidationIssue("min", {"limit": self._min_value}),)
         
         # Check maximum value
         if self._max_value is not None and value > self._max_value:
-            errors.append(f"Number must be at most {self._max_value}")
+            errors += (ValidationIssue("max", {"limit": self._max_value}),)
+        
+        return ValidationResult._failure(errors[:max_errors]) if errors else _VALID
+    
+    def validate_many(self, values: Sequence[Any]) -> BatchResult:
+        """
+        Validates a batch of numbers.
+        
+        When NumPy is available and the values form an exact numeric array,
+        the range limits are checked with vectorized comparisons; otherwise a
+        tight loop is used.
+        """
+        if type(self) is not NumberValidator:
+            # The inlined checks would bypass a subclass's _validate_value
+            return super().validate_many(values)
+        if not hasattr(values, "__getitem__"):
+            values = list(values)
+        min_value, max_value = self._min_value, self._max_value
         
-        return ValidationResult(len(errors) == 0, errors)
+        if np is not None and len(values) and all(
+                limit is None or (isinstance(limit, (int, float)) and abs(limit) < _FLOAT_EXACT_LIMIT)
+                for limit in (min_value, max_value)):
+            array = _numeric_array(values)
+            if array is not None:
+                mask = np.zeros(len(array), dtype=bool)
+                if min_value is not None:
+                    mask |= array < min_value
+                if max_value is not None:
+                    mask |= array > max_value
+                return _batch_from_mask(self, values, mask)
+        
+        optional = self._optional
+        failed = []
+        for i, value in enumerate(_python_items(values)):
+            if value is None:
+                if not optional:
+                    failed.append(i)
+            elif (not isinstance(value, (int, float))
+                  or (min_value is not None and value < min_value)
+                  or (max_value is not None and value > max_value)):
+                failed.append(i)
+        return BatchResult(self, values, _bitmap_from_indices(len(values), failed), len(failed))
+    
+    def _range_masks(self, numbers: Any) -> Tuple[Any, Any]:
+        """
+        Returns boolean masks of the values below the minimum and above the maximum.
+        
+        `numbers` is a 1-D NumPy array of a bool, integer or float dtype. The
+        comparisons are exact: integer arrays are compared with integer
+        bounds and float arrays in float64, as Python would compare them.
+        """
+        if numbers.dtype.kind == "b":
+            numbers = numbers.view(np.uint8)
+        below = above = None
+        if self._min_value is not None:
+            below = _compare_exact(numbers, self._min_value, below=True)
+        if self._max_value is not None:
+            above = _compare_exact(numbers, self._max_value, below=False)
+        return below, above
+    
+    def _emit_value(self, compiler: "_SchemaCompiler", var: str, prefix: tuple, indent: int):
+        """Emits the type check and only the range limits that are set"""
+        compiler.emit_type_check(indent, var, prefix, "(int, float)", "number", self._custom_message)
+        if self._min_value is None and self._max_value is None:
+            return
+        compiler.emit(indent, "else:")
+        if self._min_value is not None:
+            compiler.emit(indent + 1, f"if {var} < {compiler.const(self._min_value)}:")
+            compiler.fail(indent + 2, prefix, "min", {"limit": self._min_value})
+        if self._max_value is not None:
+            compiler.emit(indent + 1, f"if {var} > {compiler.const(self._max_value)}:")
+            compiler.fail(indent + 2, prefix, "max", {"limit": self._max_value})
 
 
 class BooleanValidator(BaseValidator):
     """Validator for boolean values"""
     
-    def _validate_value(self, value: Any) -> ValidationResult:
+    def _validate_value(self, value: Any, max_errors: Optional[int] = None) -> ValidationResult:
         """Validates that value is a boolean"""
         if not isinstance(value, bool):
-            error_msg = self._custom_message or f"Expected boolean, got {type(value).__name__}"
-            return ValidationResult(False, [error_msg])
+            return self._type_error(value, "boolean")
         
-        return ValidationResult(True, [])
+        return _VALID
+    
+    def _signature(self) -> tuple:
+        return super()._signature()
+    
+    def _emit_value(self, compiler: "_SchemaCompiler", var: str, prefix: tuple, indent: int):
+        """Emits the boolean type check"""
+        compiler.emit_type_check(indent, var, prefix, "bool", "boolean", self._custom_message)
 
 
 class ArrayValidator(BaseValidator):
@@ -184,29 +1405,275 @@ class ArrayValidator(BaseValidator):
         self._max_length = length
         return self
     
-    def _validate_value(self, value: Any) -> ValidationResult:
+    def _signature(self) -> tuple:
+        return super()._signature() + (self.item_validator,) + _typed(self._min_length, self._max_length)
+    
+    def _validate_value(self, value: Any, max_errors: Optional[int] = None) -> ValidationResult:
         """Validates that value is a list and all items are valid"""
-        errors = []
+        # The error list is only created once something fails
+        errors: Optional[List[ValidationIssue]] = None
         
         if not isinstance(value, list):
-            error_msg = self._custom_message or f"Expected list, got {type(value).__name__}"
-            return ValidationResult(False, [error_msg])
+            if isinstance(value, _NUMERIC_BUFFER_TYPES) and self._accepts_buffers():
+                return self._validate_buffer(value, max_errors)
+            return self._type_error(value, "list")
         
-        # Check length constraints
-        if self._min_length is not None and len(value) < self._min_length:
-            errors.append(f"Array must have at least {self._min_length} items")
+        errors = self._length_issues(len(value))
+        if _limit_reached(errors, max_errors):
+            return ValidationResult._failure(errors[:max_errors])
         
-        if self._max_length is not None and len(value) > self._max_length:
-            errors.append(f"Array must have at most {self._max_length} items")
+        # Validate each item, passing down what is left of the error budget
+        item_validate = self.item_validator.validate
+        for i, item in enumerate(value):
+            remaining = None if max_errors is None else max_errors - len(errors or ())
+            result = item_validate(item, max_errors=remaining)
+            if not result.is_valid:
+                errors = errors or []
+                errors.extend([issue._prefixed(i) for issue in result._issues])
+                if _limit_reached(errors, max_errors):
+                    break
+        
+        return ValidationResult._failure(errors) if errors else _VALID
+    
+    def _strip(self, value: Any) -> Any:
+        """Strips every item when the item validator removes unknown fields"""
+        item_validator = self.item_validator
+        if isinstance(value, list) and item_validator._strips():
+            return [item_validator._strip(item) for item in value]
+        return value
+    
+    def _strip_steps(self, value: Any) -> Iterator[Tuple[BaseValidator, Any]]:
+        item_validator = self.item_validator
+        if isinstance(value, list) and item_validator._strips():
+            stripped = []
+            for item in value:
+                stripped.append((yield item_validator, item))
+            return stripped
+        return value
+    
+    def _accepts_buffers(self) -> bool:
+        """Numeric buffers are accepted when the items are plain numbers"""
+        return type(self.item_validator) is NumberValidator
+    
+    def _validate_buffer(self, value: Any, max_errors: Optional[int] = None) -> ValidationResult:
+        """
+        Validates an array.array, memoryview or NumPy array of numbers in place.
         
-        # Validate each item
+        With NumPy the range limits are checked in one vectorized pass over a
+        zero-copy view and only the offending indices are turned into issues.
+        """
+        if getattr(value, "ndim", 1) != 1:
+            return self._type_error(value, "list")
+        if np is not None:
+            numbers = np.asarray(value)
+            if numbers.dtype.kind in "biuf":
+                return self._validate_numbers(numbers, max_errors)
+            if isinstance(value, np.ndarray):
+                # e.g. object arrays; their items are the original Python objects
+                return self._validate_value(value.tolist(), max_errors)
+        
+        # Without NumPy, buffers yield plain Python numbers when iterated
+        errors = self._length_issues(len(value))
+        if _limit_reached(errors, max_errors):
+            return ValidationResult._failure(errors[:max_errors])
+        item_validate = self.item_validator.validate
         for i, item in enumerate(value):
-            result = self.item_validator.validate(item)
+            result = item_validate(item, max_errors=None if max_errors is None else max_errors - len(errors or ()))
+            if not result.is_valid:
+                errors = errors or []
+                errors.extend([issue._prefixed(i) for issue in result._issues])
+                if _limit_reached(errors, max_errors):
+                    break
+        return ValidationResult._failure(errors) if errors else _VALID
+    
+    def _validate_numbers(self, numbers: Any, max_errors: Optional[int]) -> ValidationResult:
+        """Validates a 1-D NumPy numeric array with vectorized range checks"""
+        errors = self._length_issues(len(numbers))
+        if _limit_reached(errors, max_errors):
+            return ValidationResult._failure(errors[:max_errors])
+        
+        item_validator = self.item_validator
+        below, above = item_validator._range_masks(numbers)
+        if below is None and above is None:
+            return ValidationResult._failure(errors) if errors else _VALID
+        if below is None or above is None:
+            failed = below if above is None else above
+        else:
+            failed = below | above
+        
+        errors = errors or []
+        budget = None if max_errors is None else max_errors - len(errors)
+        for i in np.flatnonzero(failed)[:budget].tolist():
+            if below is not None and below[i]:
+                errors.append(ValidationIssue("min", {"limit": item_validator._min_value}, (i,)))
+            if above is not None and above[i]:
+                errors.append(ValidationIssue("max", {"limit": item_validator._max_value}, (i,)))
+        if not errors:
+            return _VALID
+        return ValidationResult._failure(errors[:max_errors] if max_errors is not None else errors)
+    
+    def _children(self) -> List[Tuple[str, BaseValidator]]:
+        """Returns the item validator under the "[]" path suffix"""
+        return [("[]", self.item_validator)]
+    
+    def _scan_json(self, scanner: _JsonScanner, idx: int,
+                   max_errors: Optional[int]) -> Tuple[ValidationResult, int]:
+        """Validates each item while walking a JSON array"""
+        if not scanner.text.startswith("[", idx):
+            return super()._scan_json(scanner, idx, max_errors)
+        
+        errors: Optional[List[ValidationIssue]] = None
+        item_scan = self.item_validator._scan_json
+        count = 0
+        idx = scanner.whitespace(idx + 1)
+        more = not scanner.text.startswith("]", idx)
+        if not more:
+            idx += 1
+        while more:
+            remaining = None if max_errors is None else max_errors - len(errors or ())
+            result, idx = item_scan(scanner, idx, remaining)
             if not result.is_valid:
-                for error in result.errors:
-                    errors.append(f"Item at index {i}: {error}")
+                errors = errors or []
+                errors.extend([issue._prefixed(count) for issue in result._issues])
+                if _limit_reached(errors, max_errors):
+                    return ValidationResult._failure(errors), idx
+            count += 1
+            more, idx = scanner.separator(idx, "]")
+        
+        # Length issues come first, as in validate()
+        length_errors = self._length_issues(count)
+        if length_errors:
+            errors = length_errors + (errors or [])
+        if not errors:
+            return _VALID, idx
+        return ValidationResult._failure(errors[:max_errors] if max_errors is not None else errors), idx
+    
+    def _collect_async(self, value: Any, path: tuple, pending: List[_AsyncCheck], active: set):
+        """Adds the array's own async checks, then those of every item"""
+        super()._collect_async(value, path, pending, active)
+        item_validator = self.item_validator
+        if id(item_validator) in active and isinstance(value, list):
+            return [(item_validator, item, path + (i,)) for i, item in enumerate(value)]
+        return None
+    
+    def _length_issues(self, length: int) -> Optional[List[ValidationIssue]]:
+        """Checks the length constraints, returning None when they pass"""
+        errors = None
+        if self._min_length is not None and length < self._min_length:
+            errors = [ValidationIssue("min_items", {"limit": self._min_length})]
+        
+        if self._max_length is not None and length > self._max_length:
+            errors = errors or []
+            errors.append(ValidationIssue("max_items", {"limit": self._max_length}))
+        return errors
+    
+    def validate_parallel(self, value: Any, workers: Optional[int] = None, chunk_size: int = 10000,
+                          fail_fast: bool = False, max_errors: Optional[int] = None) -> ValidationResult:
+        """
+        Validates a large list by splitting its items across a process pool.
+        
+        The item validator is shipped to each worker once and compiled there;
+        chunks of `chunk_size` items are then validated concurrently and their
+        issues merged in order, so the result is identical to validate().
+        Lists that fit in a single chunk are validated in-process. The item
+        validator must be picklable (i.e. defined at module level).
+        """
+        if fail_fast:
+            max_errors = 1
+        elif max_errors is not None and max_errors < 1:
+            raise ValueError("max_errors must be at least 1")
+        
+        workers = workers or os.cpu_count() or 1
+        if workers < 2 or not isinstance(value, list) or len(value) <= chunk_size:
+            return self.validate(value, max_errors=max_errors)
+        
+        errors = self._length_issues(len(value))
+        if _limit_reached(errors, max_errors):
+            return ValidationResult._failure(errors[:max_errors])
+        
+        tasks = ((start, value[start:start + chunk_size], max_errors)
+                 for start in range(0, len(value), chunk_size))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_parallel_worker,
+                                 initargs=(self.item_validator,)) as executor:
+            # Keep only a few chunks in flight so the list is not copied all at once
+            pending = deque(executor.submit(_validate_chunk, task) for task in islice(tasks, workers * 2))
+            while pending:
+                issues = pending.popleft().result()
+                for task in islice(tasks, 1):
+                    pending.append(executor.submit(_validate_chunk, task))
+                if issues:
+                    errors = errors or []
+                    errors.extend(issues)
+                    if _limit_reached(errors, max_errors):
+                        executor.shutdown(cancel_futures=True)
+                        break
         
-        return ValidationResult(len(errors) == 0, errors)
+        return ValidationResult._failure(errors[:max_errors]) if errors else _VALID
+    
+    def _emit_value(self, compiler: "_SchemaCompiler", var: str, prefix: tuple, indent: int):
+        """Emits the list check, length limits and an inlined loop over the items"""
+        if self._accepts_buffers():
+            # Numeric buffers take the vectorized path of the interpreted validator
+            compiler.emit(indent, f"if isinstance({var}, {compiler.const(_NUMERIC_BUFFER_TYPES)}):")
+            compiler.emit_delegate(indent + 1, var, prefix, compiler.const(self._validate_buffer))
+            compiler.emit(indent, "else:")
+            indent += 1
+        compiler.emit_type_check(indent, var, prefix, "list", "list", self._custom_message)
+        compiler.emit(indent, "else:")
+        indent += 1
+        length = var
+        if self._min_length is not None and self._max_length is not None:
+            length = compiler.name("n")
+            compiler.emit(indent, f"{length} = len({var})")
+        elif self._min_length is not None or self._max_length is not None:
+            length = f"len({var})"
+        if self._min_length is not None:
+            compiler.emit(indent, f"if {length} < {compiler.const(self._min_length)}:")
+            compiler.fail(indent + 1, prefix, "min_items", {"limit": self._min_length})
+        if self._max_length is not None:
+            compiler.emit(indent, f"if {length} > {compiler.const(self._max_length)}:")
+            compiler.fail(indent + 1, prefix, "max_items", {"limit": self._max_length})
+        index = compiler.name("i")
+        item = compiler.name("v")
+        compiler.emit(indent, f"for {index}, {item} in enumerate({var}):")
+        compiler.emit_child(self.item_validator, item, prefix + (compiler.dynamic(index),), indent + 1)
+
+
+# Compiled item validator of a validate_parallel() worker process
+_worker_validate: Optional[Callable[..., ValidationResult]] = None
+
+
+def _init_parallel_worker(item_validator: BaseValidator):
+    """Compiles the item validator once when a worker process starts"""
+    global _worker_validate
+    _worker_validate = item_validator.compile().validate
+
+
+def _validate_chunk(task: Tuple[int, list, Optional[int]]) -> List[ValidationIssue]:
+    """Validates one chunk of items in a worker, returning issues with absolute indices"""
+    start, items, max_errors = task
+    issues: List[ValidationIssue] = []
+    for offset, item in enumerate(items):
+        remaining = None if max_errors is None else max_errors - len(issues)
+        result = _worker_validate(item, max_errors=remaining)
+        if not result.is_valid:
+            issues.extend(issue._prefixed(start + offset) for issue in result._issues)
+            if _limit_reached(issues, max_errors):
+                break
+    return issues
+
+
+def _merge_patch(target: Any, patch: Any) -> Any:
+    """Applies a JSON Merge Patch (RFC 7386) without modifying the target"""
+    if not isinstance(patch, dict):
+        return patch
+    merged = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            merged.pop(key, None)
+        else:
+            merged[key] = _merge_patch(merged.get(key), value)
+    return merged
 
 
 class ObjectValidator(BaseValidator):
@@ -215,25 +1682,1081 @@ class ObjectValidator(BaseValidator):
     def __init__(self, schema: Dict[str, BaseValidator]):
         super().__init__()
         self.schema = schema
+        self._strict = False
+        self._strip_unknown = False
+    
+    def __setattr__(self, name: str, value: Any):
+        super().__setattr__(name, value)
+        if name == "schema":
+            # A live view, so unknown keys are found with a single set operation per
+            # record and fields added to the schema in place are known at once
+            super().__setattr__("_keys", value.keys())
+    
+    def __getstate__(self):
+        # Keys views cannot be pickled; __setstate__ recreates the view
+        state = super().__getstate__()
+        state.pop("_keys", None)
+        return state
     
-    def _validate_value(self, value: Any) -> ValidationResult:
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        object.__setattr__(self, "_keys", self.schema.keys())
+    
+    def _freeze_state(self):
+        self.schema = _FrozenDict(self.schema)
+    
+    def _signature(self) -> tuple:
+        return super()._signature() + (tuple(self.schema.items()), self._strict, self._strip_unknown)
+    
+    def strict(self):
+        """
+        Reports fields that are not in the schema as 'unknown' issues.
+        
+        Fields added to the schema dict later count as known immediately;
+        a compiled validator keeps the fields it was compiled with.
+        """
+        self._strict = True
+        self._strip_unknown = False
+        return self
+    
+    def strip_unknown(self):
+        """Accepts fields that are not in the schema and removes them in parse()"""
+        self._strip_unknown = True
+        self._strict = False
+        return self
+    
+    def _validate_value(self, value: Any, max_errors: Optional[int] = None) -> ValidationResult:
         """Validates that value is a dict and all fields are valid"""
-        errors = []
+        # The error list is only created once something fails
+        errors: Optional[List[ValidationIssue]] = None
         
         if not isinstance(value, dict):
-            error_msg = self._custom_message or f"Expected dict, got {type(value).__name__}"
-            return ValidationResult(False, [error_msg])
+            return self._type_error(value, "dict")
         
         # Check each field in the schema
         for field_name, field_validator in self.schema.items():
             field_value = value.get(field_name)
-            result = field_validator.validate(field_value)
+            remaining = None if max_errors is None else max_errors - len(errors or ())
+            result = field_validator.validate(field_value, max_errors=remaining)
             
             if not result.is_valid:
-                for error in result.errors:
-                    errors.append(f"Field '{field_name}': {error}")
+                errors = errors or []
+                errors.extend([issue._prefixed(field_name) for issue in result._issues])
+                if _limit_reached(errors, max_errors):
+                    return ValidationResult._failure(errors)
+        
+        # Records without unknown keys pass this subset check without building a set
+        if self._strict and not value.keys() <= self._keys:
+            errors = errors or []
+            errors.extend(self._unknown_issues(value))
+            if max_errors is not None:
+                errors = errors[:max_errors]
+        
+        return ValidationResult._failure(errors) if errors else _VALID
+    
+    def _unknown_issues(self, value: dict) -> List[ValidationIssue]:
+        """Returns an 'unknown' issue for each key of value missing from the schema"""
+        keys = self._keys
+        return [ValidationIssue("unknown", path=(key,)) for key in value if key not in keys]
+    
+    def _strips(self, seen: Optional[set] = None) -> bool:
+        """Checks whether this object or a nested one removes unknown fields"""
+        return self._strip_unknown or super()._strips(seen)
+    
+    def _strip(self, value: Any) -> Any:
+        """Returns a copy of value without unknown fields, stripping nested values too"""
+        if not isinstance(value, dict):
+            return value
+        schema = self.schema
+        stripped = {}
+        for key, item in value.items():
+            field_validator = schema.get(key)
+            if field_validator is not None:
+                stripped[key] = field_validator._strip(item)
+            elif not self._strip_unknown:
+                stripped[key] = item
+        return stripped
+    
+    def _strip_steps(self, value: Any) -> Iterator[Tuple[BaseValidator, Any]]:
+        if not isinstance(value, dict):
+            return value
+        schema = self.schema
+        stripped = {}
+        for key, item in value.items():
+            field_validator = schema.get(key)
+            if field_validator is None:
+                if not self._strip_unknown:
+                    stripped[key] = item
+            elif type(field_validator)._strip_steps is BaseValidator._strip_steps:
+                stripped[key] = item
+            else:
+                stripped[key] = yield field_validator, item
+        return stripped
+    
+    def _children(self) -> List[Tuple[str, BaseValidator]]:
+        """Returns the field validators keyed by field name"""
+        return list(self.schema.items())
+    
+    def _scan_json(self, scanner: _JsonScanner, idx: int,
+                   max_errors: Optional[int]) -> Tuple[ValidationResult, int]:
+        """Validates referenced fields while walking a JSON object and skips the rest"""
+        if not scanner.text.startswith("{", idx):
+            return super()._scan_json(scanner, idx, max_errors)
+        
+        schema = self.schema
+        results: Dict[str, ValidationResult] = {}
+        unknown: List[ValidationIssue] = []
+        failed = 0
+        idx = scanner.whitespace(idx + 1)
+        more = not scanner.text.startswith("}", idx)
+        if not more:
+            idx += 1
+        while more:
+            key, idx = scanner.key(idx)
+            field_validator = schema.get(key)
+            if field_validator is None:
+                idx = scanner.skip(idx)
+                if self._strict:
+                    unknown.append(ValidationIssue("unknown", path=(key,)))
+                    failed += 1
+                    if max_errors is not None and failed >= max_errors:
+                        break
+            else:
+                remaining = None if max_errors is None else max_errors - failed
+                result, idx = field_validator._scan_json(scanner, idx, remaining)
+                previous = results.get(key)
+                # As with json.loads, the last of several duplicate keys wins
+                failed += len(result._issues) - (len(previous._issues) if previous is not None else 0)
+                results[key] = result
+                if _limit_reached(result._issues, remaining):
+                    break
+            more, idx = scanner.separator(idx, "}")
+        else:
+            # Fields that were not present validate as None
+            for field_name, field_validator in schema.items():
+                if field_name not in results:
+                    remaining = None if max_errors is None else max_errors - failed
+                    if remaining is not None and remaining < 1:
+                        break
+                    result = results[field_name] = field_validator.validate(None, max_errors=remaining)
+                    failed += len(result._issues)
+        
+        if not failed:
+            return _VALID, idx
+        errors = [issue._prefixed(field_name)
+                  for field_name in schema if field_name in results
+                  for issue in results[field_name]._issues]
+        errors.extend(unknown)
+        return ValidationResult._failure(errors[:max_errors] if max_errors is not None else errors), idx
+    
+    def _collect_async(self, value: Any, path: tuple, pending: List[_AsyncCheck], active: set):
+        """Adds the object's own async checks, then those of every field"""
+        super()._collect_async(value, path, pending, active)
+        if not isinstance(value, dict):
+            return None
+        return [(field_validator, value.get(field_name), path + (field_name,))
+                for field_name, field_validator in self.schema.items() if id(field_validator) in active]
+    
+    def validate_patch(self, old_valid_doc: Any, changes: Any, fail_fast: bool = False,
+                       max_errors: Optional[int] = None) -> ValidationResult:
+        """
+        Validates a partial update to a document that is already known to be valid.
+        
+        `changes` follows JSON Merge Patch (RFC 7386): a None value removes the
+        field and a nested dict is merged into the existing nested object. Only
+        the touched fields are re-validated; fields of nested objects are
+        patched recursively, so the cost is proportional to the size of the
+        change. Issues are reported in the order of `changes`.
+        """
+        if fail_fast:
+            max_errors = 1
+        elif max_errors is not None and max_errors < 1:
+            raise ValueError("max_errors must be at least 1")
+        
+        if not isinstance(changes, dict) or not isinstance(old_valid_doc, dict):
+            return self.validate(_merge_patch(old_valid_doc, changes), max_errors=max_errors)
+        return self._validate_patch(old_valid_doc, changes, max_errors)
+    
+    def _validate_patch(self, old_valid_doc: dict, changes: dict,
+                        max_errors: Optional[int]) -> ValidationResult:
+        """Re-validates the fields touched by a merge patch"""
+        errors: Optional[List[ValidationIssue]] = None
+        schema = self.schema
         
-        return ValidationResult(len(errors) == 0, errors)
+        for field_name, change in changes.items():
+            field_validator = schema.get(field_name)
+            if field_validator is None:
+                # Adding an unknown field is an error in strict mode; removing one is fine
+                if self._strict and change is not None:
+                    errors = errors or []
+                    errors.append(ValidationIssue("unknown", path=(field_name,)))
+                    if _limit_reached(errors, max_errors):
+                        break
+                continue
+            remaining = None if max_errors is None else max_errors - len(errors or ())
+            old_value = old_valid_doc.get(field_name)
+            if (isinstance(change, dict) and isinstance(old_value, dict)
+                    and isinstance(field_validator, ObjectValidator)):
+                result = field_validator._validate_patch(old_value, change, remaining)
+            else:
+                result = field_validator.validate(_merge_patch(old_value, change), max_errors=remaining)
+            
+            if not result.is_valid:
+                errors = errors or []
+                errors.extend([issue._prefixed(field_name) for issue in result._issues])
+                if _limit_reached(errors, max_errors):
+                    break
+        
+        return ValidationResult._failure(errors) if errors else _VALID
+    
+    def _emit_value(self, compiler: "_SchemaCompiler", var: str, prefix: tuple, indent: int):
+        """Emits the dict check followed by each field's inlined checks"""
+        compiler.emit_type_check(indent, var, prefix, "dict", "dict", self._custom_message)
+        if not self.schema and not self._strict:
+            return
+        compiler.emit(indent, "else:")
+        for field_name, field_validator in self.schema.items():
+            field = compiler.name("v")
+            compiler.emit(indent + 1, f"{field} = {var}.get({compiler.const(field_name)})")
+            compiler.emit_child(field_validator, field, prefix + (field_name,), indent + 1)
+        if self._strict:
+            keys = compiler.const(frozenset(self._keys))
+            key = compiler.name("k")
+            compiler.emit(indent + 1, f"if not {var}.keys() <= {keys}:")
+            compiler.emit(indent + 2, f"for {key} in {var}:")
+            compiler.emit(indent + 3, f"if {key} not in {keys}:")
+            compiler.fail(indent + 4, prefix + (compiler.dynamic(key),), "unknown")
+
+
+class UnionValidator(BaseValidator):
+    """Validator for values that must match at least one of several validators"""
+    
+    def __init__(self, validators: Sequence[BaseValidator]):
+        super().__init__()
+        if not validators:
+            raise ValueError("A union needs at least one validator")
+        self.validators = list(validators)
+    
+    def _freeze_state(self):
+        self.validators = tuple(self.validators)
+    
+    def _signature(self) -> tuple:
+        return super()._signature() + (tuple(self.validators),)
+    
+    def _validate_value(self, value: Any, max_errors: Optional[int] = None) -> ValidationResult:
+        """Validates that value matches one of the validators, trying them in order"""
+        # Each branch only needs to be checked up to its first error to rule it out
+        candidates = []
+        for validator in self.validators:
+            result = validator.validate(value, fail_fast=True)
+            if result.is_valid:
+                return _VALID
+            issue = result._issues[0]
+            if not (issue._code == "type" and issue._path is None):
+                candidates.append(validator)
+        
+        # When the value has the right type for only one branch, its errors are the useful ones
+        if len(candidates) == 1 and self._custom_message is None:
+            return candidates[0].validate(value, max_errors=max_errors)
+        return ValidationResult._failure((ValidationIssue("union", message=self._custom_message),))
+    
+    def _children(self) -> List[Tuple[str, BaseValidator]]:
+        """Returns the alternatives as "<0>", "<1>", ..."""
+        return [(f"<{i}>", validator) for i, validator in enumerate(self.validators)]
+    
+    def _strip(self, value: Any) -> Any:
+        """Strips the value with the first branch it matches"""
+        for validator in self.validators:
+            if validator.validate(value, fail_fast=True).is_valid:
+                return validator._strip(value)
+        return value
+    
+    def _strip_steps(self, value: Any) -> Iterator[Tuple[BaseValidator, Any]]:
+        for validator in self.validators:
+            if validator.validate(value, fail_fast=True).is_valid:
+                return (yield validator, value)
+        return value
+    
+    def _collect_async(self, value: Any, path: tuple, pending: List[_AsyncCheck], active: set):
+        """Adds the union's own async checks, then those of the matching branch"""
+        super()._collect_async(value, path, pending, active)
+        for validator in self.validators:
+            if validator.validate(value, fail_fast=True).is_valid:
+                return [(validator, value, path)] if id(validator) in active else None
+        return None
+
+
+class DiscriminatedUnionValidator(BaseValidator):
+    """
+    Validator for objects whose tag field selects the validator to apply.
+    
+    The branch is found with one dict lookup on the tag value, so the cost
+    does not grow with the number of branches.
+    """
+    
+    def __init__(self, tag_field: str, branches: Dict[Any, BaseValidator]):
+        super().__init__()
+        if not branches:
+            raise ValueError("A discriminated union needs at least one branch")
+        self.tag_field = tag_field
+        self.branches = dict(branches)
+    
+    def _freeze_state(self):
+        self.branches = _FrozenDict(self.branches)
+    
+    def _signature(self) -> tuple:
+        return super()._signature() + (self.tag_field, tuple(self.branches.items()))
+    
+    def _branch(self, value: dict) -> Tuple[Optional[BaseValidator], Optional[ValidationIssue]]:
+        """Looks up the branch for the tag of value; returns it or the issue explaining why not"""
+        tag = value.get(self.tag_field)
+        if tag is None:
+            return None, ValidationIssue("required", path=(self.tag_field,), message=self._custom_message)
+        try:
+            branch = self.branches.get(tag)
+        except TypeError:  # unhashable tag such as a list
+            branch = None
+        if branch is None:
+            params = {"tag": tag, "allowed": list(self.branches)}
+            return None, ValidationIssue("tag", params, (self.tag_field,), self._custom_message)
+        return branch, None
+    
+    def _validate_value(self, value: Any, max_errors: Optional[int] = None) -> ValidationResult:
+        """Validates value with the branch selected by its tag field"""
+        if not isinstance(value, dict):
+            return self._type_error(value, "dict")
+        branch, issue = self._branch(value)
+        if branch is None:
+            return ValidationResult._failure((issue,))
+        return branch.validate(value, max_errors=max_errors)
+    
+    def _children(self) -> List[Tuple[str, BaseValidator]]:
+        """Returns the branches as "<tag>" """
+        return [(f"<{tag}>", branch) for tag, branch in self.branches.items()]
+    
+    def _strip(self, value: Any) -> Any:
+        """Strips the value with the branch selected by its tag"""
+        if isinstance(value, dict):
+            branch, _ = self._branch(value)
+            if branch is not None:
+                return branch._strip(value)
+        return value
+    
+    def _strip_steps(self, value: Any) -> Iterator[Tuple[BaseValidator, Any]]:
+        if isinstance(value, dict):
+            branch, _ = self._branch(value)
+            if branch is not None:
+                return (yield branch, value)
+        return value
+    
+    def _collect_async(self, value: Any, path: tuple, pending: List[_AsyncCheck], active: set):
+        """Adds the union's own async checks, then those of the selected branch"""
+        super()._collect_async(value, path, pending, active)
+        if isinstance(value, dict):
+            branch, _ = self._branch(value)
+            if branch is not None and id(branch) in active:
+                return [(branch, value, path)]
+        return None
+    
+    def _emit_value(self, compiler: "_SchemaCompiler", var: str, prefix: tuple, indent: int):
+        """Emits a dict dispatch to separately compiled branch functions"""
+        functions = compiler.const({tag: branch.compile() for tag, branch in self.branches.items()})
+        tag_prefix = prefix + (self.tag_field,)
+        tag, func = compiler.name("t"), compiler.name("f")
+        compiler.emit_type_check(indent, var, prefix, "dict", "dict", self._custom_message)
+        compiler.emit(indent, "else:")
+        compiler.emit(indent + 1, f"{tag} = {var}.get({compiler.const(self.tag_field)})")
+        compiler.emit(indent + 1, f"if {tag} is None:")
+        compiler.fail(indent + 2, tag_prefix, "required", message=self._custom_message)
+        compiler.emit(indent + 1, "else:")
+        compiler.emit(indent + 2, "try:")
+        compiler.emit(indent + 3, f"{func} = {functions}.get({tag})")
+        compiler.emit(indent + 2, "except TypeError:")
+        compiler.emit(indent + 3, f"{func} = None")
+        compiler.emit(indent + 2, f"if {func} is None:")
+        params = {"tag": compiler.dynamic(tag), "allowed": compiler.dynamic(f"list({functions})")}
+        compiler.fail(indent + 3, tag_prefix, "tag", params, self._custom_message)
+        compiler.emit(indent + 2, "else:")
+        compiler.emit_delegate(indent + 3, var, prefix, f"{func}.validate")
+
+
+class TableValidator(BaseValidator):
+    """
+    Validator for columnar tables: a dict mapping column names to equal-length lists.
+    
+    Each column is checked in one pass with its validator's validate_many(),
+    which is vectorized for NumPy-compatible number and string columns.
+    Failures are reported with (row, column) paths in row-major order, as if
+    the rows had been validated one by one.
+    """
+    
+    def __init__(self, columns: Dict[str, BaseValidator]):
+        super().__init__()
+        self.columns = columns
+    
+    def _freeze_state(self):
+        self.columns = _FrozenDict(self.columns)
+    
+    def _signature(self) -> tuple:
+        return super()._signature() + (tuple(self.columns.items()),)
+    
+    def _validate_value(self, value: Any, max_errors: Optional[int] = None) -> ValidationResult:
+        """Validates that value is a dict of equal-length columns whose cells are valid"""
+        if not isinstance(value, dict):
+            return self._type_error(value, "dict")
+        
+        # Column-level problems come first: a missing, non-list or ragged column
+        errors: List[ValidationIssue] = []
+        batches = []
+        rows = None
+        for column_name, column_validator in self.columns.items():
+            column = value.get(column_name)
+            if column is None:
+                if not column_validator._optional:
+                    errors.append(ValidationIssue("required", path=(column_name,)))
+                continue
+            if not isinstance(column, (list, tuple) + _NUMERIC_BUFFER_TYPES) or getattr(column, "ndim", 1) != 1:
+                params = {"expected": "list", "actual": type(column).__name__}
+                errors.append(ValidationIssue("type", params, (column_name,)))
+                continue
+            if rows is None:
+                rows = len(column)
+            elif len(column) != rows:
+                errors.append(ValidationIssue("rows", {"actual": len(column), "expected": rows}, (column_name,)))
+                continue
+            batches.append((column_name, column_validator, column, column_validator.validate_many(column)))
+        if _limit_reached(errors, max_errors):
+            return ValidationResult._failure(errors[:max_errors])
+        
+        # Failed cells sorted by row, then by column order
+        failed = sorted(
+            (row, order)
+            for order, (_, _, _, batch) in enumerate(batches) if batch.invalid_count
+            for row in batch.invalid_indices()
+        )
+        budget = None if max_errors is None else max_errors - len(errors)
+        for row, order in failed:
+            column_name, column_validator, column, _ = batches[order]
+            result = column_validator.validate(_python_scalar(column[row]), max_errors=budget)
+            errors.extend([issue._with_prefix((row, column_name)) for issue in result._issues])
+            if budget is not None:
+                budget = max_errors - len(errors)
+                if budget < 1:
+                    break
+        
+        return ValidationResult._failure(errors) if errors else _VALID
+    
+    def _children(self) -> List[Tuple[str, BaseValidator]]:
+        """Returns the column validators keyed by column name"""
+        return list(self.columns.items())
+    
+    def _collect_async(self, value: Any, path: tuple, pending: List[_AsyncCheck], active: set):
+        """Adds the table's own async checks, then those of every cell"""
+        super()._collect_async(value, path, pending, active)
+        if not isinstance(value, dict):
+            return None
+        nested = []
+        for column_name, column_validator in self.columns.items():
+            column = value.get(column_name)
+            if id(column_validator) in active and column is not None:
+                nested.extend((column_validator, cell, path + (row, column_name))
+                              for row, cell in enumerate(_python_items(column)))
+        return nested
+
+
+# Stack entry that reports the unknown keys of a strict object once its fields are done
+_UNKNOWN_KEYS = object()
+
+
+class _LazyNesting(threading.local):
+    """Per-thread (depth, depth limit) of the Schema.lazy() references being validated"""
+    levels = (0, sys.maxsize)
+
+
+_lazy_nesting = _LazyNesting()
+
+
+class LazyValidator(BaseValidator):
+    """
+    Reference to a validator built on first use, for recursive schemas.
+    
+    The factory is called once, when the reference is first validated (or
+    frozen, saved or compiled), so it can name a schema defined after it.
+    Every pass through a reference counts as one level of nesting; values
+    nested more than max_depth() levels deep get a 'depth' issue. The first
+    levels are validated with ordinary calls, deeper ones with an explicit
+    stack so that nesting is not bounded by Python's recursion limit.
+    """
+    
+    # Levels of nesting allowed below a reference by default
+    DEFAULT_MAX_DEPTH = 1000
+    
+    # Levels validated with ordinary recursive calls before switching to the stack
+    RECURSIVE_LEVELS = 32
+    
+    def __init__(self, factory: Callable[[], BaseValidator]):
+        super().__init__()
+        self._factory = factory
+        self._target: Optional[BaseValidator] = None
+        self._max_depth = self.DEFAULT_MAX_DEPTH
+    
+    def max_depth(self, depth: int):
+        """Sets how many times values may nest through this reference"""
+        if depth < 1:
+            raise ValueError("max_depth must be at least 1")
+        self._max_depth = depth
+        return self
+    
+    def _resolve(self) -> BaseValidator:
+        """Returns the referenced validator, calling the factory on first use"""
+        target = self._target
+        if target is None:
+            target = self._factory()
+            if not isinstance(target, BaseValidator):
+                raise TypeError(f"Schema.lazy() factory returned {type(target).__name__}, expected a validator")
+            # Resolving is not reconfiguration: it is allowed when frozen and keeps caches
+            object.__setattr__(self, "_target", target)
+        return target
+    
+    def _freeze_state(self):
+        self._resolve()
+    
+    def _signature(self) -> tuple:
+        # The target is compared by identity; comparing it structurally would never end
+        return super()._signature() + (id(self._resolve()), self._max_depth)
+    
+    def __getstate__(self):
+        # Factories are usually lambdas, which cannot be pickled; the target can
+        self._resolve()
+        state = super().__getstate__()
+        state["_factory"] = None
+        return state
+    
+    def _validate_value(self, value: Any, max_errors: Optional[int] = None) -> ValidationResult:
+        """Validates the value against the target, one level deeper"""
+        state = _lazy_nesting
+        outer = state.levels
+        depth, limit = outer
+        if depth + self._max_depth < limit:
+            limit = depth + self._max_depth
+        if depth >= limit:
+            return ValidationResult._failure((ValidationIssue("depth", {"limit": self._max_depth}),))
+        if depth >= self.RECURSIVE_LEVELS:
+            return self._validate_iteratively(value, max_errors, depth, limit)
+        
+        state.levels = (depth + 1, limit)
+        try:
+            return (self._target or self._resolve()).validate(value, max_errors=max_errors)
+        finally:
+            state.levels = outer
+    
+    def _validate_iteratively(self, value: Any, max_errors: Optional[int], depth: int,
+                              limit: int) -> ValidationResult:
+        """
+        Validates the value against the target without recursive calls.
+        
+        Objects, arrays, discriminated unions and nested references are
+        expanded on a stack of generators; other validators, including plain
+        unions, are called as usual, straight from the generator of their
+        parent. Issues come out in the same order as recursive validation
+        would report them.
+        """
+        errors: List[ValidationIssue] = []
+        budget = sys.maxsize if max_errors is None else max_errors
+        state = _lazy_nesting
+        outer = state.levels
+        
+        def add(issues: Iterable[ValidationIssue], path: Optional[tuple]):
+            # Paths are built innermost key first while descending
+            for issue in issues:
+                node = path
+                while node is not None:
+                    key, node = node
+                    issue = issue._prefixed(key)
+                errors.append(issue)
+        
+        def fields(schema: Dict[str, BaseValidator], record: dict, path: Optional[tuple],
+                   depth: int, limit: int) -> Iterator[tuple]:
+            for field_name, field_validator in schema.items():
+                field_value = record.get(field_name)
+                if field_value is not None and type(field_validator) in _EXPANDED_TYPES:
+                    yield field_validator, field_value, (field_name, path), depth, limit
+                    continue
+                # References reached through other validators carry on counting from here
+                state.levels = (depth, limit)
+                result = field_validator.validate(field_value, max_errors=budget - len(errors))
+                if not result.is_valid:
+                    add(result._issues, (field_name, path))
+                    if len(errors) >= budget:
+                        return
+        
+        def items(item_validator: BaseValidator, array: list, path: Optional[tuple],
+                  depth: int, limit: int) -> Iterator[tuple]:
+            if type(item_validator) in _EXPANDED_TYPES:
+                for i, item in enumerate(array):
+                    yield item_validator, item, (i, path), depth, limit
+                return
+            item_validate = item_validator.validate
+            for i, item in enumerate(array):
+                state.levels = (depth, limit)
+                result = item_validate(item, max_errors=budget - len(errors))
+                if not result.is_valid:
+                    add(result._issues, (i, path))
+                    if len(errors) >= budget:
+                        return
+        
+        # Entries: (validator, value, reversed path, reference depth, depth limit)
+        stack = [iter(((self, value, None, depth, limit),))]
+        try:
+            while stack:
+                for validator, item, path, depth, limit in stack[-1]:
+                    if validator is _UNKNOWN_KEYS:
+                        add(item[0]._unknown_issues(item[1]), path)
+                    elif item is None:
+                        if not validator._optional:
+                            add((ValidationIssue("required", message=validator._custom_message),), path)
+                    else:
+                        # References and tagged unions are followed to the validator that applies
+                        kind = type(validator)
+                        while kind is LazyValidator or (kind is DiscriminatedUnionValidator and isinstance(item, dict)):
+                            if kind is LazyValidator:
+                                limit = min(limit, depth + validator._max_depth)
+                                if depth >= limit:
+                                    add((ValidationIssue("depth", {"limit": validator._max_depth}),), path)
+                                    validator = None
+                                    break
+                                depth += 1
+                                validator = validator._resolve()
+                            else:
+                                validator, issue = validator._branch(item)
+                                if validator is None:
+                                    add((issue,), path)
+                            kind = type(validator)
+                        
+                        if validator is None:
+                            pass
+                        elif kind is ObjectValidator and isinstance(item, dict):
+                            entries = fields(validator.schema, item, path, depth, limit)
+                            if validator._strict and not item.keys() <= validator._keys:
+                                entries = chain(entries, ((_UNKNOWN_KEYS, (validator, item), path, depth, limit),))
+                            stack.append(entries)
+                            break
+                        elif kind is ArrayValidator and isinstance(item, list):
+                            add(validator._length_issues(len(item)) or (), path)
+                            stack.append(items(validator.item_validator, item, path, depth, limit))
+                            break
+                        else:
+                            state.levels = (depth, limit)
+                            result = validator.validate(item, max_errors=budget - len(errors))
+                            if not result.is_valid:
+                                add(result._issues, path)
+                    
+                    if len(errors) >= budget:
+                        return ValidationResult._failure(errors[:budget])
+                else:
+                    stack.pop()
+                if len(errors) >= budget:
+                    return ValidationResult._failure(errors[:budget])
+        finally:
+            state.levels = outer
+        
+        return ValidationResult._failure(errors) if errors else _VALID
+    
+    def _children(self) -> List[Tuple[str, BaseValidator]]:
+        """Returns the target under the reference's own path"""
+        return [("", self._resolve())]
+    
+    def _strips(self, seen: Optional[set] = None) -> bool:
+        """Checks the target once; a reference met again inside it adds nothing"""
+        seen = set() if seen is None else seen
+        if id(self) in seen:
+            return False
+        seen.add(id(self))
+        return self._resolve()._strips(seen)
+    
+    def _strip(self, value: Any) -> Any:
+        """Strips the value with the target, without recursion beyond RECURSIVE_LEVELS"""
+        state = _lazy_nesting
+        outer = state.levels
+        depth, limit = outer
+        if depth >= self.RECURSIVE_LEVELS:
+            return self._strip_iteratively(value)
+        state.levels = (depth + 1, limit)
+        try:
+            return self._resolve()._strip(value)
+        finally:
+            state.levels = outer
+    
+    def _strip_steps(self, value: Any) -> Iterator[Tuple[BaseValidator, Any]]:
+        return (yield self._resolve(), value)
+    
+    def _collect_async(self, value: Any, path: tuple, pending: List[_AsyncCheck], active: set):
+        """Adds the reference's own async checks, then those of the target"""
+        super()._collect_async(value, path, pending, active)
+        target = self._resolve()
+        return [(target, value, path)] if id(target) in active else None
+
+
+# Validators that LazyValidator expands on its stack instead of calling
+_EXPANDED_TYPES = frozenset({ObjectValidator, ArrayValidator, LazyValidator, DiscriminatedUnionValidator})
+
+
+class _ErrorLimitReached(Exception):
+    """Raised inside compiled validators once the error budget is used up"""
+
+
+class _Dynamic(str):
+    """Marks a path key as a Python expression (e.g. a loop index) rather than a literal"""
+
+
+def _compiled_namespace() -> Dict[str, Any]:
+    """Returns the globals every generated validation function starts with"""
+    return {
+        "ValidationResult": ValidationResult,
+        "_VALID": _VALID,
+        "_ErrorLimitReached": _ErrorLimitReached,
+        "_make_issue": _make_issue,
+    }
+
+
+class _SchemaCompiler:
+    """
+    Generates the source of one flat validation function for a validator tree.
+    
+    Emitters receive the path of the value being checked as a tuple of keys;
+    static field names are literals and array indices are _Dynamic loop
+    variables, so issues are created with their full path in one step.
+    """
+    
+    # Nesting deeper than this is compiled into separate functions so the
+    # generated code stays within Python's indentation and block limits
+    MAX_INLINE_DEPTH = 15
+    
+    def __init__(self):
+        self.lines: List[str] = []
+        self.namespace: Dict[str, Any] = _compiled_namespace()
+        self._consts: Dict[int, str] = {}
+        self._counter = 0
+        self._depth = 0
+    
+    def compile(self, validator: BaseValidator) -> "CompiledValidator":
+        """Generates, compiles and returns the validation function"""
+        self.emit(0, "def validate(value, fail_fast=False, max_errors=None):")
+        self.emit(1, "if fail_fast:")
+        self.emit(2, "limit = 1")
+        self.emit(1, "elif max_errors is None:")
+        self.emit(2, f"limit = {self.const(sys.maxsize)}")
+        self.emit(1, "elif max_errors < 1:")
+        self.emit(2, "raise ValueError('max_errors must be at least 1')")
+        self.emit(1, "else:")
+        self.emit(2, "limit = max_errors")
+        self.emit(1, "errors = []")
+        self.emit(1, "try:")
+        validator._emit(self, "value", (), 2)
+        self.emit(1, "except _ErrorLimitReached:")
+        self.emit(2, "pass")
+        self.emit(1, "if errors:")
+        self.emit(2, "return ValidationResult._failure(errors)")
+        self.emit(1, "return _VALID")
+        source = "\n".join(self.lines) + "\n"
+        code = compile(source, "<compiled schema>", "exec")
+        exec(code, self.namespace)
+        constants = {name: self.namespace[name] for name in self._consts.values()}
+        strip = validator._strip if validator._strips() else None
+        return CompiledValidator(self.namespace["validate"], source, code, constants, strip)
+    
+    def name(self, prefix: str) -> str:
+        """Returns a fresh local variable name"""
+        self._counter += 1
+        return f"{prefix}{self._counter}"
+    
+    def const(self, obj: Any) -> str:
+        """Binds an object into the generated function's globals and returns its name"""
+        key = id(obj)
+        if key not in self._consts:
+            name = f"_c{len(self._consts)}"
+            self._consts[key] = name
+            self.namespace[name] = obj
+        return self._consts[key]
+    
+    @staticmethod
+    def dynamic(expr: str) -> _Dynamic:
+        """Wraps an expression so it is evaluated at runtime as a path key"""
+        return _Dynamic(expr)
+    
+    def emit(self, indent: int, line: str):
+        """Appends a line of generated code"""
+        self.lines.append("    " * indent + line)
+    
+    def key(self, key: Union[str, int]) -> str:
+        """Renders a path key as an expression"""
+        return key if isinstance(key, _Dynamic) else self.const(key)
+    
+    def path(self, prefix: tuple) -> str:
+        """Renders an expression for the linked path, pre-building its static tail"""
+        chain = None
+        expr = None
+        for key in reversed(prefix):
+            if expr is None and not isinstance(key, _Dynamic):
+                chain = (key, chain)
+                continue
+            if expr is None:
+                expr = self.const(chain) if chain is not None else "None"
+            expr = f"({self.key(key)}, {expr})"
+        if expr is not None:
+            return expr
+        return self.const(chain) if chain is not None else "None"
+    
+    def append(self, indent: int, issue: str):
+        """Emits code recording an issue and stopping once the budget is used up"""
+        self.emit(indent, f"errors.append({issue})")
+        self.emit(indent, "if len(errors) >= limit:")
+        self.emit(indent + 1, "raise _ErrorLimitReached")
+    
+    def fail(self, indent: int, prefix: tuple, code: str, params: Optional[Dict[str, Any]] = None,
+             message: Optional[str] = None):
+        """Emits code recording an issue with the given code and parameters"""
+        if params:
+            items = ", ".join(f"{key!r}: {self.key(value)}" for key, value in params.items())
+            params_expr = "{" + items + "}"
+        else:
+            params_expr = "None"
+        message_expr = self.const(message) if message is not None else "None"
+        self.append(indent, f"_make_issue({self.const(code)}, {params_expr}, {self.path(prefix)}, {message_expr})")
+    
+    def emit_type_check(self, indent: int, var: str, prefix: tuple, types: str,
+                        expected: str, custom_message: Optional[str]):
+        """Emits an isinstance check that records the standard type error"""
+        self.emit(indent, f"if not isinstance({var}, {types}):")
+        params = {"expected": expected, "actual": self.dynamic(f"type({var}).__name__")}
+        self.fail(indent + 1, prefix, "type", params, custom_message)
+    
+    def emit_child(self, validator: BaseValidator, var: str, prefix: tuple, indent: int):
+        """Inlines a nested validator, or calls a separately compiled one when too deep"""
+        if self._depth >= self.MAX_INLINE_DEPTH:
+            func = f"{self.const(validator.compile())}.validate"
+            self.emit_delegate(indent, var, prefix, func)
+            return
+        self._depth += 1
+        try:
+            validator._emit(self, var, prefix, indent)
+        finally:
+            self._depth -= 1
+    
+    def emit_delegate(self, indent: int, var: str, prefix: tuple, func: str):
+        """Emits a call to a validation function whose errors get prefixed"""
+        issue = self.name("e")
+        self.emit(indent, f"for {issue} in {func}({var}, max_errors=limit - len(errors))._issues:")
+        if prefix:
+            keys = ", ".join(self.key(key) for key in prefix)
+            self.append(indent + 1, f"{issue}._with_prefix(({keys},))")
+        else:
+            self.append(indent + 1, issue)
+
+
+@functools.lru_cache(maxsize=128)
+def _compile_frozen(validator: BaseValidator) -> "CompiledValidator":
+    """Compiles frozen validators once; equal frozen trees share the result"""
+    return _SchemaCompiler().compile(validator)
+
+
+class CompiledValidator:
+    """
+    A validator tree compiled into one specialized function.
+    
+    Pickling keeps the generated bytecode and the objects it refers to, so
+    loading a compiled validator does not generate or compile source again.
+    """
+    
+    def __init__(self, function: Callable[..., ValidationResult], source: str,
+                 code: Optional[Any] = None, constants: Optional[Dict[str, Any]] = None,
+                 strip: Optional[Callable[[Any], Any]] = None):
+        self.validate = function
+        self.source = source
+        self._code = code
+        self._constants = constants or {}
+        # Removes unknown fields in parse() when the schema uses strip_unknown()
+        self._strip = strip
+    
+    def save(self, target: Union[str, "os.PathLike[str]", IO]):
+        """Writes the compiled validator to a file that Schema.load() reads back"""
+        _write_artifact(self, target)
+    
+    def __reduce__(self):
+        if self._code is None:
+            raise TypeError("Only validators created by compile() can be pickled")
+        return (_load_compiled, (marshal.dumps(self._code), self._constants, self.source, self._strip))
+    
+    def __call__(self, value: Any, fail_fast: bool = False,
+                 max_errors: Optional[int] = None) -> ValidationResult:
+        """Allows the compiled validator to be called like a function"""
+        return self.validate(value, fail_fast, max_errors)
+    
+    def parse(self, value: Any) -> Any:
+        """Validates and returns the value if valid, raises ValidationError if not"""
+        result = self.validate(value)
+        if not result.is_valid:
+            raise ValidationError(result.errors, result.issues)
+        return self._strip(value) if self._strip is not None else value
+
+
+def _load_compiled(code: bytes, constants: Dict[str, Any], source: str,
+                   strip: Optional[Callable[[Any], Any]] = None) -> CompiledValidator:
+    """Rebuilds a pickled compiled validator from its bytecode"""
+    code = marshal.loads(code)
+    namespace = _compiled_namespace()
+    namespace.update(constants)
+    exec(code, namespace)
+    return CompiledValidator(namespace["validate"], source, code, constants, strip)
+
+
+# Artifacts start with this line, followed by a JSON header line and the payload
+_ARTIFACT_MAGIC = b"VALIDATOR-SCHEMA\n"
+_ARTIFACT_FORMAT = 1
+
+
+@functools.lru_cache(maxsize=None)
+def _library_fingerprint() -> str:
+    """Hashes this module's source so artifacts from other library versions are rejected"""
+    with open(__file__, "rb") as file:
+        return hashlib.sha256(file.read()).hexdigest()
+
+
+def _write_artifact(obj: Any, target: Union[str, "os.PathLike[str]", IO]):
+    """Writes a validator or compiled validator as a versioned, checksummed artifact"""
+    if not hasattr(target, "write"):
+        with open(target, "wb") as file:
+            _write_artifact(obj, file)
+        return
+    payload = zlib.compress(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL))
+    header = {
+        "format": _ARTIFACT_FORMAT,
+        "python": sys.implementation.cache_tag,
+        "library": _library_fingerprint(),
+        "sha256": hashlib.sha256(payload).hexdigest(),
+    }
+    target.write(_ARTIFACT_MAGIC)
+    target.write(json.dumps(header).encode() + b"\n")
+    target.write(payload)
+
+
+def _read_artifact(source: Union[str, "os.PathLike[str]", IO]) -> Any:
+    """Reads an artifact written by _write_artifact(), checking its header and checksum"""
+    if not hasattr(source, "read"):
+        with open(source, "rb") as file:
+            return _read_artifact(file)
+    if source.readline() != _ARTIFACT_MAGIC:
+        raise ValueError("Not a validator artifact")
+    try:
+        header = json.loads(source.readline())
+    except ValueError:
+        raise ValueError("Corrupt validator artifact header") from None
+    if header.get("format") != _ARTIFACT_FORMAT:
+        raise ValueError(f"Unsupported artifact format {header.get('format')!r}")
+    if header.get("python") != sys.implementation.cache_tag:
+        raise ValueError(f"Artifact was written by {header.get('python')}, not {sys.implementation.cache_tag}")
+    if header.get("library") != _library_fingerprint():
+        raise ValueError("Artifact was written by a different version of the validation library")
+    payload = source.read()
+    if hashlib.sha256(payload).hexdigest() != header.get("sha256"):
+        raise ValueError("Validator artifact checksum mismatch")
+    return pickle.loads(zlib.decompress(payload))
+
+
+class ValidationProfiler:
+    """
+    Records call counts, cumulative time and failure counts per schema path.
+    
+    Attaching wraps validate() on every validator of a tree, so validators
+    that are not attached run without any instrumentation overhead. Paths
+    look like "user.addresses[].zip", with union branches as "event<click>";
+    the root is reported as "<root>". Time
+    is inclusive of nested validators. A validator instance used at several
+    places in a tree is reported under the first path it was found at, and
+    compiled validators only see instrumentation of nodes they delegate to.
+    Objects and arrays below a Schema.lazy() reference are counted as part
+    of the reference, since it validates them without calling validate().
+    """
+    
+    ROOT = "<root>"
+    
+    def __init__(self):
+        # path -> [calls, failures, total seconds]
+        self._stats: Dict[str, List[Any]] = {}
+        self._attached: List[BaseValidator] = []
+    
+    def attach(self, validator: BaseValidator) -> "ValidationProfiler":
+        """Instruments every validator in the tree rooted at `validator`"""
+        stack = [("", validator)]
+        seen = {id(node) for node in self._attached}
+        while stack:
+            path, node = stack.pop()
+            if id(node) in seen:
+                continue
+            seen.add(id(node))
+            self._wrap(node, path or self.ROOT)
+            for suffix, child in reversed(node._children()):
+                if not path or not suffix or suffix[0] in "[<":
+                    stack.append((path + suffix, child))
+                else:
+                    stack.append((f"{path}.{suffix}", child))
+        return self
+    
+    def _wrap(self, validator: BaseValidator, path: str):
+        """Replaces the validator's validate() with a timing wrapper"""
+        original = type(validator).validate.__get__(validator)
+        stats = self._stats.setdefault(path, [0, 0, 0.0])
+        clock = time.perf_counter
+        
+        def validate(value: Any, fail_fast: bool = False, max_errors: Optional[int] = None) -> ValidationResult:
+            start = clock()
+            result = original(value, fail_fast, max_errors)
+            stats[2] += clock() - start
+            stats[0] += 1
+            if not result.is_valid:
+                stats[1] += 1
+            return result
+        
+        # Bypass BaseValidator.__setattr__ so attaching does not clear result caches
+        object.__setattr__(validator, "validate", validate)
+        self._attached.append(validator)
+    
+    def detach(self):
+        """Removes the instrumentation from every attached validator"""
+        for validator in self._attached:
+            validator.__dict__.pop("validate", None)
+        self._attached = []
+    
+    def reset(self):
+        """Zeroes the recorded statistics while staying attached"""
+        for stats in self._stats.values():
+            stats[:] = [0, 0, 0.0]
+    
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Returns the statistics per path"""
+        return {
+            path: {
+                "calls": calls,
+                "failures": failures,
+                "total_seconds": total,
+                "mean_seconds": total / calls if calls else 0.0,
+            }
+            for path, (calls, failures, total) in self._stats.items()
+        }
+    
+    def to_json(self, indent: Optional[int] = None) -> str:
+        """Returns the statistics per path as a JSON document"""
+        return json.dumps(self.to_dict(), indent=indent)
+    
+    def top(self, count: int = 10, key: str = "total_seconds") -> List[Tuple[str, Dict[str, Any]]]:
+        """Returns the `count` paths with the highest value of `key`"""
+        return sorted(self.to_dict().items(), key=lambda item: item[1][key], reverse=True)[:count]
+    
+    def __enter__(self) -> "ValidationProfiler":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.detach()
 
 
 class Schema:
@@ -262,4 +2785,40 @@ class Schema:
     @staticmethod
     def object(schema: Dict[str, BaseValidator]) -> ObjectValidator:
         """Creates an object validator with the specified schema"""
-        return ObjectValidator(schema) 
\ No newline at end of file
+        return ObjectValidator(schema)
+    
+    @staticmethod
+    def table(columns: Dict[str, BaseValidator]) -> TableValidator:
+        """Creates a validator for dict-of-lists tables with the specified column validators"""
+        return TableValidator(columns)
+    
+    @staticmethod
+    def union(*validators: BaseValidator) -> UnionValidator:
+        """Creates a validator accepting values that match any of the validators"""
+        return UnionValidator(validators)
+    
+    @staticmethod
+    def discriminated(tag_field: str, branches: Dict[Any, BaseValidator]) -> DiscriminatedUnionValidator:
+        """Creates a validator that picks the branch for an object by its tag field"""
+        return DiscriminatedUnionValidator(tag_field, branches)
+    
+    @staticmethod
+    def lazy(factory: Callable[[], BaseValidator]) -> LazyValidator:
+        """Creates a reference to the validator returned by factory, for recursive schemas"""
+        return LazyValidator(factory)
+    
+    @staticmethod
+    def load(source: Union[str, "os.PathLike[str]", IO]) -> Union[BaseValidator, CompiledValidator]:
+        """
+        Loads a validator or compiled validator written by save().
+        
+        Raises ValueError when the file was written by another library or
+        Python version, or is corrupt. Artifacts are pickles: only load
+        files from a trusted source.
+        """
+        return _read_artifact(source)
+    
+    @staticmethod
+    def compile(validator: BaseValidator) -> CompiledValidator:
+        """Compiles a finished validator tree into a single generated function"""
+        return validator.compile() 
\ No newline at end of file
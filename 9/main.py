@@ -5,8 +5,75 @@ Analyzes services and generates comprehensive markdown reports
 """
 
 import argparse
+import asyncio
+import os
+import re
 import sys
+from typing import Iterator, List, Optional
 from service_analyzer import ServiceAnalyzer
+from rate_limiter import RequestScheduler
+from report_cache import ReportCache
+
+
+def read_batch_file(path: str) -> List[str]:
+    """Read batch inputs: one per line, skipping blank lines and # comments."""
+    with open(path, encoding='utf-8') as f:
+        lines = (line.strip() for line in f)
+        return [line for line in lines if line and not line.startswith('#')]
+
+
+def report_filename(index: int, item: str) -> str:
+    """Build a unique, filesystem-safe report name for a batch input."""
+    slug = re.sub(r'[^a-z0-9]+', '-', item.lower()).strip('-')[:50].rstrip('-')
+    return f"{index + 1:04d}-{slug or 'report'}.md"
+
+
+def write_stream(chunks: Iterator[str], output: Optional[str] = None):
+    """Write report chunks to the output file, or the console, as they arrive."""
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            for chunk in chunks:
+                f.write(chunk)
+                f.flush()
+        print(f"Report saved to: {output}")
+    else:
+        for chunk in chunks:
+            sys.stdout.write(chunk)
+            sys.stdout.flush()
+        sys.stdout.write("\n")
+
+
+async def run_batch(analyzer: ServiceAnalyzer, inputs: List[str], output_dir: str,
+                    as_text: bool, concurrency: int) -> int:
+    """
+    Analyze every input concurrently, writing each report as soon as it is ready.
+    
+    Returns:
+        int: Number of inputs that failed
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    failures = 0
+    done = 0
+    try:
+        async for item in analyzer.analyze_batch(inputs, as_text=as_text, concurrency=concurrency):
+            done += 1
+            if item.error is not None:
+                failures += 1
+                print(f"[{done}/{len(inputs)}] Failed: {item.input}: {item.error}", file=sys.stderr)
+                continue
+            path = os.path.join(output_dir, report_filename(item.index, item.input))
+            try:
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(item.report)
+            except OSError as e:
+                # e.g. a full disk; the remaining reports may still fit
+                failures += 1
+                print(f"[{done}/{len(inputs)}] Failed to save {item.input}: {e}", file=sys.stderr)
+                continue
+            print(f"[{done}/{len(inputs)}] Report saved to: {path}")
+    finally:
+        await analyzer.aclose()
+    return failures
 
 
 def main():
@@ -20,6 +87,9 @@ def main():
                 python main.py --service "Notion"
                 python main.py --text "We are a cloud-based project management platform..."
                 python main.py --service "Discord" --output report.md
+                python main.py --service "Spotify" --refresh
+                python main.py --batch services.txt --output-dir reports --concurrency 16
+                python main.py --service "Figma" --stream
         """
     )
     
@@ -35,6 +105,12 @@ def main():
         type=str,
         help='Raw service description text to analyze'
     )
+    input_group.add_argument(
+        '--batch', '-b',
+        type=str,
+        metavar='FILE',
+        help='File with one service name (or description, with --batch-type text) per line'
+    )
     
     parser.add_argument(
         '--output', '-o',
@@ -42,17 +118,97 @@ def main():
         help='Output file path (default: print to console)'
     )
     
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Write the report as it is generated instead of after it is complete'
+    )
+    
+    # Batch mode options
+    parser.add_argument(
+        '--batch-type',
+        choices=['service', 'text'],
+        default='service',
+        help='Whether batch lines are service names or descriptions (default: service)'
+    )
+    parser.add_argument(
+        '--output-dir',
+        type=str,
+        default='reports',
+        help='Directory for batch reports (default: reports)'
+    )
+    parser.add_argument(
+        '--concurrency', '-c',
+        type=int,
+        default=8,
+        help='Maximum concurrent API requests in batch mode (default: 8)'
+    )
+    parser.add_argument(
+        '--rpm',
+        type=float,
+        default=500,
+        help='Requests per minute allowed for the API key in batch mode (default: 500)'
+    )
+    parser.add_argument(
+        '--tpm',
+        type=float,
+        default=200000,
+        help='Tokens per minute allowed for the API key in batch mode (default: 200000)'
+    )
+    
     parser.add_argument(
         '--verbose', '-v',
         action='store_true',
         help='Enable verbose output'
     )
+    
+    # Cached reports are reused unless disabled or refreshed
+    cache_group = parser.add_mutually_exclusive_group()
+    cache_group.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Neither read nor write the report cache'
+    )
+    cache_group.add_argument(
+        '--refresh',
+        action='store_true',
+        help='Ignore cached reports and replace them with newly generated ones'
+    )
 
     args = parser.parse_args()
+    if args.stream and args.batch:
+        parser.error("--stream cannot be used with --batch")
+    if args.concurrency < 1 or args.rpm <= 0 or args.tpm <= 0:
+        parser.error("--concurrency, --rpm and --tpm must be positive")
 
     try:
         # Initialize the service analyzer
-        analyzer = ServiceAnalyzer(verbose=args.verbose)
+        cache = None if args.no_cache else ReportCache()
+        scheduler = None
+        if args.batch:
+            scheduler = RequestScheduler(args.rpm, args.tpm, max_concurrency=args.concurrency)
+        analyzer = ServiceAnalyzer(verbose=args.verbose, cache=cache, refresh=args.refresh,
+                                   scheduler=scheduler)
+        
+        if args.batch:
+            inputs = read_batch_file(args.batch)
+            failures = asyncio.run(run_batch(analyzer, inputs, args.output_dir,
+                                             args.batch_type == 'text', args.concurrency))
+            print(f"Analyzed {len(inputs) - failures} of {len(inputs)} inputs, {failures} failed")
+            if args.verbose:
+                print(f"Requests sent: {scheduler.stats['requests']}, "
+                      f"rate limited: {scheduler.stats['throttled']}, "
+                      f"retries: {scheduler.stats['retries']}, "
+                      f"final concurrency: {scheduler.concurrency}")
+            sys.exit(1 if failures else 0)
+        
+        if args.stream:
+            if args.service:
+                chunks = analyzer.stream_service(args.service)
+            else:
+                chunks = analyzer.stream_text(args.text)
+            write_stream(chunks, args.output)
+            return
         
         # Determine input type and generate report
         if args.service:
@@ -0,0 +1,223 @@
+"""
+Rate Limiter Module
+Schedules API requests within requests-per-minute and tokens-per-minute budgets
+"""
+
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import openai
+
+
+class TokenBucket:
+    """A budget that refills continuously, e.g. 200,000 tokens per minute."""
+
+    def __init__(self, per_minute: float):
+        """
+        Create a full bucket.
+
+        Args:
+            per_minute (float): Budget per minute; also the largest possible burst
+        """
+        if per_minute <= 0:
+            raise ValueError("per_minute must be positive")
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        """Add the budget accrued since the last update."""
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, amount: float, now: float) -> float:
+        """Return the seconds until `amount` is available (requests above capacity wait for a full bucket)."""
+        self._refill(now)
+        missing = min(amount, self.capacity) - self.level
+        return missing / self.rate if missing > 0 else 0.0
+
+    def take(self, amount: float, now: float):
+        """Spend `amount`; negative amounts refund an overestimate."""
+        self._refill(now)
+        self.level = min(self.capacity, self.level - amount)
+
+
+class RequestScheduler:
+    """
+    Shared scheduler for API requests with rate-limit-aware retries.
+
+    Requests wait for both the requests-per-minute and tokens-per-minute
+    budgets and for a free concurrency slot. Rate-limit responses (429)
+    halve the concurrency limit once per throttling episode and pause every
+    request for the Retry-After period, while each run of successful
+    requests as long as the limit raises it by one. Throttling and
+    transient errors are retried with jittered exponential backoff.
+    """
+
+    def __init__(self, requests_per_minute: float = 500, tokens_per_minute: float = 200_000,
+                 max_concurrency: int = 16, min_concurrency: int = 1, max_retries: int = 6,
+                 base_delay: float = 0.5, max_delay: float = 30.0, seed: Optional[int] = None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            requests_per_minute (float): Request budget of the API key
+            tokens_per_minute (float): Token budget of the API key
+            max_concurrency (int): Upper bound for requests in flight
+            min_concurrency (int): Lower bound the limit shrinks to under throttling
+            max_retries (int): Retries per request before its error is raised
+            base_delay (float): First backoff ceiling in seconds, doubled per retry
+            max_delay (float): Largest backoff ceiling in seconds
+            seed (int): Seed for the backoff jitter
+        """
+        if not 1 <= min_concurrency <= max_concurrency:
+            raise ValueError("concurrency bounds must satisfy 1 <= min_concurrency <= max_concurrency")
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._random = random.Random(seed)
+        self._waiters: List[asyncio.Future] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._in_flight = 0
+        self._successes = 0
+        self._episode = 0
+        self._paused_until = 0.0
+        self.stats: Dict[str, int] = {"requests": 0, "retries": 0, "throttled": 0}
+
+    async def run(self, request: Callable[[], Awaitable[Any]], tokens: int = 0) -> Any:
+        """
+        Run a request within the budgets, retrying throttled and transient failures.
+
+        Args:
+            request (callable): Coroutine function performing one API call
+            tokens (int): Estimated tokens the request will consume
+
+        Returns:
+            The request's result
+        """
+        attempt = 0
+        while True:
+            episode = await self._acquire(tokens)
+            throttled = succeeded = False
+            try:
+                response = await request()
+                succeeded = True
+            except Exception as error:
+                retryable, throttled, retry_after = self._classify(error)
+                if throttled:
+                    self.stats["throttled"] += 1
+                if not retryable or attempt >= self.max_retries:
+                    raise
+                delay = self._backoff(attempt, retry_after)
+                if throttled:
+                    # Everyone waits, or the other requests in flight would hit the same limit
+                    self._paused_until = max(self._paused_until, time.monotonic() + delay)
+            finally:
+                # Also runs on cancellation, which would otherwise leak the slot
+                self._release(throttled and episode == self._episode, succeeded)
+            if succeeded:
+                self._record_usage(response, tokens)
+                return response
+            attempt += 1
+            self.stats["retries"] += 1
+            await asyncio.sleep(delay)
+
+    async def _acquire(self, tokens: int) -> int:
+        """Wait for a concurrency slot and both budgets; returns the current throttling episode."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # Futures belong to one event loop; each asyncio.run() gets a new one
+            self._loop = loop
+            self._waiters = []
+        while True:
+            now = time.monotonic()
+            wait = max(self._paused_until - now, self.requests.delay(1, now), self.tokens.delay(tokens, now))
+            if self._in_flight < self.concurrency and wait <= 0:
+                self.requests.take(1, now)
+                self.tokens.take(tokens, now)
+                self._in_flight += 1
+                self.stats["requests"] += 1
+                return self._episode
+            # Woken early when a slot frees up or the limits change
+            waiter = loop.create_future()
+            self._waiters.append(waiter)
+            try:
+                await asyncio.wait_for(waiter, wait if self._in_flight < self.concurrency else None)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+
+    def _release(self, throttled: bool, succeeded: bool):
+        """Free a slot and adapt the concurrency limit (additive increase, multiplicative decrease)."""
+        # Synchronous, so a cancelled request cannot be interrupted while releasing
+        self._in_flight -= 1
+        if throttled:
+            self.concurrency = max(self.min_concurrency, self.concurrency // 2)
+            self._successes = 0
+            self._episode += 1
+        elif succeeded:
+            self._successes += 1
+            if self._successes >= self.concurrency and self.concurrency < self.max_concurrency:
+                self.concurrency += 1
+                self._successes = 0
+        waiters, self._waiters = self._waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def _classify(self, error: Exception) -> Tuple[bool, bool, Optional[float]]:
+        """
+        Decide how to handle a failed request.
+
+        Returns:
+            tuple: (retryable, throttled, retry-after seconds or None)
+        """
+        if isinstance(error, openai.APIConnectionError):
+            return True, False, None
+        if not isinstance(error, openai.APIStatusError):
+            return False, False, None
+        if error.status_code == 429:
+            # An exhausted quota will not recover by waiting
+            if getattr(error, "code", None) == "insufficient_quota":
+                return False, True, None
+            return True, True, self._retry_after(error)
+        if error.status_code in (408, 409) or error.status_code >= 500:
+            return True, False, self._retry_after(error)
+        return False, False, None
+
+    @staticmethod
+    def _retry_after(error: "openai.APIStatusError") -> Optional[float]:
+        """Read the server's requested wait from the Retry-After headers."""
+        headers = error.response.headers
+        for name, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+            value = headers.get(name)
+            if value is not None:
+                try:
+                    return max(0.0, float(value) * scale)
+                except ValueError:
+                    pass
+        return None
+
+    def _backoff(self, attempt: int, retry_after: Optional[float]) -> float:
+        """Full-jitter exponential backoff, never shorter than the server's Retry-After."""
+        ceiling = min(self.max_delay, self.base_delay * 2 ** attempt)
+        delay = self._random.uniform(0, ceiling)
+        if retry_after is not None:
+            delay = min(self.max_delay, retry_after) + self._random.uniform(0, self.base_delay)
+        return delay
+
+    def _record_usage(self, response: Any, estimated: int):
+        """Correct the token budget with the usage the API reported."""
+        usage = getattr(response, "usage", None)
+        total = getattr(usage, "total_tokens", None)
+        if isinstance(total, int):
+            self.tokens.take(total - estimated, time.monotonic())
@@ -0,0 +1,147 @@
+"""
+Report Cache Module
+Stores generated reports on disk so repeated analyses skip the API call
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+
+def default_cache_path() -> str:
+    """Return the cache database path, honouring SERVICE_ANALYZER_CACHE_DIR."""
+    directory = os.getenv('SERVICE_ANALYZER_CACHE_DIR') or os.path.join(
+        os.path.expanduser('~'), '.cache', 'service-analyzer'
+    )
+    return os.path.join(directory, 'reports.sqlite3')
+
+
+def request_key(params: Dict[str, Any]) -> str:
+    """
+    Compute the content address of a chat completion request.
+
+    Args:
+        params (dict): Request parameters (model, messages, temperature, max_tokens)
+
+    Returns:
+        str: SHA-256 hex digest of the canonical JSON encoding
+    """
+    canonical = json.dumps(params, sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+class ReportCache:
+    """SQLite-backed report cache with a time-to-live and size-bounded LRU eviction."""
+
+    def __init__(self, path: Optional[str] = None, ttl: float = 7 * 24 * 3600,
+                 max_bytes: int = 100 * 1024 * 1024):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path (str): Database file (default: default_cache_path())
+            ttl (float): Seconds after which an entry is stale
+            max_bytes (int): Total report size kept before least recently used entries are evicted
+        """
+        self.path = path or default_cache_path()
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._db = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS reports (
+                key TEXT PRIMARY KEY,
+                report TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS reports_accessed ON reports (accessed_at)")
+
+    def get(self, key: str) -> Optional[Tuple[str, float]]:
+        """
+        Look up a cached report.
+
+        Args:
+            key (str): Key from request_key()
+
+        Returns:
+            tuple: (report, created_at) for a fresh entry, or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT report, created_at FROM reports WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > self.ttl:
+                self._db.execute("DELETE FROM reports WHERE key = ?", (key,))
+                return None
+            self._db.execute("UPDATE reports SET accessed_at = ? WHERE key = ?", (now, key))
+        return row[0], row[1]
+
+    def put(self, key: str, report: str):
+        """
+        Store a report, evicting least recently used entries beyond max_bytes.
+
+        Args:
+            key (str): Key from request_key()
+            report (str): Report text as returned by the API
+        """
+        now = time.time()
+        size = len(report.encode('utf-8'))
+        with self._lock:
+            self._db.execute("BEGIN")
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO reports (key, report, size, created_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, report, size, now, now)
+                )
+                self._db.execute("DELETE FROM reports WHERE created_at < ?", (now - self.ttl,))
+                self._evict()
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def _evict(self):
+        """Delete least recently used entries until the total size fits max_bytes."""
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM reports").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._db.execute("SELECT key, size FROM reports ORDER BY accessed_at DESC").fetchall()
+        kept = 0
+        stale = []
+        for key, size in rows:
+            kept += size
+            if kept > self.max_bytes:
+                stale.append((key,))
+        self._db.executemany("DELETE FROM reports WHERE key = ?", stale)
+
+    def clear(self):
+        """Remove every cached report."""
+        with self._lock:
+            self._db.execute("DELETE FROM reports")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM reports").fetchone()[0]
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._db.close()
@@ -3,25 +3,50 @@ Service Analyzer Core Module
 Handles OpenAI API integration and report generation logic
 """
 
+import asyncio
 import os
+import sys
 import openai
 from datetime import datetime
-from typing import Optional
+from typing import IO, Any, AsyncIterator, Dict, Iterator, List, NamedTuple, Optional, Tuple
 from dotenv import load_dotenv
+from rate_limiter import RequestScheduler
+from report_cache import ReportCache, request_key
+
+
+class BatchItem(NamedTuple):
+    """Outcome of one input of a batch: the report, or the error that prevented it."""
+    index: int
+    input: str
+    report: Optional[str]
+    error: Optional[Exception]
 
 
 class ServiceAnalyzer:
     """Analyzes services and generates comprehensive markdown reports."""
     
-    def __init__(self, verbose: bool = False):
+    MODEL = "gpt-4.1-mini"
+    MAX_TOKENS = 2500
+    TEMPERATURE = 0.7
+    SYSTEM_PROMPT = "You are an expert business analyst specializing in digital services and technology companies. You provide comprehensive, well-structured analysis reports in markdown format."
+    
+    def __init__(self, verbose: bool = False, cache: Optional[ReportCache] = None, refresh: bool = False,
+                 scheduler: Optional[RequestScheduler] = None):
         """
         Initialize the ServiceAnalyzer.
         
         Args:
             verbose (bool): Enable verbose output for debugging
+            cache (ReportCache): Cache for generated reports (default: no caching)
+            refresh (bool): Ignore cached reports but store the newly generated ones
+            scheduler (RequestScheduler): Rate limiter for asyncio requests (default: none)
         """
         self.verbose = verbose
+        self.cache = cache
+        self.refresh = refresh
+        self.scheduler = scheduler
         self.client = self._initialize_openai_client()
+        self._async_client: Optional[openai.AsyncOpenAI] = None
     
     def _initialize_openai_client(self) -> openai.OpenAI:
         """Initialize OpenAI client with API key from environment."""
@@ -34,8 +59,26 @@ class ServiceAnalyzer:
                 "OpenAI API key not found. Please set OPENAI_API_KEY environment variable or create a .env file with OPENAI_API_KEY=your-key-here"
             )
         
+        self._api_key = api_key
         return openai.OpenAI(api_key=api_key)
     
+    @property
+    def async_client(self) -> openai.AsyncOpenAI:
+        """Asyncio OpenAI client, created on first use."""
+        if self._async_client is None:
+            if self.scheduler is not None:
+                # The scheduler retries itself; the client's own retries would bypass its budgets
+                self._async_client = openai.AsyncOpenAI(api_key=self._api_key, max_retries=0)
+            else:
+                self._async_client = openai.AsyncOpenAI(api_key=self._api_key)
+        return self._async_client
+    
+    async def aclose(self):
+        """Close the asyncio client if one was created."""
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+    
     def analyze_service(self, service_name: str) -> str:
         """
         Analyze a known service by name.
@@ -62,6 +105,78 @@ class ServiceAnalyzer:
         prompt = self._create_text_prompt(service_text)
         return self._generate_report(prompt, "Custom Service Description")
     
+    def stream_service(self, service_name: str) -> Iterator[str]:
+        """
+        Analyze a known service by name, yielding the report as it is generated.
+        
+        Args:
+            service_name (str): Name of the service to analyze
+            
+        Yields:
+            str: Report text chunks, ending with the metadata footer
+        """
+        prompt = self._create_service_prompt(service_name)
+        return self._stream_report(prompt, f"Service: {service_name}")
+    
+    def stream_text(self, service_text: str) -> Iterator[str]:
+        """
+        Analyze service based on provided description text, yielding the report as it is generated.
+        
+        Args:
+            service_text (str): Raw service description text
+            
+        Yields:
+            str: Report text chunks, ending with the metadata footer
+        """
+        prompt = self._create_text_prompt(service_text)
+        return self._stream_report(prompt, "Custom Service Description")
+    
+    async def aanalyze_service(self, service_name: str) -> str:
+        """Asyncio version of analyze_service()."""
+        prompt = self._create_service_prompt(service_name)
+        return await self._agenerate_report(prompt, f"Service: {service_name}")
+    
+    async def aanalyze_text(self, service_text: str) -> str:
+        """Asyncio version of analyze_text()."""
+        prompt = self._create_text_prompt(service_text)
+        return await self._agenerate_report(prompt, "Custom Service Description")
+    
+    async def analyze_batch(self, inputs: List[str], as_text: bool = False,
+                            concurrency: int = 8) -> AsyncIterator[BatchItem]:
+        """
+        Analyze many services concurrently, yielding each outcome as it completes.
+        
+        A failed input yields a BatchItem carrying its error instead of
+        aborting the batch.
+        
+        Args:
+            inputs (list): Service names, or descriptions when as_text is True
+            as_text (bool): Treat inputs as service descriptions
+            concurrency (int): Maximum number of requests in flight
+            
+        Yields:
+            BatchItem: Outcome for one input, in completion order
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        analyze = self.aanalyze_text if as_text else self.aanalyze_service
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def run(index: int, item: str) -> BatchItem:
+            async with semaphore:
+                try:
+                    return BatchItem(index, item, await analyze(item), None)
+                except Exception as e:
+                    return BatchItem(index, item, None, e)
+        
+        tasks = [asyncio.ensure_future(run(index, item)) for index, item in enumerate(inputs)]
+        try:
+            for outcome in asyncio.as_completed(tasks):
+                yield await outcome
+        finally:
+            for task in tasks:
+                task.cancel()
+    
     def _create_service_prompt(self, service_name: str) -> str:
         """Create prompt for analyzing a known service."""
         return f"""
@@ -147,39 +262,140 @@ Please ensure each section is substantive and informative. If certain informatio
         Returns:
             str: Generated markdown report
         """
-        if self.verbose:
-            print(f"Generating report for: {context}")
-            print("Sending request to OpenAI API...")
+        params, key, cached = self._prepare_request(prompt, context)
+        if cached is not None:
+            return cached
         
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4.1-mini",
-                messages=[
-                    {
-                        "role": "system",
-                        "content": "You are an expert business analyst specializing in digital services and technology companies. You provide comprehensive, well-structured analysis reports in markdown format."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                max_tokens=2500,
-                temperature=0.7
-            )
+            response = self.client.chat.completions.create(**params)
+            return self._finish_report(key, response.choices[0].message.content)
             
-            report = response.choices[0].message.content
-            
-            # Add metadata footer
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            footer = f"\n\n---\n*Report generated on {timestamp} using OpenAI GPT-4*"
+        except openai.APIError as e:
+            raise Exception(f"OpenAI API error: {e}")
+        except Exception as e:
+            raise Exception(f"Failed to generate report: {e}")
+    
+    def _stream_report(self, prompt: str, context: str) -> Iterator[str]:
+        """
+        Generate report using the OpenAI streaming API.
+        
+        Args:
+            prompt (str): The prompt to send to OpenAI
+            context (str): Context for verbose output
             
-            if self.verbose:
-                print("Report generated successfully!")
+        Yields:
+            str: Chunks of the markdown report as they arrive, then the footer
+        """
+        # Status messages go to stderr so they never land inside the streamed report
+        params, key, cached = self._prepare_request(prompt, context, log=sys.stderr)
+        if cached is not None:
+            yield cached
+            return
+        
+        parts = []
+        try:
+            stream = self.client.chat.completions.create(**params, stream=True)
+            try:
+                for chunk in stream:
+                    content = chunk.choices[0].delta.content if chunk.choices else None
+                    if content:
+                        parts.append(content)
+                        yield content
+            finally:
+                # Releases the connection when the caller stops reading early
+                stream.close()
             
-            return report + footer
+        except openai.APIError as e:
+            raise Exception(f"OpenAI API error: {e}")
+        except Exception as e:
+            raise Exception(f"Failed to generate report: {e}")
+        
+        report = "".join(parts)
+        yield self._finish_report(key, report, log=sys.stderr)[len(report):]
+    
+    async def _agenerate_report(self, prompt: str, context: str) -> str:
+        """Asyncio version of _generate_report()."""
+        params, key, cached = self._prepare_request(prompt, context)
+        if cached is not None:
+            return cached
+        
+        try:
+            create = self.async_client.chat.completions.create
+            if self.scheduler is not None:
+                response = await self.scheduler.run(lambda: create(**params), self._estimate_tokens(params))
+            else:
+                response = await create(**params)
+            return self._finish_report(key, response.choices[0].message.content)
             
         except openai.APIError as e:
             raise Exception(f"OpenAI API error: {e}")
         except Exception as e:
-            raise Exception(f"Failed to generate report: {e}")
\ No newline at end of file
+            raise Exception(f"Failed to generate report: {e}")
+    
+    def _prepare_request(self, prompt: str, context: str,
+                         log: Optional[IO[str]] = None) -> Tuple[Dict[str, Any], Optional[str], Optional[str]]:
+        """
+        Build the request and look it up in the cache.
+        
+        Args:
+            prompt (str): The prompt to send to OpenAI
+            context (str): Context for verbose output
+            log (file): Stream for verbose output (default: stdout)
+        
+        Returns:
+            tuple: (request params, cache key or None, cached report with footer or None)
+        """
+        if self.verbose:
+            print(f"Generating report for: {context}", file=log)
+        
+        params = self._request_params(prompt)
+        key = request_key(params) if self.cache is not None else None
+        if key is not None and not self.refresh:
+            cached = self.cache.get(key)
+            if cached is not None:
+                if self.verbose:
+                    print("Using cached report", file=log)
+                report, created_at = cached
+                return params, key, report + self._footer(datetime.fromtimestamp(created_at))
+        
+        if self.verbose:
+            print("Sending request to OpenAI API...", file=log)
+        return params, key, None
+    
+    def _finish_report(self, key: Optional[str], report: str, log: Optional[IO[str]] = None) -> str:
+        """Store a generated report in the cache and append the footer; verbose output goes to `log`."""
+        if key is not None and report:
+            self.cache.put(key, report)
+        
+        if self.verbose:
+            print("Report generated successfully!", file=log)
+        
+        return report + self._footer(datetime.now())
+    
+    def _request_params(self, prompt: str) -> Dict[str, Any]:
+        """Build the chat completion request; its content also keys the cache."""
+        return {
+            "model": self.MODEL,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": self.SYSTEM_PROMPT
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "max_tokens": self.MAX_TOKENS,
+            "temperature": self.TEMPERATURE
+        }
+    
+    def _estimate_tokens(self, params: Dict[str, Any]) -> int:
+        """Upper estimate of a request's tokens: about 4 characters per prompt token plus the completion limit."""
+        characters = sum(len(message["content"]) for message in params["messages"])
+        return characters // 4 + params["max_tokens"]
+    
+    def _footer(self, generated_at: datetime) -> str:
+        """Create the metadata footer appended to every report."""
+        timestamp = generated_at.strftime("%Y-%m-%d %H:%M:%S")
+        return f"\n\n---\n*Report generated on {timestamp} using OpenAI GPT-4*"
\ No newline at end of file
@@ -4,9 +4,20 @@ Unit tests for Service Analyzer application
 """
 
 import unittest
+import asyncio
 import os
-from unittest.mock import patch, MagicMock
+import json
+import tempfile
+import threading
+import time
+from contextlib import redirect_stderr, redirect_stdout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from unittest.mock import patch, AsyncMock, MagicMock
+import main
 from service_analyzer import ServiceAnalyzer
+from rate_limiter import RequestScheduler, TokenBucket
+from report_cache import ReportCache, request_key
 
 
 class TestServiceAnalyzer(unittest.TestCase):
@@ -220,6 +231,444 @@ class TestPromptValidation(unittest.TestCase):
                 self.assertIn(section, prompt)
 
 
+class TestReportCache(unittest.TestCase):
+    """Test cases for the on-disk report cache."""
+    
+    def setUp(self):
+        """Create a cache in a temporary directory."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "reports.sqlite3")
+        self.cache = ReportCache(self.path)
+        self.addCleanup(self.cache.close)
+    
+    def test_request_key(self):
+        """Test keys depend on every request parameter but not on key order."""
+        params = {"model": "m", "messages": [{"role": "user", "content": "x"}], "temperature": 0.7, "max_tokens": 10}
+        self.assertEqual(request_key(params), request_key(dict(reversed(list(params.items())))))
+        self.assertNotEqual(request_key(params), request_key({**params, "temperature": 0.2}))
+        self.assertNotEqual(request_key(params), request_key({**params, "max_tokens": 11}))
+    
+    def test_round_trip_and_persistence(self):
+        """Test stored reports survive reopening the cache."""
+        self.cache.put("key", "# Report")
+        self.assertEqual(self.cache.get("key")[0], "# Report")
+        self.assertIsNone(self.cache.get("other"))
+        
+        reopened = ReportCache(self.path)
+        self.addCleanup(reopened.close)
+        self.assertEqual(reopened.get("key")[0], "# Report")
+    
+    def test_ttl(self):
+        """Test stale entries are treated as misses."""
+        cache = ReportCache(self.path, ttl=60)
+        self.addCleanup(cache.close)
+        cache.put("key", "# Report")
+        
+        with patch('report_cache.time.time', return_value=time.time() + 120):
+            self.assertIsNone(cache.get("key"))
+        self.assertEqual(len(cache), 0)
+    
+    def test_lru_eviction(self):
+        """Test least recently used entries are evicted beyond max_bytes."""
+        cache = ReportCache(self.path, max_bytes=25)
+        self.addCleanup(cache.close)
+        cache.put("a", "x" * 10)
+        time.sleep(0.01)
+        cache.put("b", "x" * 10)
+        time.sleep(0.01)
+        cache.get("a")
+        time.sleep(0.01)
+        cache.put("c", "x" * 10)
+        
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+    
+    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-api-key'})
+    @patch('service_analyzer.load_dotenv')
+    @patch('openai.OpenAI')
+    def test_analyzer_uses_cache(self, mock_openai, mock_load_dotenv):
+        """Test repeated analyses hit the cache and --refresh bypasses it."""
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = "# Spotify Analysis"
+        mock_client = MagicMock()
+        mock_client.chat.completions.create.return_value = mock_response
+        mock_openai.return_value = mock_client
+        
+        analyzer = ServiceAnalyzer(cache=self.cache)
+        first = analyzer.analyze_service("Spotify")
+        second = analyzer.analyze_service("Spotify")
+        self.assertEqual(first, second)
+        self.assertEqual(mock_client.chat.completions.create.call_count, 1)
+        
+        analyzer.analyze_service("Notion")
+        ServiceAnalyzer(cache=self.cache, refresh=True).analyze_service("Spotify")
+        self.assertEqual(mock_client.chat.completions.create.call_count, 3)
+        
+        ServiceAnalyzer().analyze_service("Spotify")
+        self.assertEqual(mock_client.chat.completions.create.call_count, 4)
+
+
+class TestBatchAnalysis(unittest.TestCase):
+    """Test cases for concurrent batch analysis."""
+    
+    def setUp(self):
+        """Patch both OpenAI clients with a fake async completion."""
+        self.in_flight = 0
+        self.max_in_flight = 0
+        
+        async def create(**params):
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            await asyncio.sleep(0.01)
+            self.in_flight -= 1
+            prompt = params["messages"][1]["content"]
+            if "Broken" in prompt:
+                raise RuntimeError("service unavailable")
+            response = MagicMock()
+            response.choices = [MagicMock()]
+            response.choices[0].message.content = "# Report"
+            return response
+        
+        async_client = MagicMock()
+        async_client.chat.completions.create = create
+        async_client.close = AsyncMock()
+        for target, value in (('openai.OpenAI', MagicMock()), ('openai.AsyncOpenAI', MagicMock(return_value=async_client))):
+            patcher = patch(target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        for patcher in (patch.dict(os.environ, {'OPENAI_API_KEY': 'test-api-key'}), patch('service_analyzer.load_dotenv')):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+    
+    def test_concurrency_cap_and_failures(self):
+        """Test at most `concurrency` requests run and failures do not abort the batch."""
+        analyzer = ServiceAnalyzer()
+        inputs = [f"Service {i}" for i in range(10)] + ["Broken"]
+        
+        async def collect():
+            return [item async for item in analyzer.analyze_batch(inputs, concurrency=3)]
+        
+        items = asyncio.run(collect())
+        self.assertEqual(sorted(item.index for item in items), list(range(11)))
+        self.assertEqual(self.max_in_flight, 3)
+        failed = [item for item in items if item.error is not None]
+        self.assertEqual([item.input for item in failed], ["Broken"])
+        self.assertIn("service unavailable", str(failed[0].error))
+        self.assertTrue(all(item.report.startswith("# Report") for item in items if item.error is None))
+    
+    def test_run_batch_writes_one_report_per_input(self):
+        """Test the batch command writes a file per successful input."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        batch_file = os.path.join(directory.name, "services.txt")
+        with open(batch_file, "w", encoding="utf-8") as f:
+            f.write("# nightly run\nSpotify\n\nBroken\nNotion\n")
+        output_dir = os.path.join(directory.name, "reports")
+        
+        inputs = main.read_batch_file(batch_file)
+        self.assertEqual(inputs, ["Spotify", "Broken", "Notion"])
+        with redirect_stdout(StringIO()), redirect_stderr(StringIO()) as stderr:
+            failures = asyncio.run(main.run_batch(ServiceAnalyzer(), inputs, output_dir, False, 2))
+        
+        self.assertEqual(failures, 1)
+        self.assertEqual(sorted(os.listdir(output_dir)), ["0001-spotify.md", "0003-notion.md"])
+        self.assertIn("Failed: Broken", stderr.getvalue())
+    
+    def test_run_batch_continues_after_write_errors(self):
+        """Test a report that cannot be saved counts as a failure without stopping the batch."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        output_dir = os.path.join(directory.name, "reports")
+        # A directory where the first report file would go makes its open() fail
+        os.makedirs(os.path.join(output_dir, "0001-spotify.md"))
+        
+        with redirect_stdout(StringIO()), redirect_stderr(StringIO()) as stderr:
+            failures = asyncio.run(main.run_batch(ServiceAnalyzer(), ["Spotify", "Notion"], output_dir, False, 1))
+        
+        self.assertEqual(failures, 1)
+        self.assertTrue(os.path.isfile(os.path.join(output_dir, "0002-notion.md")))
+        self.assertIn("Failed to save Spotify", stderr.getvalue())
+
+
+class TestStreaming(unittest.TestCase):
+    """Test cases for streamed report generation."""
+    
+    def stream_client(self, mock_openai, parts):
+        """Make the mocked client stream `parts` as completion chunks."""
+        chunks = []
+        for part in parts:
+            chunk = MagicMock()
+            chunk.choices = [MagicMock()]
+            chunk.choices[0].delta.content = part
+            chunks.append(chunk)
+        chunks.append(MagicMock(choices=[]))
+        stream = MagicMock()
+        stream.__iter__.return_value = iter(chunks)
+        mock_client = MagicMock()
+        mock_client.chat.completions.create.return_value = stream
+        mock_openai.return_value = mock_client
+        return mock_client, stream
+    
+    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-api-key'})
+    @patch('service_analyzer.load_dotenv')
+    @patch('openai.OpenAI')
+    def test_chunks_then_footer(self, mock_openai, mock_load_dotenv):
+        """Test chunks are yielded as they arrive, followed by the footer."""
+        mock_client, stream = self.stream_client(mock_openai, ["# Spotify", None, " Analysis"])
+        
+        chunks = list(ServiceAnalyzer().stream_service("Spotify"))
+        
+        self.assertEqual(chunks[:2], ["# Spotify", " Analysis"])
+        self.assertIn("Report generated on", chunks[2])
+        self.assertEqual(len(chunks), 3)
+        self.assertTrue(mock_client.chat.completions.create.call_args[1]['stream'])
+        stream.close.assert_called_once()
+    
+    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-api-key'})
+    @patch('service_analyzer.load_dotenv')
+    @patch('openai.OpenAI')
+    def test_streamed_reports_are_cached(self, mock_openai, mock_load_dotenv):
+        """Test a streamed report is cached and served whole on the next request."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        cache = ReportCache(os.path.join(directory.name, "reports.sqlite3"))
+        self.addCleanup(cache.close)
+        mock_client, _ = self.stream_client(mock_openai, ["# Report", " text"])
+        analyzer = ServiceAnalyzer(cache=cache)
+        
+        streamed = "".join(analyzer.stream_text("A note-taking app"))
+        cached = list(analyzer.stream_text("A note-taking app"))
+        
+        self.assertEqual(len(cached), 1)
+        self.assertTrue(cached[0].startswith("# Report text"))
+        self.assertEqual(analyzer.analyze_text("A note-taking app")[:13], streamed[:13])
+        self.assertEqual(mock_client.chat.completions.create.call_count, 1)
+    
+    @patch.dict(os.environ, {'OPENAI_API_KEY': 'test-api-key'})
+    @patch('service_analyzer.load_dotenv')
+    @patch('openai.OpenAI')
+    def test_verbose_streaming_keeps_stdout_clean(self, mock_openai, mock_load_dotenv):
+        """Test verbose status goes to stderr so the console report is not interrupted."""
+        self.stream_client(mock_openai, ["# Report", " body"])
+        analyzer = ServiceAnalyzer(verbose=True)
+        
+        with redirect_stdout(StringIO()) as stdout, redirect_stderr(StringIO()) as stderr:
+            main.write_stream(analyzer.stream_service("Spotify"))
+        
+        self.assertTrue(stdout.getvalue().startswith("# Report body\n\n---\n*Report generated on"))
+        self.assertNotIn("successfully", stdout.getvalue())
+        self.assertIn("Generating report for: Service: Spotify", stderr.getvalue())
+        self.assertIn("Report generated successfully!", stderr.getvalue())
+    
+    def test_write_stream_to_file(self):
+        """Test each chunk is flushed to the output file before the next arrives."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "report.md")
+        seen = []
+        
+        def chunks():
+            for part in ["# One", " two"]:
+                yield part
+                with open(path, encoding='utf-8') as f:
+                    seen.append(f.read())
+        
+        with redirect_stdout(StringIO()):
+            main.write_stream(chunks(), path)
+        
+        self.assertEqual(seen, ["# One", "# One two"])
+
+
+class FakeOpenAIServer(ThreadingHTTPServer):
+    """Local chat completions endpoint that throttles like the real API."""
+    
+    daemon_threads = True
+    
+    def __init__(self, capacity: int = 2, failures: int = 0):
+        """Answer 429 beyond `capacity` concurrent requests and 500 to the first `failures` requests."""
+        super().__init__(("127.0.0.1", 0), FakeOpenAIHandler)
+        self.capacity = capacity
+        self.failures = failures
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.counts = {"ok": 0, 429: 0, 500: 0, 400: 0}
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+    
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    """Request handler for FakeOpenAIServer."""
+    
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with server.lock:
+            if "Invalid" in body["messages"][1]["content"]:
+                status = 400
+            elif server.failures > 0:
+                server.failures -= 1
+                status = 500
+            elif server.in_flight >= server.capacity:
+                status = 429
+            else:
+                status = "ok"
+                server.in_flight += 1
+            server.counts[status] += 1
+        
+        if status != "ok":
+            self.reply(status, {"error": {"message": f"error {status}", "type": "requests", "code": None}},
+                       {"retry-after-ms": "20"} if status == 429 else {})
+            return
+        time.sleep(0.02)
+        with server.lock:
+            server.in_flight -= 1
+        self.reply(200, {
+            "id": "chatcmpl-1", "object": "chat.completion", "created": 0, "model": body["model"],
+            "choices": [{"index": 0, "finish_reason": "stop",
+                         "message": {"role": "assistant", "content": "# Report"}}],
+            "usage": {"prompt_tokens": 500, "completion_tokens": 100, "total_tokens": 600}
+        })
+    
+    def reply(self, status, payload, headers=None):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+class TestRateLimiting(unittest.TestCase):
+    """Test cases for the request scheduler, against a local fake API server."""
+    
+    def start_server(self, **options) -> FakeOpenAIServer:
+        """Start a fake server and point the OpenAI clients at it."""
+        server = FakeOpenAIServer(**options)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        environment = {'OPENAI_API_KEY': 'test-api-key', 'OPENAI_BASE_URL': server.base_url,
+                       'NO_PROXY': '127.0.0.1', 'no_proxy': '127.0.0.1'}
+        for patcher in (patch.dict(os.environ, environment), patch('service_analyzer.load_dotenv')):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        return server
+    
+    def run_batch(self, analyzer, inputs, concurrency=8):
+        """Collect the batch outcomes, closing the client afterwards."""
+        async def collect():
+            try:
+                return [item async for item in analyzer.analyze_batch(inputs, concurrency=concurrency)]
+            finally:
+                await analyzer.aclose()
+        return asyncio.run(collect())
+    
+    def test_token_bucket(self):
+        """Test the bucket refills continuously and caps bursts at its capacity."""
+        bucket = TokenBucket(60)
+        now = bucket.updated
+        bucket.take(60, now)
+        self.assertAlmostEqual(bucket.delay(1, now), 1.0)
+        self.assertAlmostEqual(bucket.delay(1, now + 0.5), 0.5)
+        self.assertAlmostEqual(bucket.delay(1000, now + 0.5), 59.5)
+        bucket.take(-100, now + 0.5)
+        self.assertEqual(bucket.level, 60)
+        with self.assertRaises(ValueError):
+            TokenBucket(0)
+    
+    def test_throttling_adapts_concurrency(self):
+        """Test 429s are retried and shrink the concurrency limit until the batch fits."""
+        server = self.start_server(capacity=2)
+        scheduler = RequestScheduler(max_concurrency=8, base_delay=0.01, max_retries=20, seed=1)
+        analyzer = ServiceAnalyzer(scheduler=scheduler)
+        
+        items = self.run_batch(analyzer, [f"Service {i}" for i in range(16)])
+        
+        self.assertTrue(all(item.error is None for item in items), [item.error for item in items])
+        self.assertEqual(server.counts["ok"], 16)
+        self.assertGreater(server.counts[429], 0)
+        self.assertEqual(scheduler.stats["throttled"], server.counts[429])
+        self.assertEqual(scheduler.stats["retries"], server.counts[429])
+        self.assertLess(scheduler.concurrency, 8)
+        self.assertGreaterEqual(scheduler.concurrency, 1)
+    
+    def test_transient_and_client_errors(self):
+        """Test server errors are retried while invalid requests fail without retries."""
+        server = self.start_server(capacity=8, failures=2)
+        scheduler = RequestScheduler(max_concurrency=1, base_delay=0.01, seed=1)
+        analyzer = ServiceAnalyzer(scheduler=scheduler)
+        
+        items = self.run_batch(analyzer, ["Spotify", "Invalid"], concurrency=1)
+        
+        outcomes = {item.input: item for item in items}
+        self.assertTrue(outcomes["Spotify"].report.startswith("# Report"))
+        self.assertIn("OpenAI API error", str(outcomes["Invalid"].error))
+        self.assertEqual(server.counts, {"ok": 1, 429: 0, 500: 2, 400: 1})
+        self.assertEqual(scheduler.stats["retries"], 2)
+        self.assertEqual(scheduler.concurrency, 1)
+    
+    def test_token_budget_paces_requests(self):
+        """Test requests wait for the token budget and reported usage corrects the estimate."""
+        scheduler = RequestScheduler(tokens_per_minute=60000)
+        scheduler.tokens.take(60000, time.monotonic())
+        
+        async def request():
+            return None
+        
+        async def run():
+            start = time.monotonic()
+            for _ in range(3):
+                await scheduler.run(request, tokens=50)
+            return time.monotonic() - start
+        
+        # 150 tokens at 1000 per second
+        self.assertGreaterEqual(asyncio.run(run()), 0.14)
+        self.assertEqual(scheduler.stats, {"requests": 3, "retries": 0, "throttled": 0})
+        
+        response = MagicMock()
+        response.usage.total_tokens = 20
+        
+        async def measured():
+            return response
+        
+        # The bucket is nearly empty: the request spends 50 tokens, then 30 are refunded
+        asyncio.run(scheduler.run(measured, tokens=50))
+        self.assertGreaterEqual(scheduler.tokens.level, 25)
+    
+    def test_cancelled_requests_release_their_slots(self):
+        """Test cancelled requests, running or waiting, do not keep concurrency slots."""
+        scheduler = RequestScheduler(max_concurrency=2)
+        
+        async def hang():
+            await asyncio.sleep(3600)
+        
+        async def done():
+            return "ok"
+        
+        async def run():
+            running = [asyncio.ensure_future(scheduler.run(hang)) for _ in range(2)]
+            waiting = asyncio.ensure_future(scheduler.run(done))
+            await asyncio.sleep(0.01)
+            for task in running + [waiting]:
+                task.cancel()
+            await asyncio.gather(*running, waiting, return_exceptions=True)
+            return await asyncio.wait_for(scheduler.run(done), 1)
+        
+        self.assertEqual(asyncio.run(run()), "ok")
+        self.assertEqual(scheduler._in_flight, 0)
+        self.assertEqual(scheduler.concurrency, 2)
+
+
 if __name__ == '__main__':
     # Run tests with verbose output
     unittest.main(verbosity=2)
\ No newline at end of file